@@ -1,12 +1,18 @@
 from fastapi import APIRouter
 from .resume import router as resume_router
 from .routes.auth import router as auth_router
+from .routes.resume import router as user_resume_router
+from .routes.job_matching import router as job_router
 
 router = APIRouter()
 
 # Include the resume router
 router.include_router(resume_router, prefix="/resumes", tags=["resumes"])
 router.include_router(auth_router, tags=["login"])
+# Authenticated per-user resume endpoints (upload, analyze, generate-pdf, update-smart)
+router.include_router(user_resume_router, prefix="/resumes", tags=["resumes"])
+# Job matching, search, career suggestions and cover letters (prefix /jobs set on the router)
+router.include_router(job_router)
 
 
 # You can add your API endpoints here later
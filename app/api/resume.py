@@ -1,85 +1,62 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
+from app.api import deps
 from app.core.database import get_db
 from app.models.resume_model import ResumeDB
+from app.models.user import User
 from app.schemas.resume import ResumeUploadResponse, ResumeAnalysisResponse, ResumeOptimizeRequest
-from app.services.openai_service import parse_resume_with_ai, analyze_resume, optimize_resume_for_job
-import shutil
-from pathlib import Path
-import PyPDF2
-from docx import Document
+from app.services.openai_service import analyze_resume, optimize_resume_for_job, stream_optimize_resume_for_job
+from app.services.rate_limiter import LLMRateLimitError
+from app.services.resume_service import resume_service
+from app.utils.sse import sse_response, json_events
+from app.utils.uploads import spool_upload, UploadTooLarge
+from app.utils.text_extraction import supported_extensions
+from app.core.config import settings
 import json
 
 # Keep the prefix here
 router = APIRouter(prefix="/resumes", tags=["resumes"])
 
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-
 @router.post("/upload", response_model=ResumeUploadResponse)
 async def upload_resume(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    parse_with_ai: bool = True
+    parse_with_ai: bool = True,
+    current_user: User = Depends(deps.get_current_user)
 ):
-    """Upload and extract text from resume (PDF or DOCX), optionally parse with AI"""
+    """Upload and extract text from resume (PDF, DOCX or TXT), optionally parse with AI"""
     
     # Validate file type
-    if not file.filename.endswith(('.pdf', '.docx')):
-        raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
+    if not file.filename.lower().endswith(supported_extensions()):
+        raise HTTPException(status_code=400, detail="Unsupported file format")
     
     # Save file
-    file_path = UPLOAD_DIR / file.filename
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    try:
+        upload = await spool_upload(file, settings.UPLOAD_DIR, settings.MAX_FILE_SIZE, settings.UPLOAD_CHUNK_SIZE)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     
-    # Extract text
-    extracted_text = ""
+    # Same extraction, dedup and parse as the main upload route; a failed AI parse still saves the text
     try:
-        if file.filename.endswith('.pdf'):
-            extracted_text = extract_text_from_pdf(str(file_path))
-        elif file.filename.endswith('.docx'):
-            extracted_text = extract_text_from_docx(str(file_path))
+        result = await resume_service.parse_uploaded_file(
+            upload.path,
+            file.filename,
+            db=db,
+            user_id=current_user.id,
+            content_hash=upload.sha256,
+            parse=parse_with_ai,
+            best_effort=True
+        )
+    except (HTTPException, LLMRateLimitError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error extracting text: {str(e)}")
     
-    # Parse with AI if requested
-    parsed_data = None
-    if parse_with_ai and extracted_text:
-        try:
-            parsed_data = await parse_resume_with_ai(extracted_text)
-        except Exception as e:
-            print(f"AI parsing failed: {str(e)}")
-            # Continue without AI parsing
-    
     # Save to database
-    resume = ResumeDB(
-        user_id=1,
-        filename=file.filename,
-        file_path=str(file_path),
-        extracted_text=extracted_text,
-        parsed_data=parsed_data
-    )
-    db.add(resume)
-    db.commit()
-    db.refresh(resume)
+    resume = await resume_service.create_resume(db, current_user.id, result)
     
     return resume
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file"""
-    text = ""
-    with open(file_path, 'rb') as file:
-        pdf_reader = PyPDF2.PdfReader(file)
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-    return text
-
-def extract_text_from_docx(file_path: str) -> str:
-    """Extract text from DOCX file"""
-    doc = Document(file_path)
-    return "\n".join([paragraph.text for paragraph in doc.paragraphs])
-
 @router.get("/{resume_id}", response_model=ResumeUploadResponse)
 async def get_resume(resume_id: int, db: Session = Depends(get_db)):
     """Get resume by ID"""
@@ -125,6 +102,8 @@ async def analyze_resume_endpoint(resume_id: int, db: Session = Depends(get_db))
             "ats_score": analysis.get('ats_score', 0)
         }
     
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing resume: {str(e)}")
 
@@ -144,7 +123,22 @@ async def optimize_for_job(request: ResumeOptimizeRequest):
             "optimization": optimization
         }
     
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error optimizing resume: {str(e)}")
+
+@router.post("/optimize/stream")
+async def optimize_for_job_stream(request: ResumeOptimizeRequest):
+    """Stream the job optimization as server-sent events (`token` deltas, `partial` JSON snapshots, then `done`)"""
+    
+    deltas = stream_optimize_resume_for_job(
+        resume_data=request.resume.dict(),
+        job_description=request.job_description,
+        target_role=request.target_role
+    )
     
-    
\ No newline at end of file
+    return sse_response(json_events(deltas, lambda optimization: {
+        "success": True,
+        "optimization": optimization
+    }))
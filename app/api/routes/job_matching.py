@@ -0,0 +1,237 @@
+from fastapi import APIRouter, Depends, HTTPException, Body
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.core.database import get_db
+from app.models.resume_model import ResumeDB
+from app.models.user import User
+from app.services.job_matching_service import (
+    match_resume_to_job,
+    find_suitable_jobs,
+    suggest_career_paths,
+    generate_cover_letter,
+    stream_cover_letter
+)
+from app.services.rate_limiter import LLMRateLimitError
+from app.utils.sse import sse_response, text_events
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+router = APIRouter(prefix="/jobs", tags=["job-matching"])
+
+
+class JobMatchRequest(BaseModel):
+    resume_id: int
+    job_description: str
+
+
+class JobListingInput(BaseModel):
+    id: str
+    title: str
+    company: str
+    description: str
+    location: Optional[str] = None
+    salary: Optional[str] = None
+
+
+class JobSearchRequest(BaseModel):
+    resume_id: int
+    job_listings: List[JobListingInput]
+    shortlist_k: Optional[int] = Field(default=None, ge=1)  # defaults to settings.JOB_SHORTLIST_K
+
+
+class CoverLetterRequest(BaseModel):
+    resume_id: int
+    job_description: str
+    company_name: str
+    role_title: str
+
+
+@router.post("/match")
+async def match_job(
+    request: JobMatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Match a resume to a specific job description
+    """
+    # Get resume from database
+    resume = db.query(ResumeDB).filter(ResumeDB.id == request.resume_id, ResumeDB.user_id == current_user.id).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    if not resume.parsed_data:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume must be parsed first. Upload with parse_with_ai=true"
+        )
+    
+    try:
+        match_result = await match_resume_to_job(
+            resume_data=resume.parsed_data,
+            job_description=request.job_description
+        )
+        
+        return {
+            "resume_id": request.resume_id,
+            "match_result": match_result
+        }
+    
+    except LLMRateLimitError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error matching job: {str(e)}")
+
+
+@router.post("/search")
+async def search_jobs(
+    request: JobSearchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Search and rank jobs based on resume
+    """
+    # Get resume from database
+    resume = db.query(ResumeDB).filter(ResumeDB.id == request.resume_id, ResumeDB.user_id == current_user.id).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    if not resume.parsed_data:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume must be parsed first. Upload with parse_with_ai=true"
+        )
+    
+    try:
+        # Convert Pydantic models to dicts
+        job_listings = [job.dict() for job in request.job_listings]
+        
+        ranked_jobs = await find_suitable_jobs(
+            resume_data=resume.parsed_data,
+            job_listings=job_listings,
+            shortlist_k=request.shortlist_k
+        )
+        
+        return {
+            "resume_id": request.resume_id,
+            "total_jobs": len(ranked_jobs),
+            "llm_scored_jobs": sum(1 for job in ranked_jobs if job["scored_by"] == "llm"),
+            "failed_jobs": sum(1 for job in ranked_jobs if "error" in job),
+            "ranked_jobs": ranked_jobs
+        }
+    
+    except LLMRateLimitError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching jobs: {str(e)}")
+
+
+@router.get("/{resume_id}/career-suggestions")
+async def get_career_suggestions(
+    resume_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Get career path suggestions based on resume
+    """
+    # Get resume from database
+    resume = db.query(ResumeDB).filter(ResumeDB.id == resume_id, ResumeDB.user_id == current_user.id).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    if not resume.parsed_data:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume must be parsed first. Upload with parse_with_ai=true"
+        )
+    
+    try:
+        suggestions = await suggest_career_paths(resume_data=resume.parsed_data)
+        
+        return {
+            "resume_id": resume_id,
+            "career_suggestions": suggestions
+        }
+    
+    except LLMRateLimitError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating suggestions: {str(e)}")
+
+
+@router.post("/cover-letter")
+async def create_cover_letter(
+    request: CoverLetterRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Generate a tailored cover letter for a job
+    """
+    # Get resume from database
+    resume = db.query(ResumeDB).filter(ResumeDB.id == request.resume_id, ResumeDB.user_id == current_user.id).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    if not resume.parsed_data:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume must be parsed first. Upload with parse_with_ai=true"
+        )
+    
+    try:
+        cover_letter = await generate_cover_letter(
+            resume_data=resume.parsed_data,
+            job_description=request.job_description,
+            company_name=request.company_name,
+            role_title=request.role_title
+        )
+        
+        return {
+            "resume_id": request.resume_id,
+            "company": request.company_name,
+            "role": request.role_title,
+            "cover_letter": cover_letter
+        }
+    
+    except LLMRateLimitError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating cover letter: {str(e)}")
+
+
+@router.post("/cover-letter/stream")
+async def stream_cover_letter_endpoint(
+    request: CoverLetterRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Stream a tailored cover letter as server-sent events (`token` deltas, then `done`)
+    """
+    # Get resume from database
+    resume = db.query(ResumeDB).filter(ResumeDB.id == request.resume_id, ResumeDB.user_id == current_user.id).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    if not resume.parsed_data:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume must be parsed first. Upload with parse_with_ai=true"
+        )
+    
+    deltas = stream_cover_letter(
+        resume_data=resume.parsed_data,
+        job_description=request.job_description,
+        company_name=request.company_name,
+        role_title=request.role_title
+    )
+    
+    return sse_response(text_events(deltas, lambda cover_letter: {
+        "resume_id": request.resume_id,
+        "company": request.company_name,
+        "role": request.role_title,
+        "cover_letter": cover_letter
+    }))
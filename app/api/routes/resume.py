@@ -1,15 +1,26 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, status
-from typing import List
+from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import get_db
 from app.api import deps
 from app.models.user import User
 from app.models.resume_model import ResumeDB
-from app.schemas.resume import Resume, ResumeParseRequest, ResumeAnalysisResponse, ResumeSmartUpdateRequest
+from app.schemas.resume import Resume, ResumeParseRequest, ResumeAnalysisResponse, ResumeSmartUpdateRequest, ResumeExportRequest
 from app.services.resume_service import resume_service
+from app.services.bulk_export import bulk_exporter
 from app.services.pdf_service import pdf_service
 from app.services.custom_pdf_generator import simran_pdf_service
+from app.services.rate_limiter import LLMRateLimitError
+from app.services.render_executor import RenderError
+from app.services.upload_pipeline import upload_pipeline, job_state
+from app.utils.downloads import binary_response, not_modified, quote_etag
+from app.utils.sse import sse_event, sse_response
+from app.utils.uploads import spool_upload, UploadTooLarge
+from app.utils.text_extraction import supported_extensions
+from app.utils.templates import template_names
 
 router = APIRouter()
 
@@ -23,25 +34,44 @@ async def parse_resume(
         # We can implement a direct parse method in service if needed, 
         # but for now we reuse the uploaded file logic or similar.
         # Let's assume we just want to parse the text provided.
-        from app.services.openai_service import parse_resume_with_ai
-        parsed_data = await parse_resume_with_ai(request.resume_text)
+        from app.services.resume_parser import resume_parser
+        parsed_data = await resume_parser.parse(request.resume_text)
         return parsed_data
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/upload", response_model=dict)
 async def upload_resume(
+    response: Response,
     file: UploadFile = File(...),
+    background: Optional[bool] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    """Upload and parse resume file, then save to DB"""
+    """Upload and parse resume file, then save to DB. With background=true (or UPLOAD_BACKGROUND)
+    the ids come back as soon as the file is stored and the parse runs as a job."""
     try:
-        if not file.filename.endswith(('.pdf', '.docx', '.txt')):
+        if not file.filename.lower().endswith(supported_extensions()):
             raise HTTPException(status_code=400, detail="Unsupported file format")
         
-        content = await file.read()
-        parsed_result = await resume_service.parse_uploaded_file(content, file.filename)
+        upload = await spool_upload(file, settings.UPLOAD_DIR, settings.MAX_FILE_SIZE, settings.UPLOAD_CHUNK_SIZE)
+        if settings.UPLOAD_BACKGROUND if background is None else background:
+            resume, job = await upload_pipeline.submit(db, current_user.id, upload)
+            response.status_code = status.HTTP_202_ACCEPTED
+            return {
+                "id": resume.id,
+                "job_id": job.id,
+                "filename": resume.filename,
+                "status": job.status,
+                "status_url": f"{settings.API_V1_STR}/resumes/jobs/{job.id}",
+                "events_url": f"{settings.API_V1_STR}/resumes/jobs/{job.id}/events"
+            }
+        
+        parsed_result = await resume_service.parse_uploaded_file(
+            upload.path, file.filename, db=db, user_id=current_user.id, content_hash=upload.sha256
+        )
         
         # Save to DB
         saved_resume = await resume_service.create_resume(db, current_user.id, parsed_result)
@@ -49,11 +79,75 @@ async def upload_resume(
         return {
             "id": saved_resume.id,
             "filename": saved_resume.filename,
-            "parsed_data": saved_resume.parsed_data
+            "parsed_data": saved_resume.parsed_data,
+            "deduplicated": parsed_result["deduplicated"]
         }
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (HTTPException, LLMRateLimitError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/jobs/{job_id}", response_model=dict)
+async def get_upload_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """Current stage of a background upload"""
+    job = upload_pipeline.get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_state(job, db.get(ResumeDB, job.resume_id))
+
+@router.get("/jobs/{job_id}/events")
+async def stream_upload_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """Server-sent `stage` events for a background upload, then `done` (with the parsed resume) or `error`"""
+    if not upload_pipeline.get_job(db, job_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events():
+        async for state in upload_pipeline.events(job_id):
+            event = {"done": "done", "failed": "error"}.get(state["status"], "stage")
+            yield sse_event(state, event=event)
+    
+    return sse_response(events())
+
+@router.post("/export")
+async def export_resumes(
+    request: ResumeExportRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """Stream a ZIP of every requested resume rendered in every requested template"""
+    resume_ids = list(dict.fromkeys(request.resume_ids))
+    templates = list(dict.fromkeys(request.templates))
+    if not resume_ids or not templates:
+        raise HTTPException(status_code=400, detail="Give at least one resume id and one template")
+    if len(resume_ids) > settings.EXPORT_MAX_RESUMES:
+        raise HTTPException(status_code=400, detail=f"At most {settings.EXPORT_MAX_RESUMES} resumes per export")
+    unknown = [template for template in templates if template not in template_names()]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown templates: {', '.join(unknown)}")
+
+    # Superusers (career-center admins) can export any resume; everyone else only their own
+    owner_id = None if current_user.is_superuser else current_user.id
+    resumes = await resume_service.get_resumes_by_ids(db, resume_ids, owner_id)
+    missing = sorted(set(resume_ids) - {resume.id for resume in resumes})
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Resumes not found: {', '.join(map(str, missing))}")
+
+    return StreamingResponse(
+        bulk_exporter.stream(resumes, templates),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="resumes.zip"', "Cache-Control": "no-store"}
+    )
+
 @router.get("/", response_model=List[dict])
 async def get_resumes(
     db: Session = Depends(get_db),
@@ -79,6 +173,8 @@ async def analyze_resume(
         # update db with analysis
         db.commit() 
         return analysis
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -101,6 +197,8 @@ async def generate_pdf(
             "pdf_data": pdf_bytes.hex(),
             "filename": f"resume_{resume_id}_{template}.pdf"
         }
+    except RenderError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -125,14 +223,74 @@ async def generate_simran_style_pdf(
         # For now, pass whole resume object as it was done in original code
         # Convert DB model parsed_data (dict) to Resume Pydantic model
         resume_data = Resume(**resume.parsed_data)
-        pdf_bytes = await simran_pdf_service.generate_simran_style_pdf(resume_data)
+        pdf_bytes = await simran_pdf_service.generate_simran_style_pdf(resume_data, resume_id=resume.id)
         
         return {
             "pdf_data": pdf_bytes.hex(),
             "filename": "simran_style_resume.pdf"
         }
+    except RenderError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{resume_id}/pdf")
+async def download_pdf(
+    resume_id: int,
+    request: Request,
+    template: str = "tech",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """Download the rendered PDF as a file; supports If-None-Match and Range"""
+    resume = await resume_service.get_resume(db, resume_id, current_user.id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    etag = quote_etag(pdf_service.pdf_key(resume, template))
+    cache_control = settings.PDF_DOWNLOAD_CACHE_CONTROL
+    cached = not_modified(request, etag, cache_control)
+    if cached is not None:
+        return cached
+
+    try:
+        pdf_bytes = await pdf_service.generate_pdf(resume, template)
+    except RenderError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return binary_response(request, pdf_bytes, etag, f"resume_{resume_id}_{template}.pdf", "application/pdf", cache_control)
+
+@router.get("/{resume_id}/simran-style/pdf")
+async def download_simran_style_pdf(
+    resume_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """Download the Simran-style PDF as a file; supports If-None-Match and Range"""
+    resume = await resume_service.get_resume(db, resume_id, current_user.id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    try:
+        resume_data = Resume(**resume.parsed_data)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    etag = quote_etag(simran_pdf_service.pdf_key(resume_data))
+    cache_control = settings.PDF_DOWNLOAD_CACHE_CONTROL
+    cached = not_modified(request, etag, cache_control)
+    if cached is not None:
+        return cached
+
+    try:
+        pdf_bytes = await simran_pdf_service.generate_simran_style_pdf(resume_data, resume_id=resume.id)
+    except RenderError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return binary_response(request, pdf_bytes, etag, "simran_style_resume.pdf", "application/pdf", cache_control)
 
 
 @router.post("/{resume_id}/update-smart")
@@ -156,6 +314,8 @@ async def smart_update_resume(
         return result
     except HTTPException as he:
         raise he
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
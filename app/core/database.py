@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
@@ -12,6 +12,42 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def add_missing_columns(bind, metadata):
+    """
+    create_all() never alters existing tables; add new nullable columns so databases
+    created before a model change keep working. Run it once per deploy through
+    `python -m app.core.migrate`, not from app startup: concurrent ALTERs from
+    several workers would race.
+    """
+    inspector = inspect(bind)
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        missing = [column for column in table.columns if column.name not in existing]
+        if not missing:
+            continue
+        with bind.begin() as conn:
+            for column in missing:
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+
+def create_missing_indexes(bind, metadata):
+    """
+    Create every model index the database lacks, including those on columns added
+    by an earlier upgrade (the dedup lookups on content_hash and text_hash)
+    """
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
+def upgrade_schema(bind, metadata):
+    metadata.create_all(bind=bind)
+    add_missing_columns(bind, metadata)
+    create_missing_indexes(bind, metadata)
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,19 @@
+"""
+Bring an existing database up to the current models:
+
+    python -m app.core.migrate
+
+Run once per deploy, before the web processes start (the Procfile release phase and
+Render's preDeployCommand do this), so schema changes never race between workers.
+"""
+from app.core.database import engine, upgrade_schema
+from app.models import Base
+
+
+def main():
+    upgrade_schema(engine, Base.metadata)
+    print(f"Schema up to date: {engine.url.render_as_string(hide_password=True)}")
+
+
+if __name__ == "__main__":
+    main()
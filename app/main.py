@@ -1,9 +1,19 @@
 from fastapi import FastAPI  # Fixed: was "rom" instead of "from"
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.core.config import settings
 from app.models.base import Base  # Import Base
 from app.core.database import engine  # Import engine
 from app.api.api_router import router as api_router  # Moved imports to top
+from app.services import llm_gateway
+from app.services.rate_limiter import LLMRateLimitError
+from app.services.extraction_executor import extraction_executor
+from app.services.resume_parser import resume_parser
+from app.services.upload_pipeline import upload_pipeline
+from app.services.render_cache import render_cache
+from app.services.render_executor import render_executor
+from app.services.bulk_export import bulk_exporter
+from app.utils.templates import warm_templates
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -23,6 +33,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(LLMRateLimitError)
+async def llm_rate_limit_handler(request, exc: LLMRateLimitError):
+    # Provider throttling is a temporary condition, not a server error
+    headers = {"Retry-After": str(max(1, round(exc.retry_after)))} if exc.retry_after else {}
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers=headers)
+
 @app.get("/")
 async def root():
     return {"message": "Resume Agent API", "version": "1.0.0"}
@@ -31,10 +47,56 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics/llm")
+async def llm_metrics():
+    return llm_gateway.metrics()
+
+@app.get("/metrics/extraction")
+async def extraction_metrics():
+    return extraction_executor.stats()
+
+@app.get("/metrics/parser")
+async def parser_metrics():
+    return resume_parser.stats()
+
+@app.get("/metrics/uploads")
+async def upload_metrics():
+    return upload_pipeline.stats()
+
+@app.get("/metrics/render-cache")
+async def render_cache_metrics():
+    return render_cache.stats()
+
+@app.get("/metrics/render")
+async def render_metrics():
+    return render_executor.stats()
+
+@app.get("/metrics/exports")
+async def export_metrics():
+    return bulk_exporter.stats()
+
+@app.on_event("startup")
+async def compile_pdf_templates():
+    # Style sheets and page plans are built once per process, before the first render
+    warm_templates()
+
+@app.on_event("startup")
+async def recover_upload_jobs():
+    # Jobs queued in memory by a previous process are re-dispatched instead of staying open
+    await upload_pipeline.start()
+
+@app.on_event("shutdown")
+async def shutdown_llm_gateway():
+    # Release pooled keep-alive connections to the LLM provider
+    await llm_gateway.close_client()
+    extraction_executor.shutdown()
+    await upload_pipeline.shutdown()
+    render_executor.shutdown()
+
 # Include API router with prefix
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-# Create all tables
+# Create all tables; columns and indexes added to existing tables come from `python -m app.core.migrate`
 Base.metadata.create_all(bind=engine)
 
 if __name__ == "__main__":
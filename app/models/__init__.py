@@ -1,6 +1,7 @@
 from app.models.base import Base
 from app.models.user import User
 from app.models.resume_model import ResumeDB
+from app.models.upload_job import UploadJobDB
 
-__all__ = ["Base", "User", "ResumeDB"]
+__all__ = ["Base", "User", "ResumeDB", "UploadJobDB"]
 
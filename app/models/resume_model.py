@@ -1,13 +1,25 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
 class ResumeDB(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        Index("ix_resumes_user_content_hash", "user_id", "content_hash"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    filename = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)
+    extracted_text = Column(Text)
+    parsed_data = Column(JSON)
+    ai_analysis = Column(JSON)
+    content_hash = Column(String(64))  # SHA-256 of the uploaded bytes
+    text_hash = Column(String(64), index=True)  # SHA-256 of the whitespace-normalized extracted text
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     user = relationship("User", back_populates="resumes")
 
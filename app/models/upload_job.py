@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+class UploadJobDB(Base):
+    __tablename__ = "upload_jobs"
+    
+    id = Column(String(32), primary_key=True)  # uuid4 hex, handed to the client
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    status = Column(String(16), nullable=False, default="queued")  # queued, running, done, failed
+    stage = Column(String(16), nullable=False, default="queued")  # last stage reached
+    stage_times = Column(JSON)  # stage -> unix time it started
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -74,4 +74,8 @@ class ResumeSmartUpdateRequest(BaseModel):
     update_text: str
 
 
-    
\ No newline at end of file
+    
+
+class ResumeExportRequest(BaseModel):
+    resume_ids: List[int]
+    templates: List[str] = ["tech"]
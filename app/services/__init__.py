@@ -1,3 +1,4 @@
+from . import llm_gateway
 from . import openai_service as ai_service
 from .resume_service import resume_service
 from . import job_matching_service
@@ -5,6 +6,7 @@ from .pdf_service import pdf_service
 from .custom_pdf_generator import simran_pdf_service
 
 __all__ = [
+    "llm_gateway",
     "ai_service",
     "resume_service", 
     "job_matching_service",
@@ -0,0 +1,88 @@
+"""
+Bulk PDF export: renders every (resume, template) pair and streams them out as one
+ZIP archive in the order they finish.
+"""
+import asyncio
+import json
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Set, Tuple
+from app.core.config import settings
+from app.models.resume_model import ResumeDB
+from app.schemas.resume import Resume
+from app.services.custom_pdf_generator import simran_pdf_service
+from app.services.pdf_service import pdf_service
+from app.utils.zipstream import ZipStream
+
+SIMRAN_TEMPLATE = "simran"
+
+
+class BulkExporter:
+    """
+    At most max_in_flight renders are running or finished-but-unwritten at once, so
+    memory is bounded by that many PDFs whatever the size of the export. Renders go
+    through the render cache and executor like single downloads. A file that fails
+    is listed in errors.json at the end of the archive instead of aborting a
+    response that has already started. Closing the stream (a client disconnect)
+    cancels the renders still pending.
+    """
+
+    def __init__(self, max_in_flight: int = 4):
+        self.max_in_flight = max_in_flight
+        self._stats = {"exports": 0, "files": 0, "failed_files": 0, "cancelled": 0}
+
+    async def stream(self, resumes: Sequence[ResumeDB], templates: Sequence[str]) -> AsyncIterator[bytes]:
+        jobs: Iterator[Tuple[ResumeDB, str]] = ((resume, template) for resume in resumes for template in templates)
+        pending: Set[asyncio.Task] = set()
+        archive = ZipStream()
+        errors: List[dict] = []
+        finished = False
+
+        def fill() -> None:
+            while len(pending) < self.max_in_flight:
+                job = next(jobs, None)
+                if job is None:
+                    return
+                pending.add(asyncio.create_task(self._render(*job)))
+
+        self._stats["exports"] += 1
+        try:
+            fill()
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+                # Finished PDFs are written before new renders start, so together they never exceed the cap
+                for task in done:
+                    name, pdf_bytes, error = task.result()
+                    if error is not None:
+                        errors.append({"file": name, "error": error})
+                        self._stats["failed_files"] += 1
+                        continue
+                    self._stats["files"] += 1
+                    yield archive.add(name, pdf_bytes)
+                fill()
+
+            if errors:
+                yield archive.add("errors.json", json.dumps(errors, indent=2).encode("utf-8"))
+            yield archive.close()
+            finished = True
+        finally:
+            if not finished:
+                self._stats["cancelled"] += 1
+            for task in pending:
+                task.cancel()
+
+    async def _render(self, resume: ResumeDB, template: str) -> Tuple[str, Optional[bytes], Optional[str]]:
+        name = f"resume_{resume.id}_{template}.pdf"
+        try:
+            if template == SIMRAN_TEMPLATE:
+                pdf_bytes = await simran_pdf_service.generate_simran_style_pdf(Resume(**(resume.parsed_data or {})), resume_id=resume.id)
+            else:
+                pdf_bytes = await pdf_service.generate_pdf(resume, template)
+            return name, pdf_bytes, None
+        except Exception as e:
+            return name, None, str(e)
+
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+
+bulk_exporter = BulkExporter(max_in_flight=settings.EXPORT_MAX_IN_FLIGHT)
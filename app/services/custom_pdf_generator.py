@@ -2,361 +2,336 @@ import io
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch, mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Frame, PageTemplate, BaseDocTemplate, FrameBreak
+from reportlab.platypus import Paragraph, Spacer, FrameBreak
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
-from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor
 from app.schemas.resume import Resume
-from typing import List, Dict
-import os
+from app.services.render_cache import render_cache, render_key
+from app.utils.templates import FrameSpec, TemplatePlan, get_template, register_template
+from typing import List, Dict, Optional
 
-class SimranStylePDFGenerator:
-    def __init__(self):
-        # Color scheme matching the image
-        self.primary_blue = HexColor('#4A90E2')  # Main blue color
-        self.dark_blue = HexColor('#2C5282')    # Darker blue for text
-        self.light_gray = HexColor('#F7F9FC')   # Light background
-        self.dark_gray = HexColor('#4A5568')    # Dark text
-        self.medium_gray = HexColor('#718096')  # Medium gray for details
-        
-        # Layout dimensions
-        self.page_width = letter[0]
-        self.page_height = letter[1]
-        self.sidebar_width = 2.5 * inch
-        self.main_content_width = self.page_width - self.sidebar_width - 0.5 * inch
+# Color scheme matching the image
+PRIMARY_BLUE = HexColor('#4A90E2')  # Main blue color
+DARK_BLUE = HexColor('#2C5282')    # Darker blue for text
+LIGHT_GRAY = HexColor('#F7F9FC')   # Light background
+DARK_GRAY = HexColor('#4A5568')    # Dark text
+MEDIUM_GRAY = HexColor('#718096')  # Medium gray for details
+
+# Layout dimensions
+PAGE_WIDTH, PAGE_HEIGHT = letter
+SIDEBAR_WIDTH = 2.5 * inch
+MAIN_CONTENT_WIDTH = PAGE_WIDTH - SIDEBAR_WIDTH - 0.5 * inch
+
+def _draw_background(canvas, doc):
+    """Draw the blue sidebar background"""
+    canvas.saveState()
+    
+    # Draw blue sidebar
+    canvas.setFillColor(PRIMARY_BLUE)
+    canvas.rect(0, 0, SIDEBAR_WIDTH, PAGE_HEIGHT, fill=1)
+    
+    # Draw light background for main content
+    canvas.setFillColor(LIGHT_GRAY)
+    canvas.rect(SIDEBAR_WIDTH, 0, MAIN_CONTENT_WIDTH + 0.5 * inch, PAGE_HEIGHT, fill=1)
+    
+    canvas.restoreState()
+
+def _create_styles() -> Dict:
+    """Create custom styles matching the design"""
+    base_styles = getSampleStyleSheet()
+    
+    styles = {
+        # Sidebar styles (white text on blue)
+        'sidebar_name': ParagraphStyle(
+            'SidebarName',
+            parent=base_styles['Normal'],
+            fontSize=28,
+            fontName='Helvetica-Bold',
+            textColor=colors.white,
+            alignment=TA_LEFT,
+            spaceAfter=10,
+            leading=32
+        ),
         
-    def generate_resume_pdf(self, resume: Resume) -> bytes:
-        """Generate PDF matching Simran's resume style"""
-        buffer = io.BytesIO()
+        'sidebar_section_header': ParagraphStyle(
+            'SidebarSectionHeader',
+            parent=base_styles['Normal'],
+            fontSize=16,
+            fontName='Helvetica-Bold',
+            textColor=colors.white,
+            alignment=TA_LEFT,
+            spaceBefore=25,
+            spaceAfter=12,
+            borderWidth=0,
+            borderPadding=0
+        ),
         
-        # Create custom document with frames
-        doc = BaseDocTemplate(
-            buffer,
-            pagesize=letter,
-            topMargin=0,
-            bottomMargin=0,
-            leftMargin=0,
-            rightMargin=0
-        )
+        'sidebar_contact': ParagraphStyle(
+            'SidebarContact',
+            parent=base_styles['Normal'],
+            fontSize=10,
+            fontName='Helvetica',
+            textColor=colors.white,
+            alignment=TA_LEFT,
+            spaceAfter=8,
+            leftIndent=15
+        ),
         
-        # Define frames for two-column layout
-        sidebar_frame = Frame(
-            0, 0,
-            self.sidebar_width, self.page_height,
-            leftPadding=20, rightPadding=10,
-            topPadding=30, bottomPadding=30,
-            id='sidebar'
-        )
+        'sidebar_skill': ParagraphStyle(
+            'SidebarSkill',
+            parent=base_styles['Normal'],
+            fontSize=11,
+            fontName='Helvetica',
+            textColor=colors.white,
+            alignment=TA_LEFT,
+            spaceAfter=6,
+            leftIndent=15,
+            bulletIndent=10
+        ),
         
-        main_frame = Frame(
-            self.sidebar_width + 0.25 * inch, 0,
-            self.main_content_width, self.page_height,
-            leftPadding=20, rightPadding=20,
-            topPadding=30, bottomPadding=30,
-            id='main'
-        )
+        # Main content styles
+        'main_section_header': ParagraphStyle(
+            'MainSectionHeader',
+            parent=base_styles['Normal'],
+            fontSize=18,
+            fontName='Helvetica-Bold',
+            textColor=PRIMARY_BLUE,
+            alignment=TA_LEFT,
+            spaceBefore=25,
+            spaceAfter=15,
+            borderWidth=2,
+            borderColor=PRIMARY_BLUE,
+            borderPadding=8
+        ),
         
-        # Create page template
-        page_template = PageTemplate(
-            id='resume_template',
-            frames=[sidebar_frame, main_frame],
-            onPage=self._draw_background
-        )
+        'main_content': ParagraphStyle(
+            'MainContent',
+            parent=base_styles['Normal'],
+            fontSize=11,
+            fontName='Helvetica',
+            textColor=DARK_GRAY,
+            alignment=TA_LEFT,
+            spaceAfter=8,
+            leading=14
+        ),
         
-        doc.addPageTemplates([page_template])
+        'job_title': ParagraphStyle(
+            'JobTitle',
+            parent=base_styles['Normal'],
+            fontSize=14,
+            fontName='Helvetica-Bold',
+            textColor=DARK_GRAY,
+            alignment=TA_LEFT,
+            spaceAfter=4
+        ),
         
-        # Create styles
-        styles = self._create_styles()
+        'job_company': ParagraphStyle(
+            'JobCompany',
+            parent=base_styles['Normal'],
+            fontSize=12,
+            fontName='Helvetica',
+            textColor=DARK_GRAY,
+            alignment=TA_LEFT,
+            spaceAfter=2
+        ),
         
-        # Build content
-        story = []
+        'job_location': ParagraphStyle(
+            'JobLocation',
+            parent=base_styles['Normal'],
+            fontSize=10,
+            fontName='Helvetica-Oblique',
+            textColor=MEDIUM_GRAY,
+            alignment=TA_LEFT,
+            spaceAfter=8
+        ),
         
-        # Sidebar content
-        story.extend(self._build_sidebar_content(resume, styles))
+        'bullet_point': ParagraphStyle(
+            'BulletPoint',
+            parent=base_styles['Normal'],
+            fontSize=10,
+            fontName='Helvetica',
+            textColor=DARK_GRAY,
+            alignment=TA_LEFT,
+            spaceAfter=4,
+            leftIndent=15,
+            bulletIndent=10
+        ),
         
-        # Main content
-        story.extend(self._build_main_content(resume, styles))
+        'education_degree': ParagraphStyle(
+            'EducationDegree',
+            parent=base_styles['Normal'],
+            fontSize=12,
+            fontName='Helvetica-Bold',
+            textColor=DARK_GRAY,
+            alignment=TA_LEFT,
+            spaceAfter=2
+        ),
         
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        'education_details': ParagraphStyle(
+            'EducationDetails',
+            parent=base_styles['Normal'],
+            fontSize=11,
+            fontName='Helvetica',
+            textColor=DARK_GRAY,
+            alignment=TA_LEFT,
+            spaceAfter=4
+        )
+    }
     
-    def _draw_background(self, canvas, doc):
-        """Draw the blue sidebar background"""
-        canvas.saveState()
-        
-        # Draw blue sidebar
-        canvas.setFillColor(self.primary_blue)
-        canvas.rect(0, 0, self.sidebar_width, self.page_height, fill=1)
+    return styles
+
+def _build_sidebar_content(resume: Resume, styles: Dict) -> List:
+    """Build sidebar content (left column)"""
+    content = []
+    
+    # Name
+    content.append(Paragraph(resume.name, styles['sidebar_name']))
+    content.append(Spacer(1, 20))
+    
+    # Contact Information (with icons)
+    if resume.phone or resume.email or resume.location:
+        content.append(Paragraph("📞 Contact", styles['sidebar_section_header']))
         
-        # Draw light background for main content
-        canvas.setFillColor(self.light_gray)
-        canvas.rect(self.sidebar_width, 0, self.main_content_width + 0.5 * inch, self.page_height, fill=1)
+        if resume.phone:
+            content.append(Paragraph(f"📱 {resume.phone}", styles['sidebar_contact']))
+        if resume.email:
+            content.append(Paragraph(f"✉️ {resume.email}", styles['sidebar_contact']))
+        if resume.location:
+            content.append(Paragraph(f"📍 {resume.location}", styles['sidebar_contact']))
+    
+    # Skills Section
+    if resume.skills:
+        content.append(Paragraph("📊 Skills", styles['sidebar_section_header']))
         
-        canvas.restoreState()
+        for skill in resume.skills:
+            content.append(Paragraph(f"• {skill}", styles['sidebar_skill']))
+    
+    return content
+
+def _build_main_content(resume: Resume, styles: Dict) -> List:
+    """Build main content (right column)"""
+    content = []
     
-    def _create_styles(self) -> Dict:
-        """Create custom styles matching the design"""
-        base_styles = getSampleStyleSheet()
+    # Add frame break to move to main content area
+    content.append(FrameBreak())
+    
+    # Professional Summary (if exists)
+    if resume.summary:
+        content.append(Paragraph(resume.summary, styles['main_content']))
+        content.append(Spacer(1, 20))
+    
+    # Education Section
+    if resume.education:
+        content.append(Paragraph("🎓 Education", styles['main_section_header']))
         
-        styles = {
-            # Sidebar styles (white text on blue)
-            'sidebar_name': ParagraphStyle(
-                'SidebarName',
-                parent=base_styles['Normal'],
-                fontSize=28,
-                fontName='Helvetica-Bold',
-                textColor=colors.white,
-                alignment=TA_LEFT,
-                spaceAfter=10,
-                leading=32
-            ),
-            
-            'sidebar_section_header': ParagraphStyle(
-                'SidebarSectionHeader',
-                parent=base_styles['Normal'],
-                fontSize=16,
-                fontName='Helvetica-Bold',
-                textColor=colors.white,
-                alignment=TA_LEFT,
-                spaceBefore=25,
-                spaceAfter=12,
-                borderWidth=0,
-                borderPadding=0
-            ),
-            
-            'sidebar_contact': ParagraphStyle(
-                'SidebarContact',
-                parent=base_styles['Normal'],
-                fontSize=10,
-                fontName='Helvetica',
-                textColor=colors.white,
-                alignment=TA_LEFT,
-                spaceAfter=8,
-                leftIndent=15
-            ),
-            
-            'sidebar_skill': ParagraphStyle(
-                'SidebarSkill',
-                parent=base_styles['Normal'],
-                fontSize=11,
-                fontName='Helvetica',
-                textColor=colors.white,
-                alignment=TA_LEFT,
-                spaceAfter=6,
-                leftIndent=15,
-                bulletIndent=10
-            ),
-            
-            # Main content styles
-            'main_section_header': ParagraphStyle(
-                'MainSectionHeader',
-                parent=base_styles['Normal'],
-                fontSize=18,
-                fontName='Helvetica-Bold',
-                textColor=self.primary_blue,
-                alignment=TA_LEFT,
-                spaceBefore=25,
-                spaceAfter=15,
-                borderWidth=2,
-                borderColor=self.primary_blue,
-                borderPadding=8
-            ),
+        for edu in resume.education:
+            if edu.school:
+                content.append(Paragraph(edu.school, styles['job_title']))
             
-            'main_content': ParagraphStyle(
-                'MainContent',
-                parent=base_styles['Normal'],
-                fontSize=11,
-                fontName='Helvetica',
-                textColor=self.dark_gray,
-                alignment=TA_LEFT,
-                spaceAfter=8,
-                leading=14
-            ),
+            degree_text = ""
+            if edu.degree:
+                degree_text = edu.degree
+            if edu.gpa:
+                degree_text += f", CGPA: {edu.gpa}"
             
-            'job_title': ParagraphStyle(
-                'JobTitle',
-                parent=base_styles['Normal'],
-                fontSize=14,
-                fontName='Helvetica-Bold',
-                textColor=self.dark_gray,
-                alignment=TA_LEFT,
-                spaceAfter=4
-            ),
+            if degree_text:
+                content.append(Paragraph(degree_text, styles['education_details']))
             
-            'job_company': ParagraphStyle(
-                'JobCompany',
-                parent=base_styles['Normal'],
-                fontSize=12,
-                fontName='Helvetica',
-                textColor=self.dark_gray,
-                alignment=TA_LEFT,
-                spaceAfter=2
-            ),
+            if hasattr(edu, 'location') and edu.location:
+                content.append(Paragraph(edu.location, styles['job_location']))
             
-            'job_location': ParagraphStyle(
-                'JobLocation',
-                parent=base_styles['Normal'],
-                fontSize=10,
-                fontName='Helvetica-Oblique',
-                textColor=self.medium_gray,
-                alignment=TA_LEFT,
-                spaceAfter=8
-            ),
+            if edu.year:
+                content.append(Paragraph(edu.year, styles['education_details']))
             
-            'bullet_point': ParagraphStyle(
-                'BulletPoint',
-                parent=base_styles['Normal'],
-                fontSize=10,
-                fontName='Helvetica',
-                textColor=self.dark_gray,
-                alignment=TA_LEFT,
-                spaceAfter=4,
-                leftIndent=15,
-                bulletIndent=10
-            ),
-            
-            'education_degree': ParagraphStyle(
-                'EducationDegree',
-                parent=base_styles['Normal'],
-                fontSize=12,
-                fontName='Helvetica-Bold',
-                textColor=self.dark_gray,
-                alignment=TA_LEFT,
-                spaceAfter=2
-            ),
-            
-            'education_details': ParagraphStyle(
-                'EducationDetails',
-                parent=base_styles['Normal'],
-                fontSize=11,
-                fontName='Helvetica',
-                textColor=self.dark_gray,
-                alignment=TA_LEFT,
-                spaceAfter=4
-            )
-        }
-        
-        return styles
+            content.append(Spacer(1, 15))
     
-    def _build_sidebar_content(self, resume: Resume, styles: Dict) -> List:
-        """Build sidebar content (left column)"""
-        content = []
+    # Experience Section
+    if resume.experience:
+        content.append(Paragraph("💼 Experience", styles['main_section_header']))
         
-        # Name
-        content.append(Paragraph(resume.name, styles['sidebar_name']))
-        content.append(Spacer(1, 20))
-        
-        # Contact Information (with icons)
-        if resume.phone or resume.email or resume.location:
-            content.append(Paragraph("📞 Contact", styles['sidebar_section_header']))
+        for exp in resume.experience:
+            if exp.company:
+                content.append(Paragraph(exp.company, styles['job_title']))
             
-            if resume.phone:
-                content.append(Paragraph(f"📱 {resume.phone}", styles['sidebar_contact']))
-            if resume.email:
-                content.append(Paragraph(f"✉️ {resume.email}", styles['sidebar_contact']))
-            if resume.location:
-                content.append(Paragraph(f"📍 {resume.location}", styles['sidebar_contact']))
-        
-        # Skills Section
-        if resume.skills:
-            content.append(Paragraph("📊 Skills", styles['sidebar_section_header']))
+            if exp.title:
+                content.append(Paragraph(exp.title, styles['job_company']))
             
-            for skill in resume.skills:
-                content.append(Paragraph(f"• {skill}", styles['sidebar_skill']))
-        
-        return content
-    
-    def _build_main_content(self, resume: Resume, styles: Dict) -> List:
-        """Build main content (right column)"""
-        content = []
-        
-        # Add frame break to move to main content area
-        content.append(FrameBreak())
-        
-        # Professional Summary (if exists)
-        if resume.summary:
-            content.append(Paragraph(resume.summary, styles['main_content']))
-            content.append(Spacer(1, 20))
-        
-        # Education Section
-        if resume.education:
-            content.append(Paragraph("🎓 Education", styles['main_section_header']))
+            if exp.location:
+                content.append(Paragraph(exp.location, styles['job_location']))
             
-            for edu in resume.education:
-                if edu.school:
-                    content.append(Paragraph(edu.school, styles['job_title']))
-                
-                degree_text = ""
-                if edu.degree:
-                    degree_text = edu.degree
-                if edu.gpa:
-                    degree_text += f", CGPA: {edu.gpa}"
-                
-                if degree_text:
-                    content.append(Paragraph(degree_text, styles['education_details']))
-                
-                if hasattr(edu, 'location') and edu.location:
-                    content.append(Paragraph(edu.location, styles['job_location']))
-                
-                if edu.year:
-                    content.append(Paragraph(edu.year, styles['education_details']))
-                
-                content.append(Spacer(1, 15))
-        
-        # Experience Section
-        if resume.experience:
-            content.append(Paragraph("💼 Experience", styles['main_section_header']))
+            # Bullet points
+            for bullet in exp.bullets:
+                content.append(Paragraph(f"• {bullet}", styles['bullet_point']))
             
-            for exp in resume.experience:
-                if exp.company:
-                    content.append(Paragraph(exp.company, styles['job_title']))
-                
-                if exp.title:
-                    content.append(Paragraph(exp.title, styles['job_company']))
-                
-                if exp.location:
-                    content.append(Paragraph(exp.location, styles['job_location']))
-                
-                # Bullet points
-                for bullet in exp.bullets:
-                    content.append(Paragraph(f"• {bullet}", styles['bullet_point']))
-                
-                content.append(Spacer(1, 15))
+            content.append(Spacer(1, 15))
+    
+    # Awards Section (if any achievements)
+    awards = [
+        "Selected in Top 10 teams in Innoquest3.0",
+        "In Top 1000 teams in Vibe hack 2.0", 
+        "In Top 5000 teams in Build with India Hackathon"
+    ]
+    
+    if awards:
+        content.append(Paragraph("🏆 Awards", styles['main_section_header']))
         
-        # Awards Section (if any achievements)
-        awards = [
-            "Selected in Top 10 teams in Innoquest3.0",
-            "In Top 1000 teams in Vibe hack 2.0", 
-            "In Top 5000 teams in Build with India Hackathon"
-        ]
+        for award in awards:
+            content.append(Paragraph(f"• {award}", styles['bullet_point']))
         
-        if awards:
-            content.append(Paragraph("🏆 Awards", styles['main_section_header']))
-            
-            for award in awards:
-                content.append(Paragraph(f"• {award}", styles['bullet_point']))
-            
-            content.append(Spacer(1, 15))
+        content.append(Spacer(1, 15))
+    
+    # Certifications Section
+    if resume.certifications:
+        content.append(Paragraph("🎖️ Certifications", styles['main_section_header']))
         
-        # Certifications Section
-        if resume.certifications:
-            content.append(Paragraph("🎖️ Certifications", styles['main_section_header']))
-            
-            for cert in resume.certifications:
-                content.append(Paragraph(f"• {cert}", styles['bullet_point']))
+        for cert in resume.certifications:
+            content.append(Paragraph(f"• {cert}", styles['bullet_point']))
+    
+    return content
+
+def _as_resume(data) -> Resume:
+    return data if isinstance(data, Resume) else Resume(**data)
+
+def compile_simran_template() -> TemplatePlan:
+    """Two-column layout: blue sidebar with contact and skills, main column for the rest"""
+    return TemplatePlan(
+        name="simran",
+        version="2",
+        styles=_create_styles(),
+        sections=(_build_sidebar_content, _build_main_content),
+        margins={"topMargin": 0, "bottomMargin": 0, "leftMargin": 0, "rightMargin": 0},
+        frames=(
+            # Define frames for two-column layout
+            FrameSpec('sidebar', 0, 0, SIDEBAR_WIDTH, PAGE_HEIGHT, padding=(20, 10, 30, 30)),
+            FrameSpec('main', SIDEBAR_WIDTH + 0.25 * inch, 0, MAIN_CONTENT_WIDTH, PAGE_HEIGHT, padding=(20, 20, 30, 30))
+        ),
+        on_page=_draw_background,
+        prepare=_as_resume
+    )
+
+register_template("simran", compile_simran_template)
+
+class SimranStylePDFGenerator:
+    def __init__(self):
+        self.plan = get_template("simran")
         
-        return content
+    def generate_resume_pdf(self, resume: Resume) -> bytes:
+        """Generate PDF matching Simran's resume style"""
+        return self.plan.render(resume)
 
 # Service integration
 class SimranStylePDFService:
     def __init__(self):
         self.generator = SimranStylePDFGenerator()
     
-    async def generate_simran_style_pdf(self, resume: Resume) -> bytes:
-        """Generate PDF in Simran's exact style"""
-        return self.generator.generate_resume_pdf(resume)
+    async def generate_simran_style_pdf(self, resume: Resume, resume_id: Optional[int] = None) -> bytes:
+        """Generate PDF in Simran's exact style; with a resume id, repeat downloads come from the render cache"""
+        return await render_cache.get_or_render(resume_id, resume.dict(), self.generator.plan)
+
+    def pdf_key(self, resume: Resume) -> str:
+        """Identity of the PDF generate_simran_style_pdf would return, known without rendering it"""
+        return render_key(resume.dict(), self.generator.plan)
 
 # Singleton instance
 simran_pdf_service = SimranStylePDFService()
@@ -0,0 +1,180 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import time
+from typing import Callable, Dict, Optional
+from app.core.config import settings
+from app.utils.text_extraction import ExtractionResult, Extractor, Source, UnsupportedFormatError, resolve_extractor
+
+
+class ExtractionError(Exception):
+    """
+    Document could not be extracted; the base class means it is unreadable or corrupt
+    """
+
+
+class ExtractionTooLarge(ExtractionError):
+    """
+    Document is over the page cap
+    """
+
+
+class ExtractionTimeout(ExtractionError):
+    """
+    Extraction missed its deadline
+    """
+
+
+class ExtractionExecutor:
+    """
+    Runs document extraction off the event loop in a process pool. Long PDFs are
+    split into page ranges extracted in parallel; every document has a deadline
+    and a page cap.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: float = 30.0,
+        max_pages: int = 50,
+        pages_per_task: int = 8
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.pages_per_task = pages_per_task
+        self._pool: Optional[Executor] = None
+        self._documents: Dict[str, int] = {}
+        self._stage_ms: Dict[str, Dict[str, float]] = {}
+
+    def _executor(self) -> Optional[Executor]:
+        # max_workers=0 means "no pool": run in the default thread executor instead
+        if self.max_workers == 0:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers or os.cpu_count(),
+                # spawn avoids forking a process that already runs event-loop and DB threads
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None):
+        """
+        Run a picklable function in the pool with a deadline. A worker crash breaks the
+        whole pool, so the pool is replaced and the call tried once more.
+        """
+        for attempt in range(2):
+            pool = self._executor()
+            try:
+                return await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(pool, fn, *args),
+                    timeout=timeout or self.timeout
+                )
+            except asyncio.TimeoutError:
+                raise ExtractionTimeout(f"Text extraction timed out after {timeout or self.timeout}s")
+            except BrokenProcessPool:
+                self._discard(pool)
+                if attempt:
+                    raise ExtractionError("Text extraction worker crashed on this document")
+            except (ExtractionError, UnsupportedFormatError):
+                raise
+            except Exception as e:
+                raise ExtractionError(f"Could not read document: {str(e)}")
+
+    def _discard(self, pool: Optional[Executor]) -> None:
+        # Calls that failed together on one broken pool replace it only once
+        if pool is not None and self._pool is pool:
+            self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def extract(
+        self,
+        source: Source,
+        filename: str,
+        content_type: Optional[str] = None,
+        with_blocks: bool = False
+    ) -> ExtractionResult:
+        """
+        Extract a document with the registered extractor for its type. Paged documents
+        beyond the first range are fanned out across workers. Raises
+        UnsupportedFormatError for unknown types.
+        """
+        extractor = resolve_extractor(filename, content_type)
+        started = time.perf_counter()
+        if extractor.paged:
+            result = await self._with_deadline(self._extract_paged(extractor, source, with_blocks))
+        else:
+            result = await self.run(extractor.extract, source, 0, None, with_blocks)
+        result.timings["total"] = (time.perf_counter() - started) * 1000
+        self._record(extractor.name, result.timings)
+        return result
+
+    async def _extract_paged(self, extractor: Extractor, source: Source, with_blocks: bool) -> ExtractionResult:
+        step = self.pages_per_task
+        # The first range also tells us how many pages there are
+        result = await self.run(extractor.extract, source, 0, step, with_blocks)
+        if result.pages > self.max_pages:
+            raise ExtractionTooLarge(f"Document has {result.pages} pages; the limit is {self.max_pages}")
+        
+        rest = await asyncio.gather(*[
+            self.run(extractor.extract, source, start, start + step, with_blocks)
+            for start in range(step, result.pages, step)
+        ])
+        for part in rest:
+            result = result.merge(part)
+        return result
+
+    def _record(self, extractor: str, timings: Dict[str, float]) -> None:
+        self._documents[extractor] = self._documents.get(extractor, 0) + 1
+        stages = self._stage_ms.setdefault(extractor, {})
+        for stage, ms in timings.items():
+            stages[stage] = stages.get(stage, 0.0) + ms
+
+    def stats(self) -> dict:
+        """
+        Documents extracted and mean milliseconds per stage, per extractor. Worker
+        stages are summed across page ranges, so they can exceed the wall-clock total.
+        """
+        return {
+            extractor: {
+                "documents": count,
+                "mean_ms": {
+                    stage: round(ms / count, 2)
+                    for stage, ms in self._stage_ms[extractor].items()
+                }
+            }
+            for extractor, count in self._documents.items()
+        }
+
+    async def _with_deadline(self, work):
+        try:
+            return await asyncio.wait_for(work, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise ExtractionTimeout(f"Text extraction timed out after {self.timeout}s")
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def extraction_status(error: ExtractionError) -> int:
+    """
+    HTTP status for an extraction failure: 413 over the page cap, 504 on timeout, 422 unreadable
+    """
+    if isinstance(error, ExtractionTooLarge):
+        return 413
+    if isinstance(error, ExtractionTimeout):
+        return 504
+    return 422
+
+
+extraction_executor = ExtractionExecutor(
+    max_workers=settings.EXTRACTION_WORKERS,
+    timeout=settings.EXTRACTION_TIMEOUT,
+    max_pages=settings.EXTRACTION_MAX_PAGES,
+    pages_per_task=settings.EXTRACTION_PAGES_PER_TASK
+)
@@ -1,9 +1,10 @@
-from openai import OpenAI
 from app.core.config import settings
-import json
-from typing import List, Dict
-
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+from app.services import llm_gateway
+from app.services.rate_limiter import LLMRateLimitError
+from app.services.prompt_builder import resume_for_prompt, estimate_tokens, CONTENT_SECTIONS
+from app.utils.keywords import BM25Index, tokenize
+import asyncio
+from typing import AsyncIterator, List, Dict, Optional
 
 
 async def match_resume_to_job(resume_data: dict, job_description: str) -> dict:
@@ -14,7 +15,7 @@ async def match_resume_to_job(resume_data: dict, job_description: str) -> dict:
     Analyze how well this resume matches the job description.
     
     Resume:
-    {json.dumps(resume_data, indent=2)}
+    {resume_for_prompt(resume_data, CONTENT_SECTIONS, function="match_resume_to_job")}
     
     Job Description:
     {job_description}
@@ -32,46 +33,223 @@ async def match_resume_to_job(resume_data: dict, job_description: str) -> dict:
     """
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a recruitment AI that matches candidates to job postings."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.4,
-            response_format={"type": "json_object"}
+        match_result = await llm_gateway.complete_json(
+            function="match_resume_to_job",
+            system_prompt="You are a recruitment AI that matches candidates to job postings.",
+            prompt=prompt,
+            temperature=0.4
         )
-        
-        match_result = json.loads(response.choices[0].message.content)
         return match_result
     
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise Exception(f"Error matching resume to job: {str(e)}")
 
 
-async def find_suitable_jobs(resume_data: dict, job_listings: List[dict]) -> List[dict]:
+# Rough token costs used when packing listings into batched match requests
+_BATCH_PROMPT_OVERHEAD_TOKENS = 250
+_BATCH_OUTPUT_TOKENS_PER_JOB = 250
+
+
+def plan_match_batches(
+    resume_data: dict,
+    job_listings: List[dict],
+    token_budget: Optional[int] = None,
+    max_batch_size: Optional[int] = None
+) -> List[List[dict]]:
     """
-    Find and rank suitable jobs from a list of job postings
+    Greedily pack listings into batches whose estimated prompt + output size fits the token budget.
+    The resume is sent once per batch, so its cost is charged once per batch.
     """
-    results = []
+    token_budget = token_budget or settings.JOB_MATCH_BATCH_TOKEN_BUDGET
+    max_batch_size = max_batch_size or settings.JOB_MATCH_MAX_BATCH_SIZE
+    base_cost = estimate_tokens(resume_for_prompt(resume_data, CONTENT_SECTIONS)) + _BATCH_PROMPT_OVERHEAD_TOKENS
     
+    batches = []
+    current = []
+    used = base_cost
     for job in job_listings:
-        match_result = await match_resume_to_job(resume_data, job.get('description', ''))
+        cost = estimate_tokens(job.get('description', '')) + _BATCH_OUTPUT_TOKENS_PER_JOB
+        if current and (used + cost > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+            used = base_cost
+        current.append(job)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def match_resume_to_jobs(resume_data: dict, job_descriptions: List[str]) -> List[Optional[dict]]:
+    """
+    Match one resume against several job descriptions in a single request.
+    Returns one result per description, in order; None where the model omitted a job.
+    """
+    if len(job_descriptions) == 1:
+        return [await match_resume_to_job(resume_data, job_descriptions[0])]
+    
+    jobs_text = "\n\n".join(
+        f"[J{index}]\n{description}" for index, description in enumerate(job_descriptions, start=1)
+    )
+    prompt = f"""
+    Analyze how well this resume matches each of the job descriptions below.
+    
+    Resume:
+    {resume_for_prompt(resume_data, CONTENT_SECTIONS, function="match_resume_to_jobs")}
+    
+    Job Descriptions:
+    {jobs_text}
+    
+    For EACH job provide:
+    1. Overall match score (0-100)
+    2. Matching skills (list)
+    3. Missing skills (list)
+    4. Experience relevance score (0-100)
+    5. Key strengths for this role (3-5 points)
+    6. Gaps to address (3-5 points)
+    7. Recommendation (apply/skip/improve first)
+    
+    Return as JSON with key "results": an array with exactly one object per job, each with keys:
+    job_ref (e.g. "J1"), match_score, matching_skills, missing_skills, experience_score, strengths, gaps, recommendation
+    """
+    
+    try:
+        response = await llm_gateway.complete_json(
+            function="match_resume_to_jobs",
+            system_prompt="You are a recruitment AI that matches candidates to job postings.",
+            prompt=prompt,
+            temperature=0.4
+        )
+    except LLMRateLimitError:
+        raise
+    except Exception as e:
+        raise Exception(f"Error matching resume to jobs: {str(e)}")
+    
+    by_ref = {}
+    for item in response.get("results", []):
+        if isinstance(item, dict) and item.get("job_ref"):
+            by_ref[str(item.pop("job_ref")).strip("[]").upper()] = item
+    return [by_ref.get(f"J{index}") for index in range(1, len(job_descriptions) + 1)]
+
+
+def _job_result(job: dict, match_result: dict, error: Optional[str] = None) -> dict:
+    result = {
+        "job_id": job.get('id'),
+        "job_title": job.get('title'),
+        "company": job.get('company'),
+        "match_score": match_result.get('match_score', 0),
+        "matching_skills": match_result.get('matching_skills', []),
+        "missing_skills": match_result.get('missing_skills', []),
+        "recommendation": match_result.get('recommendation', 'unknown'),
+        "scored_by": "llm"
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+def _resume_query(resume_data: dict) -> str:
+    """
+    Lexical query for job pre-ranking: skills, experience titles/bullets and summary
+    """
+    parts = list(resume_data.get('skills') or [])
+    for job in resume_data.get('experience') or []:
+        if isinstance(job, dict):
+            parts.append(job.get('title') or '')
+            parts.extend(job.get('bullets') or [])
+    parts.append(resume_data.get('summary') or '')
+    return " ".join(str(part) for part in parts)
+
+
+def _lexical_result(job: dict, score: float, best_score: float, skills: List[str]) -> dict:
+    job_terms = set(tokenize(f"{job.get('title', '')} {job.get('description', '')}"))
+    matching = [skill for skill in skills if tokenize(skill) and set(tokenize(skill)) <= job_terms]
+    return {
+        "job_id": job.get('id'),
+        "job_title": job.get('title'),
+        "company": job.get('company'),
+        "match_score": round(100 * score / best_score) if best_score else 0,
+        "matching_skills": matching,
+        "missing_skills": [],
+        "recommendation": "not shortlisted",
+        "scored_by": "lexical"
+    }
+
+
+def shortlist_jobs(resume_data: dict, job_listings: List[dict], shortlist_k: int):
+    """
+    Split listings into a BM25 top-k shortlist and the lexically scored remainder
+    """
+    index = BM25Index(f"{job.get('title', '')} {job.get('description', '')}" for job in job_listings)
+    ranked = index.top_k(_resume_query(resume_data), len(job_listings))
+    best_score = ranked[0][1] if ranked else 0.0
+    
+    shortlist = [job_listings[doc_id] for doc_id, _ in ranked[:shortlist_k]]
+    skills = [str(skill) for skill in resume_data.get('skills') or []]
+    remainder = [
+        _lexical_result(job_listings[doc_id], score, best_score, skills)
+        for doc_id, score in ranked[shortlist_k:]
+    ]
+    return shortlist, remainder
+
+
+async def find_suitable_jobs(
+    resume_data: dict,
+    job_listings: List[dict],
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    shortlist_k: Optional[int] = None,
+    max_batch_size: Optional[int] = None
+) -> List[dict]:
+    """
+    Find and rank suitable jobs from a list of job postings.
+    Listings are pre-ranked locally with BM25 and only the top `shortlist_k` are
+    scored by the LLM, packed into batched requests that run concurrently; `timeout`
+    applies to each request. A listing that fails or times out is kept with a zero
+    score and an `error` field instead of failing the whole search.
+    """
+    semaphore = asyncio.Semaphore(concurrency or settings.JOB_MATCH_CONCURRENCY)
+    timeout = timeout or settings.JOB_MATCH_BATCH_TIMEOUT
+    shortlist, remainder = shortlist_jobs(resume_data, job_listings, shortlist_k or settings.JOB_SHORTLIST_K)
+    batches = plan_match_batches(resume_data, shortlist, max_batch_size=max_batch_size)
+    rate_limit_errors = []
+    
+    async def score_batch(batch: List[dict]) -> List[dict]:
+        async with semaphore:
+            try:
+                matches = await asyncio.wait_for(
+                    match_resume_to_jobs(resume_data, [job.get('description', '') for job in batch]),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                return [_job_result(job, {}, error=f"Timed out after {timeout}s") for job in batch]
+            except Exception as e:
+                if isinstance(e, LLMRateLimitError):
+                    rate_limit_errors.append(e)
+                return [_job_result(job, {}, error=str(e)) for job in batch]
         
-        results.append({
-            "job_id": job.get('id'),
-            "job_title": job.get('title'),
-            "company": job.get('company'),
-            "match_score": match_result.get('match_score', 0),
-            "matching_skills": match_result.get('matching_skills', []),
-            "missing_skills": match_result.get('missing_skills', []),
-            "recommendation": match_result.get('recommendation', 'unknown')
-        })
-    
-    # Sort by match score (highest first)
+        # Listings the model skipped in the batch are scored on their own, concurrently
+        skipped = [job for job, match in zip(batch, matches) if match is None]
+        rescored = await asyncio.gather(*[score_batch([job]) for job in skipped])
+        by_job = {id(job): result for job, (result,) in zip(skipped, rescored)}
+        return [by_job[id(job)] if match is None else _job_result(job, match) for job, match in zip(batch, matches)]
+    
+    batch_results = await asyncio.gather(*[score_batch(batch) for batch in batches])
+    results = [result for batch in batch_results for result in batch]
+    
+    failures = sum(1 for result in results if "error" in result)
+    if shortlist and failures == len(shortlist):
+        if rate_limit_errors:
+            raise rate_limit_errors[-1]
+        raise Exception(f"Error matching resume to jobs: all {failures} listings failed")
+    
+    # Sort by match score (highest first); LLM-scored listings rank above lexical-only ones
     results.sort(key=lambda x: x['match_score'], reverse=True)
+    remainder.sort(key=lambda x: x['match_score'], reverse=True)
     
-    return results
+    return results + remainder
 
 
 async def suggest_career_paths(resume_data: dict) -> dict:
@@ -82,7 +260,7 @@ async def suggest_career_paths(resume_data: dict) -> dict:
     Based on this resume, suggest potential career paths and roles.
     
     Resume:
-    {json.dumps(resume_data, indent=2)}
+    {resume_for_prompt(resume_data, CONTENT_SECTIONS, function="suggest_career_paths")}
     
     Provide:
     1. Current career level (entry/mid/senior/executive)
@@ -95,32 +273,29 @@ async def suggest_career_paths(resume_data: dict) -> dict:
     """
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a career counselor providing career path guidance."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.6,
-            response_format={"type": "json_object"}
+        suggestions = await llm_gateway.complete_json(
+            function="suggest_career_paths",
+            system_prompt="You are a career counselor providing career path guidance.",
+            prompt=prompt,
+            temperature=0.6
         )
-        
-        suggestions = json.loads(response.choices[0].message.content)
         return suggestions
     
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise Exception(f"Error suggesting career paths: {str(e)}")
 
 
-async def generate_cover_letter(resume_data: dict, job_description: str, company_name: str, role_title: str) -> str:
-    """
-    Generate a tailored cover letter for a job application
-    """
+COVER_LETTER_SYSTEM_PROMPT = "You are a professional cover letter writer."
+
+
+def _cover_letter_prompt(resume_data: dict, job_description: str, company_name: str, role_title: str) -> str:
     prompt = f"""
     Write a professional cover letter for this job application.
     
     Candidate Resume:
-    {json.dumps(resume_data, indent=2)}
+    {resume_for_prompt(resume_data, function="generate_cover_letter")}
     
     Job Title: {role_title}
     Company: {company_name}
@@ -137,20 +312,43 @@ async def generate_cover_letter(resume_data: dict, job_description: str, company
     
     Return ONLY the cover letter text, no JSON.
     """
-    
+    return prompt
+
+
+async def generate_cover_letter(resume_data: dict, job_description: str, company_name: str, role_title: str) -> str:
+    """
+    Generate a tailored cover letter for a job application
+    """
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a professional cover letter writer."},
-                {"role": "user", "content": prompt}
-            ],
+        cover_letter = await llm_gateway.complete_text(
+            function="generate_cover_letter",
+            system_prompt=COVER_LETTER_SYSTEM_PROMPT,
+            prompt=_cover_letter_prompt(resume_data, job_description, company_name, role_title),
             temperature=0.7
         )
-        
-        cover_letter = response.choices[0].message.content
         return cover_letter
     
+    except LLMRateLimitError:
+        raise
+    except Exception as e:
+        raise Exception(f"Error generating cover letter: {str(e)}")
+
+
+async def stream_cover_letter(resume_data: dict, job_description: str, company_name: str, role_title: str) -> AsyncIterator[str]:
+    """
+    Stream a tailored cover letter as it is generated
+    """
+    try:
+        async for delta in llm_gateway.stream_completion(
+            function="generate_cover_letter",
+            system_prompt=COVER_LETTER_SYSTEM_PROMPT,
+            prompt=_cover_letter_prompt(resume_data, job_description, company_name, role_title),
+            temperature=0.7
+        ):
+            yield delta
+    
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise Exception(f"Error generating cover letter: {str(e)}")
     
@@ -0,0 +1,175 @@
+import asyncio
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+
+
+def normalize_messages(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Collapse whitespace so cosmetic differences in prompts/resume text map to the same key
+    """
+    return [
+        {"role": message["role"], "content": " ".join(str(message["content"]).split())}
+        for message in messages
+    ]
+
+
+def make_cache_key(function: str, model: str, temperature: float, messages: List[Dict[str, str]]) -> str:
+    """
+    Content address of an LLM call: hash of (function, model, temperature, normalized prompt payload)
+    """
+    payload = json.dumps(
+        {
+            "function": function,
+            "model": model,
+            "temperature": temperature,
+            "messages": normalize_messages(messages)
+        },
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache for decoded LLM responses: a bounded in-memory LRU with TTL
+    in front of a SQLite store that survives restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+        db_path: Optional[str] = None,
+        enabled: bool = True,
+        disabled_functions: Iterable[str] = ()
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.enabled = enabled
+        self.disabled_functions = set(disabled_functions)
+        
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def is_enabled(self, function: str) -> bool:
+        return self.enabled and function not in self.disabled_functions
+
+    # --- statistics -----------------------------------------------------
+
+    def _count(self, function: str, field: str) -> None:
+        counters = self._stats.setdefault(function, {"hits": 0, "disk_hits": 0, "misses": 0})
+        counters[field] += 1
+
+    def stats(self) -> dict:
+        hits = sum(c["hits"] for c in self._stats.values())
+        misses = sum(c["misses"] for c in self._stats.values())
+        return {
+            "enabled": self.enabled,
+            "memory_entries": len(self._memory),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "by_function": {name: dict(c) for name, c in self._stats.items()}
+        }
+
+    # --- public API -----------------------------------------------------
+
+    async def get(self, function: str, key: str) -> Optional[Any]:
+        """
+        Look up a key in memory, then on disk. Counts a hit or a miss for `function`.
+        """
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if now - stored_at < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self._count(function, "hits")
+                return copy.deepcopy(value)
+            del self._memory[key]
+        
+        if self.db_path:
+            row = await asyncio.to_thread(self._disk_get, key)
+            if row is not None:
+                stored_at, value = row
+                if now - stored_at < self.ttl_seconds:
+                    self._remember(key, value, stored_at)
+                    self._count(function, "hits")
+                    self._count(function, "disk_hits")
+                    return value
+        
+        self._count(function, "misses")
+        return None
+
+    async def set(self, function: str, key: str, value: Any) -> None:
+        stored_at = time.time()
+        self._remember(key, value, stored_at)
+        if self.db_path:
+            await asyncio.to_thread(self._disk_set, key, function, value, stored_at)
+
+    def clear(self) -> None:
+        self._memory.clear()
+        self._stats.clear()
+        if self.db_path:
+            with self._db_lock:
+                self._connection().execute("DELETE FROM llm_cache")
+                self._connection().commit()
+
+    # --- internals ------------------------------------------------------
+
+    def _remember(self, key: str, value: Any, stored_at: float) -> None:
+        # Callers mutate the dicts they get back, so the cache keeps its own copy
+        self._memory[key] = (stored_at, copy.deepcopy(value))
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, function TEXT NOT NULL, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._db_lock:
+            row = self._connection().execute(
+                "SELECT stored_at, value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _disk_set(self, key: str, function: str, value: Any, stored_at: float) -> None:
+        with self._db_lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, function, value, stored_at) VALUES (?, ?, ?, ?)",
+                (key, function, json.dumps(value), stored_at)
+            )
+            # Expired rows are purged lazily on write
+            conn.execute("DELETE FROM llm_cache WHERE stored_at < ?", (stored_at - self.ttl_seconds,))
+            conn.commit()
+
+
+response_cache = LLMResponseCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    db_path=settings.LLM_CACHE_PATH,
+    enabled=settings.LLM_CACHE_ENABLED,
+    disabled_functions=settings.LLM_CACHE_DISABLED_FUNCTIONS
+)
@@ -0,0 +1,251 @@
+import httpx
+import json
+from typing import AsyncIterator, List, Dict, Optional
+from openai import AsyncOpenAI
+from app.core.config import settings
+from app.services.llm_cache import response_cache, make_cache_key
+from app.services.prompt_builder import estimate_tokens, compact_json
+from app.services.single_flight import llm_single_flight
+from app.services.rate_limiter import close_stream, rate_limiter
+from app.services.token_usage import usage_tracker
+
+# Single pooled client shared by every AI service, created lazily on first use
+_client: Optional[AsyncOpenAI] = None
+
+
+def get_client() -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client, creating it (and its httpx pool) on first use
+    """
+    global _client
+    if _client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(settings.LLM_TIMEOUT)
+        )
+        _client = _build_client(http_client)
+    return _client
+
+
+def _build_client(http_client: httpx.AsyncClient) -> AsyncOpenAI:
+    # Retries are scheduled by the rate limiter, not by the SDK
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        http_client=http_client,
+        max_retries=0
+    )
+
+
+async def use_http_client(http_client: httpx.AsyncClient) -> None:
+    """
+    Swap the transport behind the shared client, e.g. to route calls to an in-process stub server
+    """
+    global _client
+    await close_client()
+    _client = _build_client(http_client)
+
+
+async def close_client() -> None:
+    """
+    Close the shared client and release pooled connections (called on app shutdown)
+    """
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def build_messages(system_prompt: str, prompt: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt}
+    ]
+
+
+async def chat_completion(
+    messages: List[Dict[str, str]],
+    temperature: float,
+    model: Optional[str] = None,
+    response_format: Optional[dict] = None,
+    stream: bool = False
+):
+    """
+    Send a chat completion through the shared client without blocking the event loop.
+    Calls are admitted by the per-model rate limiter, which also retries throttled requests.
+    """
+    model = model or settings.OPENAI_MODEL
+    params = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature
+    }
+    if response_format:
+        params["response_format"] = response_format
+    if stream:
+        params["stream"] = True
+    
+    tokens = sum(estimate_tokens(message["content"]) for message in messages) + settings.LLM_EXPECTED_COMPLETION_TOKENS
+    return await rate_limiter.execute(model, tokens, lambda: get_client().chat.completions.create(**params), stream=stream)
+
+
+async def _cached_completion(
+    function: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    model: Optional[str],
+    response_format: Optional[dict],
+    decode,
+    cache: bool,
+    coalesce: bool = True
+):
+    """
+    Serve a completion from the response cache when possible, otherwise call the API and store the decoded result.
+    Identical calls already in flight are joined instead of being sent again.
+    """
+    model = model or settings.OPENAI_MODEL
+    use_cache = cache and response_cache.is_enabled(function)
+    estimated_prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+    key = make_cache_key(function, model, temperature, messages)
+    
+    if use_cache:
+        cached = await response_cache.get(function, key)
+        if cached is not None:
+            usage_tracker.record_cache_hit(function, estimated_prompt_tokens)
+            return cached
+    
+    async def fetch():
+        response = await chat_completion(messages, temperature=temperature, model=model, response_format=response_format)
+        usage_tracker.record_response(function, getattr(response, "usage", None), estimated_prompt_tokens)
+        result = decode(response.choices[0].message.content)
+        if use_cache:
+            await response_cache.set(function, key, result)
+        return result
+    
+    if not coalesce:
+        return await fetch()
+    return await llm_single_flight.do(key, fetch)
+
+
+async def complete_json(
+    function: str,
+    system_prompt: str,
+    prompt: str,
+    temperature: float,
+    model: Optional[str] = None,
+    cache: bool = True,
+    coalesce: bool = True
+) -> dict:
+    """
+    Run a JSON-mode completion and return the decoded object
+    """
+    return await _cached_completion(
+        function,
+        build_messages(system_prompt, prompt),
+        temperature=temperature,
+        model=model,
+        response_format={"type": "json_object"},
+        decode=json.loads,
+        cache=cache,
+        coalesce=coalesce
+    )
+
+
+async def complete_text(
+    function: str,
+    system_prompt: str,
+    prompt: str,
+    temperature: float,
+    model: Optional[str] = None,
+    cache: bool = True,
+    coalesce: bool = True
+) -> str:
+    """
+    Run a plain-text completion and return the message content
+    """
+    return await _cached_completion(
+        function,
+        build_messages(system_prompt, prompt),
+        temperature=temperature,
+        model=model,
+        response_format=None,
+        decode=lambda content: content,
+        cache=cache,
+        coalesce=coalesce
+    )
+
+
+async def stream_completion(
+    function: str,
+    system_prompt: str,
+    prompt: str,
+    temperature: float,
+    model: Optional[str] = None,
+    json_mode: bool = False,
+    cache: bool = True
+) -> AsyncIterator[str]:
+    """
+    Yield content deltas as the model produces them. Shares cache entries with
+    complete_json/complete_text: a hit is replayed as a single delta, and a
+    finished stream is stored for later non-streaming calls.
+    """
+    messages = build_messages(system_prompt, prompt)
+    model = model or settings.OPENAI_MODEL
+    use_cache = cache and response_cache.is_enabled(function)
+    estimated_prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+    
+    if use_cache:
+        key = make_cache_key(function, model, temperature, messages)
+        cached = await response_cache.get(function, key)
+        if cached is not None:
+            usage_tracker.record_cache_hit(function, estimated_prompt_tokens)
+            yield compact_json(cached) if json_mode else cached
+            return
+    
+    stream = await chat_completion(
+        messages,
+        temperature=temperature,
+        model=model,
+        response_format={"type": "json_object"} if json_mode else None,
+        stream=True
+    )
+    parts = []
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+    finally:
+        # Also reached when the consumer stops early (client disconnect): free the upstream connection
+        await close_stream(stream)
+    
+    # Streamed responses carry no usage block in this API version; only the estimate is recorded
+    usage_tracker.record_response(function, None, estimated_prompt_tokens)
+    if use_cache:
+        content = "".join(parts)
+        if json_mode:
+            try:
+                content = json.loads(content)
+            except json.JSONDecodeError:
+                # The client already has every delta; just don't cache a broken document
+                return
+        await response_cache.set(function, key, content)
+
+
+def metrics() -> dict:
+    """
+    Cache, coalescing, rate limiter and token usage counters for the /metrics/llm endpoint
+    """
+    return {
+        "cache": response_cache.stats(),
+        "single_flight": llm_single_flight.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "usage": usage_tracker.snapshot()
+    }
@@ -1,8 +1,26 @@
-from openai import OpenAI
-from app.core.config import settings
-import json
+from typing import AsyncIterator, List
+from app.services import llm_gateway
+from app.services.rate_limiter import LLMRateLimitError
+from app.services.prompt_builder import resume_for_prompt, CONTENT_SECTIONS, UPDATE_SECTIONS
+
+# Field descriptions shared by the full parse and the per-section fallback parse
+PARSE_FIELDS = {
+    "name": "string",
+    "email": "string",
+    "phone": "string",
+    "location": "string or null",
+    "summary": "string or null",
+    "experience": "array of objects with: title, company, duration, location, bullets",
+    "education": "array of objects with: degree, school, year, gpa, location",
+    "skills": "array of strings",
+    "certifications": "array of strings"
+}
+PARSE_SYSTEM_PROMPT = "You are a resume parsing assistant. Extract structured data from resumes and return valid JSON only."
+
+
+def _parse_field_list(fields) -> str:
+    return "\n    ".join(f"- {name} ({PARSE_FIELDS[name]})" for name in fields)
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
 async def parse_resume_with_ai(extracted_text: str) -> dict:
     """
@@ -11,15 +29,7 @@ async def parse_resume_with_ai(extracted_text: str) -> dict:
     prompt = f"""
     Parse the following resume text and extract structured information.
     Return a JSON object with these fields:
-    - name (string)
-    - email (string)
-    - phone (string)
-    - location (string or null)
-    - summary (string or null)
-    - experience (array of objects with: title, company, duration, location, bullets)
-    - education (array of objects with: degree, school, year, gpa, location)
-    - skills (array of strings)
-    - certifications (array of strings)
+    {_parse_field_list(PARSE_FIELDS)}
     
     Resume text:
     {extracted_text}
@@ -28,23 +38,95 @@ async def parse_resume_with_ai(extracted_text: str) -> dict:
     """
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a resume parsing assistant. Extract structured data from resumes and return valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
+        parsed_data = await llm_gateway.complete_json(
+            function="parse_resume_with_ai",
+            system_prompt=PARSE_SYSTEM_PROMPT,
+            prompt=prompt,
+            temperature=0.3
         )
-        
-        parsed_data = json.loads(response.choices[0].message.content)
         return parsed_data
     
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise Exception(f"Error parsing resume with AI: {str(e)}")
 
 
+async def parse_resume_sections_with_ai(section_text: str, fields: List[str]) -> dict:
+    """
+    Parse only the given fields from the resume sections a local parse was unsure about
+    """
+    prompt = f"""
+    Extract these fields from the resume sections below.
+    Return a JSON object with only these fields:
+    {_parse_field_list(fields)}
+    
+    Resume sections:
+    {section_text}
+    
+    Return ONLY valid JSON, no additional text.
+    """
+    
+    try:
+        parsed = await llm_gateway.complete_json(
+            function="parse_resume_sections",
+            system_prompt=PARSE_SYSTEM_PROMPT,
+            prompt=prompt,
+            temperature=0.3
+        )
+        return {name: parsed.get(name) for name in fields if name in parsed}
+    
+    except LLMRateLimitError:
+        raise
+    except Exception as e:
+        raise Exception(f"Error parsing resume sections with AI: {str(e)}")
+
+
+# What each section piece is, so the model doesn't go looking for fields it can't contain
+SECTION_PARSE_HINTS = {
+    "header": "This is the top of a resume: the candidate's name and contact lines.",
+    "summary": "This is the summary or objective section of a resume.",
+    "experience": "This is part of the work experience section of a resume. Return one object per position, in the order they appear, keeping each bullet's wording.",
+    "education": "This is part of the education section of a resume. Return one object per degree, in the order they appear.",
+    "skills": "This is the skills section of a resume. Return individual skills, not category labels.",
+    "certifications": "This is the certifications section of a resume.",
+    "other": "This is a section of a resume under a heading the parser did not recognise.",
+    "resume": "This is one part of a longer resume. Only return what appears in this part."
+}
+
+
+async def parse_resume_section_with_ai(section: str, section_text: str, fields: List[str]) -> dict:
+    """
+    Parse one section (or one piece of a long section) of a resume with a section-specific prompt
+    """
+    prompt = f"""
+    {SECTION_PARSE_HINTS[section]}
+    Return a JSON object with only these fields:
+    {_parse_field_list(fields)}
+    Use an empty array or null for anything not present in this text.
+    
+    Resume text:
+    {section_text}
+    
+    Return ONLY valid JSON, no additional text.
+    """
+    
+    try:
+        parsed = await llm_gateway.complete_json(
+            function="parse_resume_section",
+            system_prompt=PARSE_SYSTEM_PROMPT,
+            prompt=prompt,
+            temperature=0.3,
+            cache=False  # ResumeParser caches section answers under the section hash
+        )
+        return {name: parsed.get(name) for name in fields if name in parsed}
+    
+    except LLMRateLimitError:
+        raise
+    except Exception as e:
+        raise Exception(f"Error parsing resume section with AI: {str(e)}")
+
+
 async def analyze_resume(parsed_resume: dict) -> dict:
     """
     Analyze resume and provide suggestions for improvement
@@ -58,33 +140,30 @@ async def analyze_resume(parsed_resume: dict) -> dict:
     5. Formatting recommendations
     
     Resume data:
-    {json.dumps(parsed_resume, indent=2)}
+    {resume_for_prompt(parsed_resume, function="analyze_resume")}
     
     Return as JSON with keys: strengths, improvements, ats_score, keywords, formatting_tips
     """
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a professional resume analyst. Provide actionable feedback to improve resumes."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5,
-            response_format={"type": "json_object"}
+        analysis = await llm_gateway.complete_json(
+            function="analyze_resume",
+            system_prompt="You are a professional resume analyst. Provide actionable feedback to improve resumes.",
+            prompt=prompt,
+            temperature=0.5
         )
-        
-        analysis = json.loads(response.choices[0].message.content)
         return analysis
     
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise Exception(f"Error analyzing resume: {str(e)}")
 
 
-async def optimize_resume_for_job(resume_data: dict, job_description: str, target_role: str = None) -> dict:
-    """
-    Optimize resume for a specific job posting
-    """
+OPTIMIZE_SYSTEM_PROMPT = "You are a career coach specializing in resume optimization for job applications."
+
+
+def _optimize_prompt(resume_data: dict, job_description: str, target_role: str = None) -> str:
     role_context = f"for the role of {target_role}" if target_role else ""
     
     prompt = f"""
@@ -97,28 +176,51 @@ async def optimize_resume_for_job(resume_data: dict, job_description: str, targe
     5. Overall match score (0-100)
     
     Resume:
-    {json.dumps(resume_data, indent=2)}
+    {resume_for_prompt(resume_data, CONTENT_SECTIONS, function="optimize_resume_for_job")}
     
     Job Description:
     {job_description}
     
     Return as JSON with keys: tailored_summary, skills_to_emphasize, experience_updates, keywords_to_add, match_score, recommendations
     """
-    
+    return prompt
+
+
+async def optimize_resume_for_job(resume_data: dict, job_description: str, target_role: str = None) -> dict:
+    """
+    Optimize resume for a specific job posting
+    """
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a career coach specializing in resume optimization for job applications."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.6,
-            response_format={"type": "json_object"}
+        optimization = await llm_gateway.complete_json(
+            function="optimize_resume_for_job",
+            system_prompt=OPTIMIZE_SYSTEM_PROMPT,
+            prompt=_optimize_prompt(resume_data, job_description, target_role),
+            temperature=0.6
         )
-        
-        optimization = json.loads(response.choices[0].message.content)
         return optimization
     
+    except LLMRateLimitError:
+        raise
+    except Exception as e:
+        raise Exception(f"Error optimizing resume: {str(e)}")
+
+
+async def stream_optimize_resume_for_job(resume_data: dict, job_description: str, target_role: str = None) -> AsyncIterator[str]:
+    """
+    Stream the optimization JSON as it is generated
+    """
+    try:
+        async for delta in llm_gateway.stream_completion(
+            function="optimize_resume_for_job",
+            system_prompt=OPTIMIZE_SYSTEM_PROMPT,
+            prompt=_optimize_prompt(resume_data, job_description, target_role),
+            temperature=0.6,
+            json_mode=True
+        ):
+            yield delta
+    
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise Exception(f"Error optimizing resume: {str(e)}")
 
@@ -133,7 +235,7 @@ async def plan_resume_update(current_resume: dict, update_text: str) -> dict:
     Identify new skills, projects, or experience updates from the text.
     
     Current Resume:
-    {json.dumps(current_resume, indent=2)}
+    {resume_for_prompt(current_resume, UPDATE_SECTIONS, function="plan_resume_update")}
     
     User Update Text:
     {update_text}
@@ -157,19 +259,16 @@ async def plan_resume_update(current_resume: dict, update_text: str) -> dict:
     """
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a precise resume updater. Return valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2,
-            response_format={"type": "json_object"}
+        plan = await llm_gateway.complete_json(
+            function="plan_resume_update",
+            system_prompt="You are a precise resume updater. Return valid JSON only.",
+            prompt=prompt,
+            temperature=0.2
         )
-        
-        plan = json.loads(response.choices[0].message.content)
         return plan
     
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         raise Exception(f"Error formulating resume update plan: {str(e)}")
 
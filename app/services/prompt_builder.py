@@ -0,0 +1,55 @@
+import json
+from typing import Any, Iterable, Optional
+from app.services.token_usage import usage_tracker
+
+# Resume sections that carry content (everything except contact details)
+CONTENT_SECTIONS = ("summary", "experience", "projects", "education", "skills", "certifications")
+
+# Sections the smart-update planner can touch
+UPDATE_SECTIONS = ("skills", "projects", "experience")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap local token estimate (~4 characters per token for English text and compact JSON)
+    """
+    return max(1, (len(text) + 3) // 4)
+
+
+def drop_empty(value: Any) -> Any:
+    """
+    Recursively remove None, empty strings, empty lists and empty dicts
+    """
+    if isinstance(value, dict):
+        cleaned = {key: drop_empty(item) for key, item in value.items()}
+        return {key: item for key, item in cleaned.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        cleaned = [drop_empty(item) for item in value]
+        return [item for item in cleaned if item not in (None, "", [], {})]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def compact_json(data: Any) -> str:
+    """
+    Serialize without indentation or padding whitespace
+    """
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def resume_for_prompt(resume_data: dict, sections: Optional[Iterable[str]] = None, function: Optional[str] = None) -> str:
+    """
+    Compact JSON of the resume limited to `sections` (all sections when None).
+    When `function` is given, the saving against the old indented full dump is recorded.
+    """
+    resume_data = resume_data or {}
+    selected = resume_data
+    if sections is not None:
+        selected = {key: value for key, value in resume_data.items() if key in sections}
+    payload = compact_json(drop_empty(selected))
+    
+    if function:
+        baseline = json.dumps(resume_data, indent=2)
+        usage_tracker.record_compaction(function, estimate_tokens(baseline), estimate_tokens(payload))
+    return payload
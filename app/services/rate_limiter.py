@@ -0,0 +1,311 @@
+import asyncio
+import inspect
+import random
+import time
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Deque, Dict, Optional
+import openai
+from app.core.config import settings
+
+
+class LLMRateLimitError(Exception):
+    """
+    Raised when the provider keeps throttling us after all retries; routes map it to HTTP 429
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# Errors worth retrying besides 429s
+TRANSIENT_ERRORS = (openai.APIConnectionError, openai.APITimeoutError, openai.InternalServerError)
+
+
+class TokenBucket:
+    """
+    Continuous-refill token bucket. `reserve` always succeeds and returns how long the
+    caller must wait, so waiters are served in arrival order.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        self._refill()
+        self.tokens -= amount
+        return max(0.0, -self.tokens / self.rate) if self.rate else 0.0
+
+    def refund(self, amount: float) -> None:
+        """
+        Return (or, when negative, charge) the difference between a reservation and actual use
+        """
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit with additive increase on success and multiplicative decrease on throttling.
+    Waiters are woken in FIFO order as slots free up or the limit grows.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, decrease_factor: float = 0.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before cancellation; pass it on
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def on_success(self) -> None:
+        # +1 per window of `limit` successful calls
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def on_throttle(self) -> None:
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+
+class ModelLimiter:
+    """
+    Request and token buckets plus an AIMD concurrency window for one model
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency = AIMDLimiter(
+            initial=settings.LLM_CONCURRENCY_INITIAL,
+            minimum=settings.LLM_CONCURRENCY_MIN,
+            maximum=settings.LLM_CONCURRENCY_MAX
+        )
+
+
+class LLMRateLimiter:
+    """
+    Schedules LLM calls per model: waits for bucket capacity and a concurrency slot,
+    retries 429s and transient errors with jittered exponential backoff (honoring
+    Retry-After), and keeps queue/wait metrics.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, ModelLimiter] = {}
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.acquired = 0
+        self.throttled = 0
+        self.retries = 0
+        self.failures = 0
+
+    def _model(self, model: str) -> ModelLimiter:
+        if model not in self._models:
+            limits = settings.LLM_MODEL_LIMITS.get(model, {})
+            self._models[model] = ModelLimiter(
+                requests_per_minute=limits.get("requests_per_minute", settings.LLM_REQUESTS_PER_MINUTE),
+                tokens_per_minute=limits.get("tokens_per_minute", settings.LLM_TOKENS_PER_MINUTE)
+            )
+        return self._models[model]
+
+    @asynccontextmanager
+    async def slot(self, model: str, tokens: int):
+        """
+        Wait for rate-limit capacity and a concurrency slot for one request
+        """
+        limiter = self._model(model)
+        started = time.monotonic()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            delay = max(limiter.requests.reserve(1), limiter.tokens.reserve(tokens))
+            if delay:
+                await asyncio.sleep(delay)
+            await limiter.concurrency.acquire()
+        finally:
+            self.queue_depth -= 1
+        
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        try:
+            yield limiter
+        finally:
+            limiter.concurrency.release()
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        delay = random.uniform(0, min(settings.LLM_BACKOFF_MAX, settings.LLM_BACKOFF_BASE * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def execute(self, model: str, tokens: int, send: Callable[[], Awaitable], stream: bool = False):
+        """
+        Run `send` under the limits for `model`, retrying throttled and transient failures.
+        Tokens are reserved once per call, not per attempt, and refunded whenever the call
+        ends without a response: every attempt failed, the request was rejected, or the
+        caller was cancelled while queued. A streamed response keeps its concurrency slot
+        until it is read to the end or closed.
+        """
+        answered = False
+        try:
+            for attempt in range(settings.LLM_MAX_RETRIES + 1):
+                async with AsyncExitStack() as stack:
+                    limiter = await stack.enter_async_context(self.slot(model, tokens if attempt == 0 else 0))
+                    try:
+                        response = await send()
+                    except openai.RateLimitError as e:
+                        self.throttled += 1
+                        limiter.concurrency.on_throttle()
+                        retry_after = retry_after_seconds(e)
+                        if attempt == settings.LLM_MAX_RETRIES:
+                            self.failures += 1
+                            raise LLMRateLimitError(f"LLM provider rate limit exceeded: {e}", retry_after) from e
+                    except TRANSIENT_ERRORS:
+                        retry_after = None
+                        if attempt == settings.LLM_MAX_RETRIES:
+                            self.failures += 1
+                            raise
+                    else:
+                        answered = True
+                        limiter.concurrency.on_success()
+                        usage = getattr(response, "usage", None)
+                        if usage is not None and getattr(usage, "total_tokens", None):
+                            limiter.tokens.refund(tokens - usage.total_tokens)
+                        if stream:
+                            return SlottedStream(response, stack.pop_all())
+                        return response
+                
+                self.retries += 1
+                await asyncio.sleep(self.backoff(attempt, retry_after))
+        finally:
+            if not answered:
+                # Nothing was generated, so nothing was spent
+                self._model(model).tokens.refund(tokens)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_wait_seconds": round(self.total_wait / self.acquired, 4) if self.acquired else 0.0,
+            "max_wait_seconds": round(self.max_wait, 4),
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "failures": self.failures,
+            "models": {
+                name: {
+                    "concurrency_limit": round(limiter.concurrency.limit, 2),
+                    "in_flight": limiter.concurrency.in_flight,
+                    "waiting": limiter.concurrency.waiting
+                }
+                for name, limiter in self._models.items()
+            }
+        }
+
+
+class SlottedStream:
+    """
+    A provider stream that holds its concurrency slot until it is exhausted, fails or is closed
+    """
+
+    def __init__(self, stream, slot: AsyncExitStack):
+        self._stream = stream
+        self._iterator = stream.__aiter__()
+        self._slot = slot
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._iterator.__anext__()
+        except BaseException:
+            # StopAsyncIteration included: the body has been read
+            await self._slot.aclose()
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await close_stream(self._stream)
+        finally:
+            await self._slot.aclose()
+
+
+async def close_stream(stream) -> None:
+    """
+    Close a provider stream whether it exposes aclose/close (newer clients) or only its HTTP response
+    """
+    close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+    if close is None:
+        response = getattr(stream, "response", None)
+        close = getattr(response, "aclose", None)
+    if close is None:
+        return
+    result = close()
+    if inspect.isawaitable(result):
+        await result
+
+
+def retry_after_seconds(error: openai.APIStatusError) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date) from a provider error
+    """
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+rate_limiter = LLMRateLimiter()
@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+from app.services.render_executor import render_executor
+from app.utils.templates import TemplatePlan
+
+
+def content_hash(data: Any) -> str:
+    """
+    Hash of canonical JSON: key order and formatting don't change it
+    """
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_key(data: Any, plan: TemplatePlan) -> str:
+    """
+    Identity of a rendered PDF: (content hash, template name, template version)
+    """
+    return hashlib.sha256(f"{content_hash(data)}:{plan.name}:{plan.version}".encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    Rendered PDFs in a byte-bounded in-memory LRU in front of a directory of files
+    that is trimmed, oldest access first, to a total size. Files are named
+    <resume id>-<render key>.pdf so one resume's renders can be dropped together
+    when it is edited. Since the key covers the content, a stale entry left in
+    another process's memory is never asked for again.
+
+    Every worker process writes to the same directory, so it is rescanned on each
+    write and invalidation instead of tracked in memory; max_disk_bytes then caps
+    the shared directory, not one process's share of it.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        enabled: bool = True
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.enabled = enabled
+
+        self._memory: "OrderedDict[Tuple[int, str], bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None  # size of the directory at the last scan
+        self._disk_lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "invalidated": 0, "evicted_files": 0}
+
+    async def get_or_render(self, resume_id: Optional[int], data: Any, plan: TemplatePlan) -> bytes:
+        """
+        Serve a stored render of this content and template version, or render it on the
+        render executor and store it
+        """
+        if not self.enabled or resume_id is None:
+            return await render_executor.render(plan.name, data)
+
+        key = render_key(data, plan)
+        cached = await self.get(resume_id, key)
+        if cached is not None:
+            return cached
+        pdf_bytes = await render_executor.render(plan.name, data)
+        await self.set(resume_id, key, pdf_bytes)
+        return pdf_bytes
+
+    async def get(self, resume_id: int, key: str) -> Optional[bytes]:
+        entry = self._memory.get((resume_id, key))
+        if entry is not None:
+            self._memory.move_to_end((resume_id, key))
+            self._stats["hits"] += 1
+            return entry
+
+        if self.disk_dir:
+            data = await asyncio.to_thread(self._disk_get, self._file_name(resume_id, key))
+            if data is not None:
+                self._remember(resume_id, key, data)
+                self._stats["hits"] += 1
+                self._stats["disk_hits"] += 1
+                return data
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, resume_id: int, key: str, data: bytes) -> None:
+        self._remember(resume_id, key, data)
+        if self.disk_dir:
+            await asyncio.to_thread(self._disk_set, self._file_name(resume_id, key), data)
+
+    async def invalidate(self, resume_id: int) -> None:
+        """
+        Drop every render of a resume, whatever template or content it was for
+        """
+        for cache_key in [cache_key for cache_key in self._memory if cache_key[0] == resume_id]:
+            self._memory_bytes -= len(self._memory.pop(cache_key))
+            self._stats["invalidated"] += 1
+        if self.disk_dir:
+            self._stats["invalidated"] += await asyncio.to_thread(self._disk_invalidate, f"{resume_id}-")
+
+    def stats(self) -> dict:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "enabled": self.enabled,
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes
+        }
+
+    # --- internals ------------------------------------------------------
+
+    @staticmethod
+    def _file_name(resume_id: int, key: str) -> str:
+        return f"{resume_id}-{key}.pdf"
+
+    def _remember(self, resume_id: int, key: str, data: bytes) -> None:
+        if len(data) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop((resume_id, key), None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[(resume_id, key)] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _scan(self) -> Dict[str, Tuple[int, float]]:
+        """
+        File name -> (size, mtime) for every cached PDF, whichever process wrote it.
+        Caller holds _disk_lock.
+        """
+        files: Dict[str, Tuple[int, float]] = {}
+        try:
+            entries = os.scandir(self.disk_dir)
+        except FileNotFoundError:
+            entries = None
+        if entries is not None:
+            with entries:
+                for entry in entries:
+                    if not entry.name.endswith(".pdf") or entry.name.startswith("."):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue  # evicted by another process mid-scan
+                    files[entry.name] = (stat.st_size, stat.st_mtime)
+        self._disk_bytes = sum(size for size, _ in files.values())
+        return files
+
+    def _disk_get(self, name: str) -> Optional[bytes]:
+        path = Path(self.disk_dir) / name
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mtime is the access order eviction goes by
+        except FileNotFoundError:
+            return None
+        return data
+
+    def _disk_set(self, name: str, data: bytes) -> None:
+        directory = Path(self.disk_dir)
+        with self._disk_lock:
+            directory.mkdir(parents=True, exist_ok=True)
+            temp = directory / f".{name}.tmp"
+            temp.write_bytes(data)
+            os.replace(temp, directory / name)  # readers never see a partial file
+            self._evict(self._scan())
+
+    def _evict(self, files: Dict[str, Tuple[int, float]]) -> None:
+        total = sum(size for size, _ in files.values())
+        if total <= self.max_disk_bytes:
+            return
+        directory = Path(self.disk_dir)
+        for name in sorted(files, key=lambda name: files[name][1]):
+            if total <= self.max_disk_bytes:
+                break
+            (directory / name).unlink(missing_ok=True)
+            total -= files[name][0]
+            self._stats["evicted_files"] += 1
+        self._disk_bytes = total
+
+    def _disk_invalidate(self, prefix: str) -> int:
+        directory = Path(self.disk_dir)
+        with self._disk_lock:
+            files = self._scan()
+            names = [name for name in files if name.startswith(prefix)]
+            for name in names:
+                (directory / name).unlink(missing_ok=True)
+                self._disk_bytes -= files[name][0]
+        return len(names)
+
+render_cache = RenderCache(
+    max_memory_bytes=settings.PDF_CACHE_MEMORY_BYTES,
+    disk_dir=settings.PDF_CACHE_DIR,
+    max_disk_bytes=settings.PDF_CACHE_MAX_DISK_BYTES,
+    enabled=settings.PDF_CACHE_ENABLED
+)
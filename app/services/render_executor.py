@@ -0,0 +1,158 @@
+import asyncio
+import importlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.utils.templates import get_template, warm_templates
+
+# Modules whose import registers the PDF templates; workers load them before their first render
+TEMPLATE_MODULES = ("app.services.pdf_service", "app.services.custom_pdf_generator")
+
+
+class RenderError(Exception):
+    """
+    PDF could not be rendered in time
+    """
+
+
+def load_templates() -> None:
+    """
+    Worker initializer: register and compile every template once per process
+    """
+    for module in TEMPLATE_MODULES:
+        importlib.import_module(module)
+    warm_templates()
+
+
+def render_template(template: str, payload: str) -> bytes:
+    """
+    Render JSON-serialized resume data with a registered template; runs in a worker
+    """
+    return get_template(template).render(json.loads(payload))
+
+
+class RenderExecutor:
+    """
+    Runs reportlab renders in a process pool so a burst of PDF downloads doesn't
+    stall the event loop. At most max_concurrency renders are in flight per API
+    process; later ones wait for a slot. A render that misses its deadline is
+    reported as failed, but keeps its slot until the worker actually finishes so
+    the cap holds.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_concurrency: int = 8, timeout: float = 30.0):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._pool: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._stats: Dict[str, Any] = {"renders": 0, "timeouts": 0, "failures": 0, "render_ms": 0.0, "wait_ms": 0.0}
+
+    def _executor(self) -> Optional[Executor]:
+        # max_workers=0 means "no pool": render in the default thread executor instead
+        if self.max_workers == 0:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers or os.cpu_count(),
+                # spawn avoids forking a process that already runs event-loop and DB threads
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=load_templates
+            )
+        return self._pool
+
+    async def render(self, template: str, data: Any, timeout: Optional[float] = None) -> bytes:
+        """
+        Render resume data (anything JSON-serializable) with a registered template.
+        The deadline covers waiting for a slot as well as the render itself.
+        """
+        timeout = timeout or self.timeout
+        payload = json.dumps(data, default=str)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        started = time.perf_counter()
+        for attempt in range(2):
+            remaining = timeout - (time.perf_counter() - started)
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=max(remaining, 0.001))
+            except asyncio.TimeoutError:
+                self._stats["timeouts"] += 1
+                raise RenderError(f"No render slot free within {timeout}s")
+            waited = time.perf_counter() - started
+
+            pool = self._executor()
+            try:
+                pdf_bytes = await self._run(pool, template, payload, max(timeout - waited, 0.001))
+                break
+            except asyncio.TimeoutError:
+                self._stats["timeouts"] += 1
+                raise RenderError(f"PDF rendering timed out after {timeout}s")
+            except BrokenProcessPool:
+                # A dead worker breaks the whole pool: start a fresh one and retry once
+                self._discard(pool)
+                if attempt:
+                    self._stats["failures"] += 1
+                    raise RenderError("PDF render worker crashed")
+            except Exception:
+                self._stats["failures"] += 1
+                raise
+
+        self._stats["renders"] += 1
+        self._stats["wait_ms"] += waited * 1000
+        self._stats["render_ms"] += (time.perf_counter() - started - waited) * 1000
+        return pdf_bytes
+
+    async def _run(self, pool: Optional[Executor], template: str, payload: str, timeout: float) -> bytes:
+        """
+        Render on the pool with a slot already held; the slot goes back when the worker finishes
+        """
+        try:
+            future = asyncio.get_running_loop().run_in_executor(pool, render_template, template, payload)
+        except BrokenProcessPool:
+            self._slots.release()
+            raise
+        self._in_flight += 1
+        future.add_done_callback(self._release)
+        # shield: a timeout must not mark the job done while a worker is still on it
+        return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+
+    def _discard(self, pool: Optional[Executor]) -> None:
+        # Renders that failed together on one broken pool replace it only once
+        if pool is not None and self._pool is pool:
+            self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _future) -> None:
+        self._in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        renders = self._stats["renders"]
+        return {
+            "renders": renders,
+            "timeouts": self._stats["timeouts"],
+            "failures": self._stats["failures"],
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "mean_wait_ms": round(self._stats["wait_ms"] / renders, 2) if renders else 0.0,
+            "mean_render_ms": round(self._stats["render_ms"] / renders, 2) if renders else 0.0
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+render_executor = RenderExecutor(
+    max_workers=settings.RENDER_WORKERS,
+    max_concurrency=settings.RENDER_MAX_CONCURRENCY,
+    timeout=settings.RENDER_TIMEOUT
+)
@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.core.config import settings
+from app.services.llm_cache import response_cache
+from app.services.openai_service import (
+    PARSE_FIELDS,
+    SECTION_PARSE_HINTS,
+    parse_resume_with_ai,
+    parse_resume_sections_with_ai,
+    parse_resume_section_with_ai
+)
+from app.utils.resume_heuristics import HeuristicParse, chunk_section, parse_resume_text, split_sections
+
+# Raw section the LLM needs to see to fill in each field
+FIELD_SECTIONS = {
+    "name": "header",
+    "email": "header",
+    "phone": "header",
+    "location": "header",
+    "summary": "summary",
+    "experience": "experience",
+    "education": "education",
+    "skills": "skills",
+    "certifications": "certifications"
+}
+# Section order of the merged result; "other" pieces are only asked for fields whose own section is missing
+SECTION_ORDER = ("header", "summary", "experience", "education", "skills", "certifications", "other")
+LIST_FIELDS = ("experience", "education", "skills", "certifications")
+# Identity of an entry for de-duplication; bullets are unioned when the same entry shows up twice
+ENTRY_KEYS = {"experience": ("title", "company", "duration"), "education": ("degree", "school", "year")}
+
+_NORMALIZE = re.compile(r"[^a-z0-9+#]+")
+
+# Namespace of per-section parses in the LLM response cache
+SECTION_CACHE_FUNCTION = "parse_resume_section"
+
+
+def section_cache_key(section: str, text: str, fields: Sequence[str]) -> str:
+    """
+    Content address of one section parse: the section's whitespace-normalised text,
+    the fields asked for, and the prompt and model that produce the answer
+    """
+    payload = json.dumps(
+        {
+            "section": section,
+            "fields": list(fields),
+            "text": " ".join(text.split()),
+            "hint": SECTION_PARSE_HINTS[section],
+            "model": settings.OPENAI_MODEL
+        },
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _norm(value) -> str:
+    return " ".join(_NORMALIZE.sub(" ", str(value or "").lower()).split())
+
+
+def merge_section_results(results: Sequence[dict]) -> dict:
+    """
+    Combine per-section parses in section order. Scalars keep the first non-empty
+    value, lists are concatenated with duplicates dropped: skills and certifications
+    by normalised text, jobs and degrees by their identifying fields. The outcome
+    depends only on the order of results, never on which call finished first.
+    """
+    merged: dict = {name: [] if name in LIST_FIELDS else None for name in PARSE_FIELDS}
+    seen: Dict[str, dict] = {name: {} for name in LIST_FIELDS}
+    for result in results:
+        for name, value in result.items():
+            if name not in merged or value in (None, "", []):
+                continue
+            if name not in LIST_FIELDS:
+                if merged[name] in (None, ""):
+                    merged[name] = value
+                continue
+            for item in value if isinstance(value, list) else [value]:
+                if name in ENTRY_KEYS:
+                    if not isinstance(item, dict):
+                        continue
+                    key = tuple(_norm(item.get(part)) for part in ENTRY_KEYS[name])
+                    existing = seen[name].get(key)
+                    if existing is None:
+                        entry = dict(item)
+                        if name == "experience":
+                            entry["bullets"] = list(entry.get("bullets") or [])
+                        seen[name][key] = entry
+                        merged[name].append(entry)
+                        continue
+                    for part, part_value in item.items():
+                        if existing.get(part) in (None, "") and part_value not in (None, ""):
+                            existing[part] = part_value
+                    if name == "experience":
+                        known = {_norm(bullet) for bullet in existing["bullets"]}
+                        for bullet in item.get("bullets") or []:
+                            if _norm(bullet) not in known:
+                                known.add(_norm(bullet))
+                                existing["bullets"].append(bullet)
+                else:
+                    key = _norm(item)
+                    if key and key not in seen[name]:
+                        seen[name][key] = item
+                        merged[name].append(item)
+    return merged
+
+
+class ResumeParser:
+    """
+    Parses resumes locally and only asks the LLM about the fields the local parse is
+    unsure of. Documents with too little recognisable structure go to a full LLM parse.
+    Long documents never go out as one prompt: their sections (or, without headings,
+    plain windows of text) are parsed concurrently and merged, so latency follows the
+    longest section rather than the whole CV.
+
+    With cache_sections on, structured resumes of any length go out per section and
+    each section's answer is kept under the hash of its text, so a re-upload with one
+    bullet changed only sends the section holding that bullet. With it off, the
+    weak fields of a short resume go out in a single prompt holding just their sections.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        threshold: float = 0.6,
+        min_headings: int = 2,
+        sectioned_min_chars: int = 8000,
+        chunk_chars: int = 6000,
+        cache_sections: bool = True
+    ):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.min_headings = min_headings
+        self.sectioned_min_chars = sectioned_min_chars
+        self.chunk_chars = chunk_chars
+        self.cache_sections = cache_sections
+        self._outcomes = {"local": 0, "partial": 0, "full": 0, "sectioned": 0}
+        self._fields_sent: Dict[str, int] = {}
+        self._section_calls = 0
+        self._sections_reused = 0
+
+    async def parse(self, text: str, blocks: Optional[Sequence] = None) -> dict:
+        long_text = bool(self.sectioned_min_chars) and len(text) >= self.sectioned_min_chars
+        if not self.enabled:
+            if long_text or (self.cache_sections and split_sections(text, blocks)[1] >= self.min_headings):
+                return await self._sectioned(text, blocks)
+            return await self._full(text)
+        
+        local = parse_resume_text(text, blocks)
+        if local.headings_found < self.min_headings:
+            return await (self._sectioned(text, blocks) if long_text else self._full(text))
+        
+        weak = local.low_confidence(self.threshold)
+        if not weak:
+            self._outcomes["local"] += 1
+            return local.data
+        
+        self._outcomes["partial"] += 1
+        for name in weak:
+            self._fields_sent[name] = self._fields_sent.get(name, 0) + 1
+        if long_text or self.cache_sections:
+            fallback = await self._parse_pieces(self._pieces(text, blocks, weak))
+        else:
+            fallback = await parse_resume_sections_with_ai(self._excerpt(local, weak, text), weak)
+        
+        merged = dict(local.data)
+        for name, value in fallback.items():
+            if value not in (None, "", []):
+                merged[name] = value
+        return merged
+
+    async def _full(self, text: str) -> dict:
+        self._outcomes["full"] += 1
+        return await parse_resume_with_ai(text)
+
+    async def _sectioned(self, text: str, blocks: Optional[Sequence] = None) -> dict:
+        """
+        Parse a long document one section at a time instead of in one giant prompt
+        """
+        self._outcomes["sectioned"] += 1
+        return await self._parse_pieces(self._pieces(text, blocks, list(PARSE_FIELDS)))
+
+    def _pieces(self, text: str, blocks: Optional[Sequence], fields: List[str]) -> List[Tuple[str, str, List[str]]]:
+        """
+        (section, text, fields) for every prompt a sectioned parse sends. Without
+        recognisable headings the text is cut into plain windows, each asked for
+        every field.
+        """
+        sections, found = split_sections(text, blocks)
+        if found < self.min_headings:
+            return [("resume", chunk, fields) for chunk in chunk_section("resume", text.splitlines(), self.chunk_chars)]
+        
+        wanted = {section: [name for name in fields if FIELD_SECTIONS[name] == section] for section in SECTION_ORDER}
+        # Fields whose section has no heading may still sit under one we didn't recognise
+        wanted["other"] = [name for name in fields if FIELD_SECTIONS[name] not in sections]
+        pieces = []
+        for section in SECTION_ORDER:
+            if not wanted[section] or not sections.get(section):
+                continue
+            for chunk in chunk_section(section, sections[section], self.chunk_chars):
+                pieces.append((section, chunk, wanted[section]))
+        return pieces
+
+    async def _parse_pieces(self, pieces: List[Tuple[str, str, List[str]]]) -> dict:
+        results = await asyncio.gather(*(self._parse_piece(*piece) for piece in pieces))
+        return merge_section_results(results)
+
+    async def _parse_piece(self, section: str, chunk: str, fields: List[str]) -> dict:
+        use_cache = self.cache_sections and response_cache.is_enabled(SECTION_CACHE_FUNCTION)
+        key = section_cache_key(section, chunk, fields)
+        if use_cache:
+            cached = await response_cache.get(SECTION_CACHE_FUNCTION, key)
+            if cached is not None:
+                self._sections_reused += 1
+                return cached
+        
+        self._section_calls += 1
+        result = await parse_resume_section_with_ai(section, chunk, fields)
+        if use_cache:
+            await response_cache.set(SECTION_CACHE_FUNCTION, key, result)
+        return result
+
+    def _excerpt(self, local: HeuristicParse, weak: List[str], text: str) -> str:
+        """
+        Only the sections behind the weak fields; the whole text if one of them was never found
+        """
+        names = list(dict.fromkeys(FIELD_SECTIONS[name] for name in weak))
+        if any(name not in local.sections for name in names):
+            return text
+        labels = {"header": "CONTACT"}
+        return "\n\n".join(f"{labels.get(name, name.upper())}\n{local.sections[name]}" for name in names)
+
+    def stats(self) -> dict:
+        total = sum(self._outcomes.values())
+        return {
+            **self._outcomes,
+            "local_share": round(self._outcomes["local"] / total, 3) if total else 0.0,
+            "fields_sent_to_llm": dict(self._fields_sent),
+            "section_calls": self._section_calls,
+            "sections_reused": self._sections_reused
+        }
+
+
+resume_parser = ResumeParser(
+    enabled=settings.RESUME_HEURISTIC_PARSING,
+    threshold=settings.RESUME_PARSE_CONFIDENCE_THRESHOLD,
+    sectioned_min_chars=settings.RESUME_SECTIONED_PARSE_MIN_CHARS,
+    chunk_chars=settings.RESUME_SECTION_CHUNK_CHARS,
+    cache_sections=settings.RESUME_SECTION_CACHE
+)
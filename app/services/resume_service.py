@@ -1,40 +1,137 @@
-from typing import Optional, List
+import asyncio
+import copy
+import hashlib
+import logging
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, List, Union
 from sqlalchemy.orm import Session
 from fastapi import UploadFile, HTTPException
-import io
-import fitz  # PyMuPDF
-from docx import Document
 
 from app.models.resume_model import ResumeDB
 from app.models.user import User
 from app.schemas.resume import ResumeCreate, ResumeUpdate, ResumeParseRequest
-from app.services.openai_service import parse_resume_with_ai, analyze_resume, plan_resume_update
+from app.services.extraction_executor import extraction_executor, extraction_status, ExtractionError
+from app.services.rate_limiter import LLMRateLimitError
+from app.services.render_cache import render_cache
+from app.services.resume_parser import resume_parser
+from app.utils.text_extraction import ExtractionResult, UnsupportedFormatError
+from app.utils.uploads import SpooledUpload
+from app.services.openai_service import analyze_resume, plan_resume_update
+
+logger = logging.getLogger(__name__)
+
+def text_hash(text: str) -> str:
+    """
+    Fingerprint of extracted text; layout-only whitespace differences hash the same
+    """
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
 
 class ResumeService:
-    async def parse_uploaded_file(self, file_content: bytes, filename: str) -> dict:
+    async def parse_uploaded_file(
+        self,
+        file_content: Union[bytes, Path],
+        filename: str,
+        db: Optional[Session] = None,
+        user_id: Optional[int] = None,
+        content_hash: Optional[str] = None,
+        on_stage: Optional[Callable[[str], Awaitable[None]]] = None,
+        parse: bool = True,
+        best_effort: bool = False
+    ) -> dict:
         """
-        Extract text from uploaded file and parse it using AI
+        Extract text from uploaded file (raw bytes or a spooled path) and parse it using AI.
+        With a db session, earlier uploads of the same bytes or text are reused instead.
+        on_stage is awaited with "extracting" and "parsing" as those steps start.
+        parse=False stops after extraction unless a same-bytes upload already has a
+        parse; best_effort keeps the extracted text when parsing fails.
         """
-        text = ""
-        
-        if filename.endswith('.pdf'):
-            text = self._extract_text_from_pdf(file_content)
-        elif filename.endswith('.docx'):
-            text = self._extract_text_from_docx(file_content)
-        elif filename.endswith('.txt'):
-            text = file_content.decode('utf-8')
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
-            
-        # Parse with AI
-        start_request = ResumeParseRequest(resume_text=text)
-        parsed_data = await parse_resume_with_ai(text)
+        file_path = None
+        blocks = None
+        if isinstance(file_content, Path):
+            # Workers read spooled uploads themselves instead of receiving the bytes
+            file_path = str(file_content)
+        elif content_hash is None:
+            content_hash = hashlib.sha256(file_content).hexdigest()
         
-        return {
+        result = {
             "filename": filename,
-            "extracted_text": text,
-            "parsed_data": parsed_data
+            "file_path": file_path,
+            "content_hash": content_hash,
+            "deduplicated": None
         }
+        
+        # Same user, same bytes: reuse the earlier extraction (and parse, if it has one)
+        duplicate = None
+        if db is not None and user_id is not None and content_hash:
+            duplicate = self.find_by_content_hash(db, user_id, content_hash)
+        if duplicate is not None:
+            text = duplicate.extracted_text
+            result["deduplicated"] = "content"
+            # A cleared text_hash means parsed_data was edited after upload
+            if duplicate.parsed_data and duplicate.text_hash:
+                return {
+                    **result,
+                    "extracted_text": text,
+                    "text_hash": duplicate.text_hash,
+                    "parsed_data": copy.deepcopy(duplicate.parsed_data)
+                }
+        else:
+            if on_stage:
+                await on_stage("extracting")
+            extracted = await self._extract(file_path or file_content, filename)
+            text, blocks = extracted.text, extracted.blocks
+        
+        result["extracted_text"] = text
+        result["text_hash"] = text_hash(text)
+        if not parse:
+            result["parsed_data"] = None
+            return result
+        
+        # Parsing depends only on the text, so any user's earlier parse of it is reusable
+        if db is not None:
+            parsed = self.find_parsed_by_text_hash(db, result["text_hash"])
+            if parsed is not None:
+                result["parsed_data"] = copy.deepcopy(parsed.parsed_data)
+                result["deduplicated"] = result["deduplicated"] or "text"
+                return result
+            
+        # Parse locally, with the LLM filling in only what the local parse is unsure of
+        if on_stage:
+            await on_stage("parsing")
+        try:
+            result["parsed_data"] = await resume_parser.parse(text, blocks)
+        except LLMRateLimitError:
+            raise
+        except Exception as e:
+            if not best_effort:
+                raise
+            logger.warning("AI parsing of %s failed: %s", filename, e)
+            result["parsed_data"] = None
+        return result
+
+    async def _extract(self, source: Union[bytes, str], filename: str) -> ExtractionResult:
+        try:
+            # Layout blocks give the local parser font cues for headings
+            return await extraction_executor.extract(source, filename, with_blocks=resume_parser.enabled)
+        except UnsupportedFormatError:
+            raise HTTPException(status_code=400, detail="Unsupported file format")
+        except ExtractionError as e:
+            raise HTTPException(status_code=extraction_status(e), detail=str(e))
+
+    def find_by_content_hash(self, db: Session, user_id: int, content_hash: str) -> Optional[ResumeDB]:
+        return db.query(ResumeDB).filter(
+            ResumeDB.user_id == user_id,
+            ResumeDB.content_hash == content_hash,
+            ResumeDB.extracted_text.isnot(None)
+        ).order_by(ResumeDB.id.desc()).first()
+
+    def find_parsed_by_text_hash(self, db: Session, text_hash: str) -> Optional[ResumeDB]:
+        candidates = db.query(ResumeDB).filter(
+            ResumeDB.text_hash == text_hash
+        ).order_by(ResumeDB.id.desc()).limit(5)
+        # parsed_data is stored as JSON null when parsing was skipped, so check in Python
+        return next((resume for resume in candidates if resume.parsed_data), None)
     
     async def create_resume(self, db: Session, user_id: int, resume_data: dict) -> ResumeDB:
         """
@@ -43,14 +140,43 @@ class ResumeService:
         db_resume = ResumeDB(
             user_id=user_id,
             filename=resume_data["filename"],
-            file_path="uploads/" + resume_data["filename"], # Placeholder for actual storage
+            file_path=resume_data.get("file_path") or "uploads/" + resume_data["filename"],
             extracted_text=resume_data["extracted_text"],
-            parsed_data=resume_data["parsed_data"]
+            parsed_data=resume_data["parsed_data"],
+            content_hash=resume_data.get("content_hash"),
+            text_hash=resume_data.get("text_hash")
+        )
+        db.add(db_resume)
+        db.commit()
+        db.refresh(db_resume)
+        return db_resume
+
+    async def create_pending_resume(self, db: Session, user_id: int, upload: SpooledUpload) -> ResumeDB:
+        """
+        Save a row for a spooled upload before it is extracted and parsed, so the
+        client gets its id straight away
+        """
+        db_resume = ResumeDB(
+            user_id=user_id,
+            filename=upload.filename,
+            file_path=str(upload.path),
+            content_hash=upload.sha256
         )
         db.add(db_resume)
         db.commit()
         db.refresh(db_resume)
         return db_resume
+
+    async def complete_resume(self, db: Session, resume: ResumeDB, resume_data: dict) -> ResumeDB:
+        """
+        Fill in a pending row with the result of parse_uploaded_file
+        """
+        resume.extracted_text = resume_data["extracted_text"]
+        resume.parsed_data = resume_data["parsed_data"]
+        resume.text_hash = resume_data.get("text_hash")
+        db.commit()
+        db.refresh(resume)
+        return resume
         
     async def get_resumes_by_user(self, db: Session, user_id: int) -> List[ResumeDB]:
         return db.query(ResumeDB).filter(ResumeDB.user_id == user_id).all()
@@ -58,6 +184,16 @@ class ResumeService:
     async def get_resume(self, db: Session, resume_id: int, user_id: int) -> Optional[ResumeDB]:
         return db.query(ResumeDB).filter(ResumeDB.id == resume_id, ResumeDB.user_id == user_id).first()
 
+    async def get_resumes_by_ids(self, db: Session, resume_ids: List[int], user_id: Optional[int] = None) -> List[ResumeDB]:
+        """
+        Resumes with the given ids in the order asked for; user_id=None skips the owner check (admins)
+        """
+        query = db.query(ResumeDB).filter(ResumeDB.id.in_(resume_ids))
+        if user_id is not None:
+            query = query.filter(ResumeDB.user_id == user_id)
+        by_id = {resume.id: resume for resume in query.all()}
+        return [by_id[resume_id] for resume_id in dict.fromkeys(resume_ids) if resume_id in by_id]
+
     async def analyze_resume_quality(self, resume: ResumeDB) -> dict:
         """
         Analyze an existing resume from the DB
@@ -75,19 +211,6 @@ class ResumeService:
         # Refactoring to require DB session for update would be better.
         return analysis
 
-    def _extract_text_from_pdf(self, file_bytes: bytes) -> str:
-        doc = fitz.open(stream=file_bytes, filetype="pdf")
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        return text
-
-    def _extract_text_from_docx(self, file_bytes: bytes) -> str:
-        doc = Document(io.BytesIO(file_bytes))
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return text
-
-
     async def apply_resume_update(self, db: Session, resume_id: int, user_id: int, update_text: str) -> dict:
         """
         Smart update of resume based on user text
@@ -155,8 +278,12 @@ class ResumeService:
         # 5. Save
         # Make a copy to trigger sqlalchemy detection if needed (JSON mutation)
         resume.parsed_data = dict(updated_data) 
+        # Edited data is no longer the plain parse of extracted_text; keep it out of upload dedup
+        resume.text_hash = None
         db.commit()
         db.refresh(resume)
+        # PDFs rendered from the old content are never served again
+        await render_cache.invalidate(resume.id)
         
         return {
             "original_plan": plan,
@@ -0,0 +1,58 @@
+from typing import Dict
+
+
+class TokenUsageTracker:
+    """
+    Per-function token accounting for LLM calls: usage reported by the API,
+    local prompt estimates, tokens avoided by cache hits and by prompt compaction.
+    """
+
+    def __init__(self):
+        self._functions: Dict[str, Dict[str, int]] = {}
+
+    def _counters(self, function: str) -> Dict[str, int]:
+        return self._functions.setdefault(function, {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "estimated_prompt_tokens": 0,
+            "cached_calls": 0,
+            "cached_prompt_tokens_avoided": 0,
+            "compaction_baseline_tokens": 0,
+            "compaction_tokens": 0
+        })
+
+    def record_response(self, function: str, usage, estimated_prompt_tokens: int) -> None:
+        counters = self._counters(function)
+        counters["calls"] += 1
+        counters["estimated_prompt_tokens"] += estimated_prompt_tokens
+        if usage is not None:
+            counters["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+            counters["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+
+    def record_cache_hit(self, function: str, estimated_prompt_tokens: int) -> None:
+        counters = self._counters(function)
+        counters["cached_calls"] += 1
+        counters["cached_prompt_tokens_avoided"] += estimated_prompt_tokens
+
+    def record_compaction(self, function: str, baseline_tokens: int, compact_tokens: int) -> None:
+        counters = self._counters(function)
+        counters["compaction_baseline_tokens"] += baseline_tokens
+        counters["compaction_tokens"] += compact_tokens
+
+    def snapshot(self) -> dict:
+        functions = {name: dict(counters) for name, counters in self._functions.items()}
+        totals: Dict[str, int] = {}
+        for counters in functions.values():
+            for key, value in counters.items():
+                totals[key] = totals.get(key, 0) + value
+        totals["compaction_tokens_saved"] = (
+            totals.get("compaction_baseline_tokens", 0) - totals.get("compaction_tokens", 0)
+        )
+        return {"totals": totals, "by_function": functions}
+
+    def reset(self) -> None:
+        self._functions.clear()
+
+
+usage_tracker = TokenUsageTracker()
@@ -0,0 +1,306 @@
+"""
+Background upload pipeline. The upload request only spools the file and records a
+pending resume plus a job; extraction, parsing and saving run in a worker, and each
+stage is written to the job row so clients can poll it or follow it as events.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.resume_model import ResumeDB
+from app.models.upload_job import UploadJobDB
+from app.services.resume_service import resume_service
+from app.utils.uploads import SpooledUpload
+
+STAGES = ("queued", "extracting", "parsing", "saving", "done")
+FINISHED = ("done", "failed")
+
+logger = logging.getLogger(__name__)
+
+
+def job_state(job: UploadJobDB, resume: Optional[ResumeDB] = None) -> dict:
+    """
+    Public view of a job; includes the parsed resume once the job is done
+    """
+    state = {
+        "job_id": job.id,
+        "resume_id": job.resume_id,
+        "status": job.status,
+        "stage": job.stage,
+        "stage_times": dict(job.stage_times or {}),
+        "error": job.error
+    }
+    if job.status == "done" and resume is not None:
+        state["parsed_data"] = resume.parsed_data
+    return state
+
+
+class UploadPipeline:
+    """
+    Runs upload jobs on in-process asyncio workers, or hands them to Celery
+    (app/worker.py) when backend is "celery". Progress is always read back from the
+    database, so a stream opened on one API process follows a job running anywhere;
+    jobs run in this process also push each stage to their listeners directly.
+
+    The inline queue lives in memory, so jobs open when a process stops would stay
+    open forever. start() re-dispatches them, and keeps sweeping for jobs that made
+    no progress for stale_after seconds, skipping the ones this process is still
+    running. A worker claims a job by moving it from queued to running, so a job
+    dispatched twice still runs once.
+    """
+
+    def __init__(
+        self,
+        backend: str = "inline",
+        workers: int = 4,
+        poll_interval: float = 1.0,
+        stale_after: float = 900.0,
+        session_factory=SessionLocal
+    ):
+        if backend not in ("inline", "celery"):
+            raise ValueError(f"Unknown upload worker backend: {backend}")
+        self.backend = backend
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._sweeper: Optional[asyncio.Task] = None
+        self._running: Set[str] = set()  # jobs claimed by this process and not finished yet
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}
+        self._stats = {"submitted": 0, "done": 0, "failed": 0, "recovered": 0}
+        self._stage_seconds: Dict[str, List[float]] = {}
+
+    async def submit(self, db: Session, user_id: int, upload: SpooledUpload) -> Tuple[ResumeDB, UploadJobDB]:
+        """
+        Record the pending resume and its job, queue the work and return at once
+        """
+        resume = await resume_service.create_pending_resume(db, user_id, upload)
+        job = UploadJobDB(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            resume_id=resume.id,
+            status="queued",
+            stage="queued",
+            stage_times={"queued": time.time()}
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        self._stats["submitted"] += 1
+        await self._dispatch(job.id)
+        return resume, job
+
+    async def _dispatch(self, job_id: str) -> None:
+        if self.backend == "celery":
+            # Imported here so the API only needs Celery when it is the configured backend
+            from app.worker import process_upload
+            await asyncio.to_thread(process_upload.delay, job_id)
+            return
+
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        await self._queue.put(job_id)
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.run(job_id)
+            except Exception:
+                logger.exception("Upload job %s crashed", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def run(self, job_id: str) -> None:
+        """
+        Run every stage of one job; called by the in-process workers and the Celery task
+        """
+        db = self.session_factory()
+        try:
+            # Claim the job; losing the claim means another worker has it or it is finished
+            claimed = db.query(UploadJobDB).filter(
+                UploadJobDB.id == job_id, UploadJobDB.status == "queued"
+            ).update({"status": "running"}, synchronize_session=False)
+            db.commit()
+            if not claimed:
+                return
+            self._running.add(job_id)
+            job = db.get(UploadJobDB, job_id)
+            resume = db.get(ResumeDB, job.resume_id)
+
+            async def on_stage(stage: str) -> None:
+                self._advance(db, job, stage)
+
+            try:
+                result = await resume_service.parse_uploaded_file(
+                    Path(resume.file_path),
+                    resume.filename,
+                    db=db,
+                    user_id=job.user_id,
+                    content_hash=resume.content_hash,
+                    on_stage=on_stage
+                )
+                self._advance(db, job, "saving")
+                await resume_service.complete_resume(db, resume, result)
+                self._advance(db, job, "done", status="done", resume=resume)
+                self._stats["done"] += 1
+            except Exception as e:
+                db.rollback()
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                self._advance(db, job, job.stage, status="failed", error=str(detail))
+                self._stats["failed"] += 1
+        finally:
+            self._running.discard(job_id)
+            db.close()
+
+    def _advance(
+        self,
+        db: Session,
+        job: UploadJobDB,
+        stage: str,
+        status: Optional[str] = None,
+        error: Optional[str] = None,
+        resume: Optional[ResumeDB] = None
+    ) -> None:
+        now = time.time()
+        times = dict(job.stage_times or {})
+        if stage != job.stage:
+            started = times.get(job.stage)
+            if started is not None:
+                self._stage_seconds.setdefault(job.stage, []).append(now - started)
+            times[stage] = now
+        job.stage = stage
+        job.stage_times = times  # reassigned so the JSON column is marked dirty
+        job.status = status or job.status
+        job.error = error
+        db.commit()
+        if job.id in self._listeners:
+            state = job_state(job, resume)
+            for listener in self._listeners[job.id]:
+                listener.put_nowait(state)
+
+    async def start(self) -> None:
+        """
+        Re-dispatch jobs left open by a previous run and keep sweeping for abandoned ones
+        """
+        await self.recover(all_queued=True)
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(self.stale_after)
+            try:
+                await self.recover()
+            except Exception:
+                logger.exception("Upload job sweep failed")
+
+    async def recover(self, all_queued: bool = False) -> int:
+        """
+        Dispatch open jobs with no progress for stale_after seconds; running ones are
+        reset to queued, since the worker that had them is gone. Slow jobs still running in
+        this process are left alone. With all_queued, every queued job is dispatched: after
+        a restart none of them is in this process's queue, and a copy still queued
+        elsewhere loses the claim.
+        """
+        cutoff = time.time() - self.stale_after
+        db = self.session_factory()
+        try:
+            job_ids = []
+            for job in db.query(UploadJobDB).filter(UploadJobDB.status.in_(("queued", "running"))):
+                if job.id in self._running:
+                    continue
+                last_progress = max((job.stage_times or {}).values(), default=0)
+                if last_progress > cutoff and not (all_queued and job.status == "queued"):
+                    continue
+                job.status = "queued"
+                job_ids.append(job.id)
+            db.commit()
+        finally:
+            db.close()
+
+        for job_id in job_ids:
+            await self._dispatch(job_id)
+        if job_ids:
+            logger.info("Re-dispatched %d open upload jobs", len(job_ids))
+        self._stats["recovered"] += len(job_ids)
+        return len(job_ids)
+
+    def get_job(self, db: Session, job_id: str, user_id: int) -> Optional[UploadJobDB]:
+        return db.query(UploadJobDB).filter(UploadJobDB.id == job_id, UploadJobDB.user_id == user_id).first()
+
+    def _load_state(self, job_id: str) -> Optional[dict]:
+        db = self.session_factory()
+        try:
+            job = db.get(UploadJobDB, job_id)
+            if job is None:
+                return None
+            return job_state(job, db.get(ResumeDB, job.resume_id))
+        finally:
+            db.close()
+
+    async def events(self, job_id: str) -> AsyncIterator[dict]:
+        """
+        Job state every time it changes, ending after done or failed. Jobs run in this
+        process push each stage; others are picked up by re-reading the row.
+        """
+        # No await between the read and subscribing, so no in-process update falls in between
+        state = self._load_state(job_id)
+        updates: asyncio.Queue = asyncio.Queue()
+        self._listeners.setdefault(job_id, set()).add(updates)
+        try:
+            last = None
+            while state is not None:
+                if state != last:
+                    last = state
+                    yield state
+                if state["status"] in FINISHED:
+                    return
+                try:
+                    state = await asyncio.wait_for(updates.get(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    state = self._load_state(job_id)
+        finally:
+            listeners = self._listeners.get(job_id)
+            if listeners is not None:
+                listeners.discard(updates)
+                if not listeners:
+                    del self._listeners[job_id]
+
+    async def shutdown(self) -> None:
+        tasks = self._tasks + ([self._sweeper] if self._sweeper else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._sweeper = None
+        self._queue = None
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            **self._stats,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "mean_stage_seconds": {
+                stage: round(sum(samples) / len(samples), 3)
+                for stage, samples in self._stage_seconds.items()
+            }
+        }
+
+
+upload_pipeline = UploadPipeline(
+    backend=settings.UPLOAD_WORKER_BACKEND,
+    workers=settings.UPLOAD_WORKERS,
+    poll_interval=settings.UPLOAD_JOB_POLL_INTERVAL,
+    stale_after=settings.UPLOAD_JOB_STALE_AFTER
+)
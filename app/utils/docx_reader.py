@@ -0,0 +1,116 @@
+"""
+Fast DOCX text reader. Streams word/document.xml and the header/footer parts out of
+the zip with iterparse instead of building python-docx's object model, and picks
+up what resume templates hide outside body paragraphs: table cells, text boxes,
+headers and footers.
+"""
+import io
+import re
+import zipfile
+from typing import Iterator, List, Tuple, Union
+from xml.etree.ElementTree import iterparse
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+_HEADER_PART = re.compile(r"word/header\d*\.xml$")
+_FOOTER_PART = re.compile(r"word/footer\d*\.xml$")
+
+_P, _T, _TAB, _BR, _CR = W + "p", W + "t", W + "tab", W + "br", W + "cr"
+_NO_BREAK_HYPHEN = W + "noBreakHyphen"
+_TR, _TC = W + "tr", W + "tc"
+_TABS = W + "tabs"  # tab-stop definitions in paragraph properties, not text
+
+
+def _part_lines(stream) -> Iterator[str]:
+    """
+    Lines of one WordprocessingML part in document order. Paragraphs become lines,
+    table rows become "cell | cell" lines, and text-box paragraphs are emitted as
+    lines of their own ahead of the paragraph that anchors them.
+    """
+    # Stack of open containers: ("p", run texts), ("tc", paragraphs), ("tr", cells)
+    stack: List[Tuple[str, List[str]]] = []
+    skip = 0  # depth inside mc:Fallback, the VML copy of a text box we already read
+    in_tab_stops = False
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if tag == MC_FALLBACK:
+            skip += 1 if event == "start" else -1
+            if event == "end":
+                elem.clear()
+            continue
+        if skip:
+            continue
+
+        if tag == _TABS:
+            in_tab_stops = event == "start"
+            continue
+        if event == "start":
+            if tag == _P:
+                stack.append(("p", []))
+            elif tag == _TC:
+                stack.append(("tc", []))
+            elif tag == _TR:
+                stack.append(("tr", []))
+            continue
+
+        if tag == _T:
+            if stack and stack[-1][0] == "p":
+                stack[-1][1].append(elem.text or "")
+        elif tag == _TAB:
+            if stack and stack[-1][0] == "p" and not in_tab_stops:
+                stack[-1][1].append("\t")
+        elif tag in (_BR, _CR):
+            if stack and stack[-1][0] == "p":
+                stack[-1][1].append("\n")
+        elif tag == _NO_BREAK_HYPHEN:
+            if stack and stack[-1][0] == "p":
+                stack[-1][1].append("-")
+        elif tag in (_P, _TC, _TR):
+            kind, parts = stack.pop()
+            if kind == "p":
+                line = "".join(parts)
+            elif kind == "tc":
+                line = " ".join(part for part in parts if part.strip())
+            else:
+                line = " | ".join(parts)
+
+            parent = stack[-1][0] if stack else None
+            if parent == "tc" or (parent == "tr" and kind == "tc"):
+                stack[-1][1].append(line)
+            elif kind != "tc":
+                yield line
+            # Release the subtree; iterparse would otherwise keep the whole part alive
+            elem.clear()
+
+
+def _read_part(archive: zipfile.ZipFile, name: str) -> List[str]:
+    with archive.open(name) as stream:
+        return list(_part_lines(stream))
+
+
+def read_docx_text(source: Union[bytes, str]) -> str:
+    """
+    Text of a .docx: header parts, then the body, then footer parts. Repeated headers
+    (first-page/even-page variants with the same content) are kept once.
+    """
+    with zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source) as archive:
+        names = archive.namelist()
+        headers = sorted(name for name in names if _HEADER_PART.match(name))
+        footers = sorted(name for name in names if _FOOTER_PART.match(name))
+
+        sections: List[str] = []
+        seen = set()
+        for name in headers:
+            text = "\n".join(line for line in _read_part(archive, name) if line.strip())
+            if text and text not in seen:
+                seen.add(text)
+                sections.append(text)
+        sections.append("\n".join(_read_part(archive, "word/document.xml")))
+        for name in footers:
+            text = "\n".join(line for line in _read_part(archive, name) if line.strip())
+            if text and text not in seen:
+                seen.add(text)
+                sections.append(text)
+    return "\n".join(sections)
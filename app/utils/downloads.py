@@ -0,0 +1,97 @@
+"""
+Binary file responses with HTTP caching: a strong ETag, 304 for a matching
+If-None-Match, and single byte ranges (206/416) honouring If-Range.
+"""
+import re
+from typing import Optional, Tuple
+from urllib.parse import quote
+from fastapi import Request, Response
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def quote_etag(key: str) -> str:
+    return f'"{key}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match comparison; weak validators match too, as RFC 9110 asks for GET
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (first, last) byte of a single range, or None to send the whole body. Multiple
+    ranges and malformed headers get the whole body, which the spec allows.
+    Raises ValueError when the range lies entirely past the end.
+    """
+    match = _RANGE.match(header.strip()) if header else None
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+    start, end = match.groups()
+    if start == "":
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+    first = int(start)
+    last = min(int(end), size - 1) if end else size - 1
+    if end and int(end) < first:
+        return None
+    if first >= size:
+        raise ValueError("Range starts past the end")
+    return first, last
+
+
+def content_disposition(filename: str, inline: bool = False) -> str:
+    kind = "inline" if inline else "attachment"
+    fallback = filename.encode("ascii", "ignore").decode() or "download"
+    return f"{kind}; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def cache_headers(etag: str, cache_control: str) -> dict:
+    return {"ETag": etag, "Cache-Control": cache_control, "Accept-Ranges": "bytes", "Vary": "Authorization"}
+
+
+def not_modified(request: Request, etag: str, cache_control: str) -> Optional[Response]:
+    """
+    304 when the client already holds this version, so the caller can skip producing it
+    """
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers(etag, cache_control))
+    return None
+
+
+def binary_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    filename: str,
+    media_type: str,
+    cache_control: str,
+    inline: bool = False
+) -> Response:
+    headers = cache_headers(etag, cache_control)
+    headers["Content-Disposition"] = content_disposition(filename, inline)
+
+    if_range = request.headers.get("if-range")
+    # A stale If-Range (or a date, which we don't track) means: send everything
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), len(body))
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{len(body)}"
+            return Response(status_code=416, headers=headers)
+        if byte_range is not None:
+            first, last = byte_range
+            headers["Content-Range"] = f"bytes {first}-{last}/{len(body)}"
+            return Response(body[first:last + 1], status_code=206, media_type=media_type, headers=headers)
+
+    return Response(body, media_type=media_type, headers=headers)
@@ -0,0 +1,76 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+# Keeps tech tokens such as "c++", "c#", "node.js" and "ci/cd" intact
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "its", "of", "on", "or", "our", "that", "the", "their", "this", "to", "was", "we",
+    "were", "will", "with", "you", "your", "who", "which", "while", "within", "across", "into",
+    "using", "used", "etc", "including", "experience", "work", "working", "team", "years", "year"
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase and split text into keyword tokens, dropping stopwords
+    """
+    tokens = []
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        token = token.rstrip(".-/")
+        if token and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """
+    In-memory inverted index with Okapi BM25 scoring
+    """
+
+    def __init__(self, documents: Iterable[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_lengths: List[int] = []
+        
+        for doc_id, text in enumerate(documents):
+            term_counts = Counter(tokenize(text))
+            self._doc_lengths.append(sum(term_counts.values()))
+            for term, count in term_counts.items():
+                self._postings.setdefault(term, {})[doc_id] = count
+        
+        total = sum(self._doc_lengths)
+        self._avg_length = total / len(self._doc_lengths) if total else 1.0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def idf(self, term: str) -> float:
+        df = len(self._postings.get(term, {}))
+        return math.log(1 + (len(self) - df + 0.5) / (df + 0.5))
+
+    def score(self, query: str) -> List[float]:
+        """
+        BM25 score of every document for the query (distinct query terms only)
+        """
+        scores = [0.0] * len(self)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in postings.items():
+                norm = 1 - self.b + self.b * self._doc_lengths[doc_id] / self._avg_length
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return scores
+
+    def top_k(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """
+        (doc_id, score) pairs for the k best documents, highest first; ties keep input order
+        """
+        ranked = sorted(enumerate(self.score(query)), key=lambda item: (-item[1], item[0]))
+        return ranked[:k]
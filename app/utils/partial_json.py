@@ -0,0 +1,105 @@
+import json
+from typing import Any, List, Optional
+
+_LITERAL_CHARS = set("-+0123456789.eEtruefalsn")
+
+
+def parse_partial_json(text: str) -> Optional[Any]:
+    """
+    Best-effort parse of a truncated JSON document, as produced while a model is still streaming.
+    Open strings that are values are closed, open arrays/objects are closed, and anything that
+    cannot be completed yet (a half-written key, number or literal, a dangling comma/colon) is
+    dropped. Returns None when nothing usable has arrived.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    
+    # Each frame is [closer, state]; state is what the container expects next:
+    # objects: "key" -> "colon" -> "value" -> "comma"; arrays: "value" -> "comma"
+    stack: List[List[str]] = []
+    checkpoint = None  # (end index, closers) of the last prefix that can be closed into valid JSON
+    
+    def closers() -> str:
+        return "".join(frame[0] for frame in reversed(stack))
+    
+    def value_done() -> None:
+        if stack:
+            stack[-1][1] = "comma"
+    
+    i = 0
+    length = len(text)
+    while i < length:
+        ch = text[i]
+        if ch.isspace():
+            i += 1
+            continue
+        if ch in "{[":
+            stack.append(["}", "key"] if ch == "{" else ["]", "value"])
+            i += 1
+            checkpoint = (i, closers())
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            value_done()
+            i += 1
+            checkpoint = (i, closers())
+        elif ch == ":":
+            if stack:
+                stack[-1][1] = "value"
+            i += 1
+        elif ch == ",":
+            if stack:
+                stack[-1][1] = "key" if stack[-1][0] == "}" else "value"
+            i += 1
+        elif ch == '"':
+            is_key = bool(stack) and stack[-1][0] == "}" and stack[-1][1] == "key"
+            j = i + 1
+            escape = False
+            while j < length:
+                if escape:
+                    escape = False
+                elif text[j] == "\\":
+                    escape = True
+                elif text[j] == '"':
+                    break
+                j += 1
+            if j >= length:
+                # Unterminated string: a value can be closed, a key cannot
+                if is_key:
+                    break
+                partial = text[:length - 1] if escape else text
+                try:
+                    return json.loads(partial + '"' + closers())
+                except ValueError:
+                    break
+            i = j + 1
+            if is_key:
+                stack[-1][1] = "colon"
+            else:
+                value_done()
+                checkpoint = (i, closers())
+        elif ch in _LITERAL_CHARS:
+            j = i
+            while j < length and text[j] in _LITERAL_CHARS:
+                j += 1
+            if j >= length:
+                # The number/literal may still be growing
+                break
+            i = j
+            value_done()
+            checkpoint = (i, closers())
+        else:
+            break
+    
+    if checkpoint is None:
+        return None
+    end, suffix = checkpoint
+    try:
+        return json.loads(text[:end] + suffix)
+    except ValueError:
+        return None
@@ -0,0 +1,501 @@
+"""
+Deterministic resume parser. Splits extracted text into sections by heading (and,
+for PDFs, font cues from layout blocks), pulls contact details out with regexes,
+and parses date ranges and bullets into the app's Resume shape. Every field gets a
+confidence in [0, 1] so callers can send only the weak ones to the LLM.
+"""
+import re
+import zlib
+from dataclasses import dataclass, field
+from statistics import median
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+SECTION_ALIASES = {
+    "summary": (
+        "summary", "professional summary", "profile", "professional profile", "objective",
+        "career objective", "about me", "about", "career summary", "overview"
+    ),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "career history", "relevant experience", "internships", "internship experience"
+    ),
+    "education": ("education", "academic background", "academics", "education and training", "qualifications"),
+    "skills": (
+        "skills", "technical skills", "core skills", "key skills", "core competencies", "competencies",
+        "technologies", "tools", "skills and tools", "tech stack", "expertise", "areas of expertise"
+    ),
+    "certifications": (
+        "certifications", "certificates", "certification", "licenses", "licenses and certifications",
+        "certifications and licenses", "courses", "training"
+    ),
+    "contact": ("contact", "contact information", "contact details", "personal details"),
+    # Known sections the Resume shape has no field for; they still end the previous section
+    "other": (
+        "projects", "personal projects", "awards", "honors", "honors and awards", "achievements",
+        "interests", "hobbies", "languages", "references", "publications", "volunteer", "volunteering",
+        "activities", "leadership", "extracurricular activities"
+    )
+}
+_HEADINGS = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_YEAR = r"(?:19|20)\d{2}"
+_DATE = rf"(?:{_MONTH}\s+{_YEAR}|(?:0?[1-9]|1[0-2])/{_YEAR}|{_YEAR})"
+DATE_RANGE = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|present|current|now|today)",
+    re.IGNORECASE
+)
+SINGLE_DATE = re.compile(rf"\b{_DATE}\b", re.IGNORECASE)
+YEAR = re.compile(rf"\b{_YEAR}\b")
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE = re.compile(r"\+?\(?\d[\d\s().-]{5,}\d")
+URL = re.compile(r"(?:https?://|www\.)\S+|\b(?:linkedin|github)\.com/\S+", re.IGNORECASE)
+GPA = re.compile(r"\b(?:c?gpa)\b\s*[:\-]?\s*([\d.]+(?:\s*/\s*[\d.]+)?)", re.IGNORECASE)
+BULLET = re.compile(r"^\s*(?:[•·▪●◦‣∙■□➢►✓*]|[-–—](?=\s)|o(?=\s))\s*")
+LOCATION = re.compile(r"^(?:remote|hybrid|on-?site|[A-Z][A-Za-z.' ]+,\s*[A-Z][A-Za-z.' ]+)$", re.IGNORECASE)
+DEGREE = re.compile(
+    r"\b(?:bachelor'?s?|master'?s?|doctor(?:ate)?|ph\.?\s?d\.?|mba|b\.?\s?sc|m\.?\s?sc|b\.?\s?tech|m\.?\s?tech"
+    r"|b\.s\.?|m\.s\.?|b\.a\.?|m\.a\.?|b\.e\.?|m\.e\.?|bs|ms|ba|ma|associate'?s? degree|diploma|high school|ged)\b",
+    re.IGNORECASE
+)
+SCHOOL = re.compile(r"\b(?:university|college|institute|school|academy|polytechnic|iit|mit)\b", re.IGNORECASE)
+# "Google, Mountain View, CA": a city and region after the last name fragment
+TRAILING_LOCATION = re.compile(
+    r",\s*(?P<location>Remote|[A-Z][A-Za-z.']*(?:\s[A-Z][A-Za-z.']*){0,2},\s*(?:[A-Z]{2,3}|[A-Z][a-z]+))\s*$"
+)
+
+TITLE_WORDS = {
+    "engineer", "developer", "programmer", "manager", "analyst", "intern", "scientist", "designer",
+    "consultant", "lead", "director", "architect", "specialist", "coordinator", "administrator",
+    "associate", "officer", "head", "president", "founder", "co-founder", "assistant", "technician",
+    "researcher", "fellow", "trainee", "owner", "sre", "devops", "cto", "ceo", "vp", "principal", "staff"
+}
+
+_HEADER_SPLIT = re.compile(r"\s*[|•·]\s*|\t+|\s{3,}")
+_ENTRY_SPLIT = re.compile(r"\s+[|•·/]\s+|\s+[-–—]\s+|\s+at\s+|\s+@\s+|\t+|\s{3,}")
+# Commas only split after any trailing "City, ST" has been taken off
+_COMMA_SPLIT = re.compile(r",\s+")
+# No " at ": it is part of school names ("University of Texas at Austin")
+_EDUCATION_SPLIT = re.compile(r"\s+[|•·]\s+|\s+[-–—]\s+|,\s+|\t+|\s{3,}")
+_SKILL_SPLIT = re.compile(r"\s*[,;|•·]\s*")
+
+
+@dataclass
+class HeuristicParse:
+    data: dict
+    confidence: Dict[str, float]
+    sections: Dict[str, str] = field(default_factory=dict)  # section -> raw text, plus "header"
+    headings_found: int = 0
+
+    def low_confidence(self, threshold: float) -> List[str]:
+        return [name for name, score in self.confidence.items() if score < threshold]
+
+
+def _heading_key(line: str) -> str:
+    key = line.lower().replace("&", " and ")
+    key = re.sub(r"[^a-z ]", " ", key)
+    return " ".join(key.split())
+
+
+def _lookup_heading(line: str) -> Optional[str]:
+    key = _heading_key(line)
+    if key in _HEADINGS:
+        return _HEADINGS[key]
+    # Icon glyphs fonts can't render often come through as a stray letter: "I Skills"
+    first, _, rest = key.partition(" ")
+    if len(first) == 1 and rest in _HEADINGS:
+        return _HEADINGS[rest]
+    return None
+
+
+def _font_headings(blocks: Optional[Sequence]) -> Tuple[Set[str], Optional[str]]:
+    """
+    Short lines set larger or bolder than body text, and the biggest line on page one
+    (usually the candidate's name)
+    """
+    if not blocks:
+        return set(), None
+    body_size = median(block.size for block in blocks)
+    headings = set()
+    for block in blocks:
+        if "\n" in block.text or len(block.text.split()) > 6:
+            continue
+        if block.bold or block.size >= body_size * 1.15:
+            headings.add(block.text.strip())
+    # Names in narrow sidebars wrap, so allow a two-line block
+    first_page = [block for block in blocks if block.page == 0 and block.text.count("\n") <= 1 and block.text.strip()]
+    if not first_page:
+        return headings, None
+    largest = max(first_page, key=lambda block: block.size)
+    if largest.size < body_size * 1.2:
+        return headings, None  # nothing stands out
+    return headings, " ".join(largest.text.split())
+
+
+def _classify_heading(line: str, font_headings: Set[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (section, inline content) if the line is a section heading, e.g. "Skills: Python, Go"
+    """
+    stripped = line.strip()
+    if not stripped or len(stripped) > 60:
+        return None, None
+    section = _lookup_heading(stripped)
+    if section:
+        return section, None
+    label, colon, rest = stripped.partition(":")
+    if colon and rest.strip() and _lookup_heading(label):
+        return _lookup_heading(label), rest.strip()
+    # An unknown heading only counts with a font cue and all-caps text
+    letters = re.sub(r"[^A-Za-z]", "", stripped)
+    if stripped in font_headings and letters.isupper() and len(stripped.split()) <= 4:
+        return "other", None
+    return None, None
+
+
+def split_sections(text: str, blocks: Optional[Sequence] = None) -> Tuple[Dict[str, List[str]], int]:
+    """
+    Lines grouped by section. Lines before the first heading go to "header"; a
+    repeated heading (e.g. on a later page) continues the same section.
+    """
+    font_headings, _ = _font_headings(blocks)
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    found = 0
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        section, inline = _classify_heading(line, font_headings)
+        if section:
+            found += section != "other"
+            current = "header" if section == "contact" else section
+            sections.setdefault(current, [])
+            if inline:
+                sections[current].append(inline)
+            continue
+        sections[current].append(line)
+    return sections, found
+
+
+def _strip_bullet(line: str) -> str:
+    return BULLET.sub("", line, count=1).strip()
+
+
+def _format_range(match: re.Match) -> str:
+    end = match.group("end")
+    if end.lower() in ("present", "current", "now", "today"):
+        end = "Present"
+    return f"{match.group('start')} - {end}"
+
+
+def _is_phone(candidate: str) -> bool:
+    digits = re.sub(r"\D", "", candidate)
+    if not 7 <= len(digits) <= 15:
+        return False
+    return not DATE_RANGE.search(candidate) and not re.fullmatch(rf"\s*{_YEAR}\s*", candidate)
+
+
+def parse_contact(header: List[str], text: str, blocks: Optional[Sequence] = None) -> Tuple[dict, Dict[str, float]]:
+    contact = {"name": "", "email": "", "phone": "", "location": None}
+    confidence = {"name": 0.0, "email": 0.0, "phone": 0.0, "location": 0.7}
+
+    email = next((m.group(0) for line in header for m in [EMAIL.search(line)] if m), None)
+    if email is None:
+        match = EMAIL.search(text)
+        email = match.group(0) if match else None
+    if email:
+        contact["email"] = email.rstrip(".")
+        confidence["email"] = 1.0
+
+    def phones(lines):
+        for line in lines:
+            cleaned = URL.sub(" ", EMAIL.sub(" ", line))
+            for match in PHONE.finditer(cleaned):
+                if _is_phone(match.group(0)):
+                    yield match.group(0).strip()
+    phone = next(phones(header), None)
+    if phone:
+        contact["phone"], confidence["phone"] = phone, 0.9
+    else:
+        phone = next(phones(text.splitlines()), None)
+        if phone:
+            contact["phone"], confidence["phone"] = phone, 0.6
+
+    _, font_name = _font_headings(blocks)
+    parts = [part.strip() for line in header for part in _HEADER_SPLIT.split(line) if part.strip()]
+    if font_name and not re.search(r"[@\d]", font_name) and 1 <= len(font_name.split()) <= 5:
+        contact["name"], confidence["name"] = font_name, 0.95
+    else:
+        for line in header[:3]:
+            candidate = _HEADER_SPLIT.split(line)[0].strip()
+            words = candidate.split()
+            if re.search(r"[@\d/]", candidate) or not 1 <= len(words) <= 5:
+                continue
+            if _lookup_heading(candidate):
+                continue
+            well_formed = 2 <= len(words) <= 4 and all(word[:1].isupper() for word in words)
+            contact["name"], confidence["name"] = candidate, 0.85 if well_formed else 0.5
+            break
+
+    for part in parts:
+        if part == contact["name"] or EMAIL.search(part) or re.search(r"\d{3}", part):
+            continue
+        if LOCATION.match(part):
+            contact["location"], confidence["location"] = part, 0.8
+            break
+    return contact, confidence
+
+
+def _split_entry_line(line: str, pattern: re.Pattern = _ENTRY_SPLIT) -> List[str]:
+    parts = pattern.split(line)
+    return [part.strip(" ,|()[]-–—\t") for part in parts if part.strip(" ,|()[]-–—\t")]
+
+
+def _split_location(text: str) -> Tuple[str, Optional[str]]:
+    """
+    ("Google", "Mountain View, CA") for "Google, Mountain View, CA"
+    """
+    match = TRAILING_LOCATION.search(text)
+    if match is None or match.start() == 0 or SCHOOL.search(match.group("location")):
+        return text, None
+    return text[:match.start()].rstrip(), match.group("location")
+
+
+def _group_entries(lines: List[str]) -> Tuple[List[Tuple[List[str], List[str]]], bool, List[int]]:
+    """
+    [(header lines, bullets)] per entry, whether the section used bullet markers, and
+    the index of the line each entry starts on
+    """
+    has_markers = any(BULLET.match(line) for line in lines)
+    entries: List[Tuple[List[str], List[str]]] = []
+    starts: List[int] = []
+    header: List[str] = []
+    bullets: List[str] = []
+
+    def flush():
+        if header or bullets:
+            entries.append((header[:], bullets[:]))
+        header.clear()
+        bullets.clear()
+
+    for index, line in enumerate(lines):
+        if BULLET.match(line):
+            if not header and not bullets:
+                starts.append(index)
+            bullets.append(_strip_bullet(line))
+            continue
+        if bullets and (line[:1].islower() or (line[:1].isdigit() and not DATE_RANGE.search(line))):
+            bullets[-1] = f"{bullets[-1]} {line}"  # wrapped bullet
+            continue
+        header_dated = any(DATE_RANGE.search(item) for item in header)
+        # A short line right before a dated one is the next entry's title, not a bullet
+        next_dated = (
+            len(line.split()) <= 6 and index + 1 < len(lines)
+            and DATE_RANGE.search(lines[index + 1]) and not BULLET.match(lines[index + 1])
+        )
+        if not has_markers and header_dated and not DATE_RANGE.search(line) and not next_dated:
+            # Unmarked bullets: anything after a dated header that doesn't open a new entry
+            bullets.append(line)
+            continue
+        if bullets or (header_dated and DATE_RANGE.search(line)) or len(header) >= 3:
+            flush()
+        if not header:
+            starts.append(index)
+        header.append(line)
+    flush()
+    return entries, has_markers, starts
+
+
+def _is_title(part: str) -> bool:
+    return bool({word.strip(".,()").lower() for word in part.split()} & TITLE_WORDS)
+
+
+def parse_experience(lines: List[str]) -> Tuple[List[dict], float]:
+    entries, has_markers, _ = _group_entries(lines)
+    jobs, scores = [], []
+    for header, bullets in entries:
+        duration, location, parts = "", None, []
+        for line in header:
+            match = DATE_RANGE.search(line)
+            if match and not duration:
+                duration = _format_range(match)
+                line = line[:match.start()] + " | " + line[match.end():]
+            for segment in _split_entry_line(line):
+                segment, trailing = _split_location(segment)
+                if trailing and location is None:
+                    location = trailing
+                if location is None and LOCATION.match(segment) and not _is_title(segment) and "," in segment:
+                    location = segment
+                    continue
+                for part in _split_entry_line(segment, _COMMA_SPLIT):
+                    if location is None and LOCATION.match(part) and not _is_title(part):
+                        location = part
+                    else:
+                        parts.append(part)
+
+        titles = [part for part in parts if _is_title(part)]
+        others = [part for part in parts if not _is_title(part)]
+        score = 1.0
+        if len(titles) == 1 and others:
+            title, company = titles[0], others[0]
+        elif len(parts) >= 2:
+            # "Title - Company" is the common order, but only a guess: let the LLM check it
+            title, company = parts[0], parts[1]
+            score -= 0.45
+        else:
+            title, company = (parts[0] if parts else ""), ""
+        score -= 0.25 * sum(not value for value in (title, duration))
+        if not company:
+            score -= 0.45
+        if not bullets:
+            score -= 0.15
+        if len(parts) > 2:
+            score -= 0.2 * (len(parts) - 2)  # leftover header fragments we could not place
+        jobs.append({"title": title, "company": company, "duration": duration, "location": location, "bullets": bullets})
+        scores.append(max(score, 0.0))
+
+    if not jobs:
+        return [], 0.0
+    # One misread job is enough to need the LLM, however clean the others are
+    confidence = min(scores)
+    return jobs, confidence if has_markers else confidence * 0.85
+
+
+def parse_education(lines: List[str]) -> Tuple[List[dict], float]:
+    entries: List[dict] = []
+    current: Optional[dict] = None
+    guessed: Dict[int, int] = {}  # entry index -> fields filled from fragments that matched no pattern
+    for raw in lines:
+        line = _strip_bullet(raw)
+        gpa = GPA.search(line)
+        if gpa:
+            line = line[:gpa.start()] + line[gpa.end():]
+        match = DATE_RANGE.search(line)
+        if match:
+            year = match.group("end") if match.group("end").lower() not in ("present", "current", "now", "today") else "Present"
+            line = line[:match.start()] + line[match.end():]
+        else:
+            years = YEAR.findall(line)
+            year = years[-1] if years else ""
+            line = YEAR.sub("", line)
+        line, location = _split_location(line.strip(" ,"))
+        previous = None
+        for part in _split_entry_line(line, _EDUCATION_SPLIT):
+            is_degree = bool(DEGREE.search(part))
+            is_school = bool(SCHOOL.search(part)) and not is_degree
+            if current is None or (is_degree and current["degree"]) or (is_school and current["school"]):
+                current = {"degree": "", "school": "", "year": "", "gpa": None, "location": None}
+                entries.append(current)
+            if is_degree:
+                current["degree"], previous = part, "degree"
+            elif is_school:
+                current["school"], previous = part, "school"
+            elif previous == "degree":
+                current["degree"] = f"{current['degree']}, {part}"  # "B.S., Computer Science"
+            elif LOCATION.match(part) and current["school"]:
+                current["location"] = current["location"] or part
+            elif not current["school"]:
+                current["school"], previous = part, "school"
+                guessed[len(entries) - 1] = guessed.get(len(entries) - 1, 0) + 1
+            else:
+                # A fragment we could not place
+                guessed[len(entries) - 1] = guessed.get(len(entries) - 1, 0) + 1
+        if current is None:
+            continue
+        if location and not current["location"]:
+            current["location"] = location
+        if year and not current["year"]:
+            current["year"] = year
+        if gpa and not current["gpa"]:
+            current["gpa"] = gpa.group(1).replace(" ", "")
+
+    if not entries:
+        return [], 0.0
+    scores = [
+        1.0 - 0.3 * sum(not entry[key] for key in ("degree", "school", "year")) - 0.45 * guessed.get(index, 0)
+        for index, entry in enumerate(entries)
+    ]
+    return entries, max(sum(scores) / len(scores), 0.0)
+
+
+def parse_skills(lines: List[str]) -> Tuple[List[str], float]:
+    skills, seen = [], set()
+    for raw in lines:
+        line = _strip_bullet(raw)
+        label, colon, rest = line.partition(":")
+        if colon and len(label.split()) <= 3:
+            line = rest  # "Languages: Python, Go"
+        for item in _SKILL_SPLIT.split(line):
+            item = item.strip(" .")
+            if not item or len(item) > 40 or len(item.split()) > 5:
+                continue
+            if item.lower() not in seen:
+                seen.add(item.lower())
+                skills.append(item)
+    if not skills:
+        return [], 0.0
+    short = sum(len(skill.split()) <= 3 for skill in skills) / len(skills)
+    return skills, 0.9 if len(skills) >= 3 and short >= 0.7 else 0.6
+
+
+def parse_list(lines: List[str]) -> Tuple[List[str], float]:
+    items = [_strip_bullet(line) for line in lines if _strip_bullet(line)]
+    return items, 0.85 if items else 0.0
+
+
+def chunk_section(name: str, lines: List[str], max_chars: int) -> List[str]:
+    """
+    Section text in pieces of at most max_chars. Experience and education are only cut
+    where an entry starts, so a job never straddles two pieces; an entry longer than
+    the limit stays whole. Past half the limit, a piece also ends before any line whose
+    hash picks it as an anchor, so boundaries follow content rather than offsets and an
+    edit only changes the piece it falls in.
+    """
+    cuts = set(_group_entries(lines)[2]) if name in ("experience", "education") else None
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for index, line in enumerate(lines):
+        if current and (cuts is None or index in cuts):
+            anchor = size >= max_chars // 2 and zlib.crc32(line.encode("utf-8")) % 4 == 0
+            if anchor or size + len(line) > max_chars:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def parse_resume_text(text: str, blocks: Optional[Sequence] = None) -> HeuristicParse:
+    """
+    Parse extracted resume text into the Resume shape with per-field confidence
+    """
+    sections, found = split_sections(text, blocks)
+    header = sections.get("header", [])[:8]
+    contact, confidence = parse_contact(header, text, blocks)
+
+    data = dict(contact)
+    summary_lines = sections.get("summary")
+    data["summary"] = " ".join(summary_lines) if summary_lines else None
+    data["experience"], confidence["experience"] = parse_experience(sections.get("experience", []))
+    data["education"], confidence["education"] = parse_education(sections.get("education", []))
+    data["skills"], confidence["skills"] = parse_skills(sections.get("skills", []))
+    data["certifications"], confidence["certifications"] = parse_list(sections.get("certifications", []))
+    confidence["summary"] = 0.9 if data["summary"] and len(data["summary"].split()) >= 5 else 0.0
+
+    # A section with no heading is probably absent when the rest of the structure was
+    # recognised; core sections are worth a second look, optional ones are not
+    structured = found >= 2
+    for name, core in (("summary", False), ("experience", True), ("education", True), ("skills", True), ("certifications", False)):
+        if name not in sections:
+            confidence[name] = (0.75 if core else 0.9) if structured else 0.0
+
+    raw = {name: "\n".join(lines) for name, lines in sections.items() if lines}
+    return HeuristicParse(
+        data=data,
+        confidence={name: round(score, 2) for name, score in confidence.items()},
+        sections=raw,
+        headings_found=found
+    )
@@ -0,0 +1,56 @@
+import json
+from typing import Any, AsyncIterator, Callable, Optional
+from fastapi.responses import StreamingResponse
+from app.utils.partial_json import parse_partial_json
+
+
+def sse_event(data: Any, event: Optional[str] = None) -> str:
+    """
+    Format one server-sent event; non-string payloads are JSON encoded
+    """
+    payload = data if isinstance(data, str) else json.dumps(data)
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in (payload.splitlines() or [""]))
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def text_events(deltas: AsyncIterator[str], build_done: Callable[[str], dict]) -> AsyncIterator[str]:
+    """
+    Relay text deltas as `token` events, then a `done` event built from the full text
+    """
+    parts = []
+    try:
+        async for delta in deltas:
+            parts.append(delta)
+            yield sse_event({"delta": delta}, event="token")
+        yield sse_event(build_done("".join(parts)), event="done")
+    except Exception as e:
+        yield sse_event({"detail": str(e)}, event="error")
+
+
+async def json_events(deltas: AsyncIterator[str], build_done: Callable[[Any], dict]) -> AsyncIterator[str]:
+    """
+    Relay JSON deltas as `token` events plus a `partial` event whenever the parsed
+    prefix changes, then a `done` event built from the decoded document
+    """
+    buffer = ""
+    last_partial = None
+    try:
+        async for delta in deltas:
+            buffer += delta
+            yield sse_event({"delta": delta}, event="token")
+            partial = parse_partial_json(buffer)
+            if partial is not None and partial != last_partial:
+                last_partial = partial
+                yield sse_event(partial, event="partial")
+        yield sse_event(build_done(json.loads(buffer)), event="done")
+    except Exception as e:
+        yield sse_event({"detail": str(e)}, event="error")
@@ -0,0 +1,115 @@
+"""
+Registry of compiled PDF templates. A template is registered as a compile function
+that builds its styles, page geometry and section renderers; that runs once per
+process (on first use, or at startup via warm_templates) and each render only binds
+resume data to the resulting plan.
+
+Frames and page templates carry layout state while a document is being built, so
+a plan keeps their geometry and makes fresh ones per render, which is cheap; the
+style sheet, the expensive part, is shared.
+"""
+import threading
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, SimpleDocTemplate
+
+SectionRenderer = Callable[[Any, Dict[str, ParagraphStyle]], List]
+
+
+class UnknownTemplateError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class FrameSpec:
+    id: str
+    x: float
+    y: float
+    width: float
+    height: float
+    padding: Tuple[float, float, float, float] = (6, 6, 6, 6)  # left, right, top, bottom
+
+
+@dataclass(frozen=True)
+class TemplatePlan:
+    name: str
+    version: str  # bump whenever the template's output changes; rendered-PDF caches key on it
+    styles: Dict[str, ParagraphStyle]
+    sections: Tuple[SectionRenderer, ...]
+    pagesize: Tuple[float, float] = letter
+    margins: Dict[str, float] = field(default_factory=dict)
+    frames: Tuple[FrameSpec, ...] = ()  # none: a single frame inside the margins
+    on_page: Optional[Callable] = None
+    prepare: Optional[Callable[[Any], Any]] = None  # turns the caller's data into what the sections expect
+
+    def _document(self, buffer: BytesIO) -> BaseDocTemplate:
+        # invariant: no creation date or random document id, so the same data always
+        # renders the same bytes and a content-derived ETag is a strong one
+        if not self.frames:
+            return SimpleDocTemplate(buffer, pagesize=self.pagesize, invariant=1, **self.margins)
+        doc = BaseDocTemplate(buffer, pagesize=self.pagesize, invariant=1, **self.margins)
+        frames = [
+            Frame(
+                spec.x, spec.y, spec.width, spec.height,
+                leftPadding=spec.padding[0], rightPadding=spec.padding[1],
+                topPadding=spec.padding[2], bottomPadding=spec.padding[3],
+                id=spec.id
+            )
+            for spec in self.frames
+        ]
+        kwargs = {"onPage": self.on_page} if self.on_page else {}
+        doc.addPageTemplates([PageTemplate(id=self.name, frames=frames, **kwargs)])
+        return doc
+
+    def story(self, data: Any) -> List:
+        if self.prepare is not None:
+            data = self.prepare(data)
+        flowables: List = []
+        for render in self.sections:
+            flowables.extend(render(data, self.styles))
+        return flowables
+
+    def render(self, data: Any) -> bytes:
+        buffer = BytesIO()
+        self._document(buffer).build(self.story(data))
+        return buffer.getvalue()
+
+
+_BUILDERS: Dict[str, Callable[[], TemplatePlan]] = {}
+_PLANS: Dict[str, TemplatePlan] = {}
+_lock = threading.Lock()
+
+
+def register_template(name: str, compile_plan: Callable[[], TemplatePlan]) -> None:
+    _BUILDERS[name] = compile_plan
+    _PLANS.pop(name, None)
+
+
+def get_template(name: str) -> TemplatePlan:
+    """
+    Compiled plan for a template, compiling it on first use
+    """
+    plan = _PLANS.get(name)
+    if plan is not None:
+        return plan
+    if name not in _BUILDERS:
+        raise UnknownTemplateError(f"Unknown template: {name}")
+    with _lock:
+        if name not in _PLANS:
+            _PLANS[name] = _BUILDERS[name]()
+        return _PLANS[name]
+
+
+def template_names() -> List[str]:
+    return sorted(_BUILDERS)
+
+
+def warm_templates(names: Optional[Sequence[str]] = None) -> None:
+    """
+    Compile templates ahead of the first request
+    """
+    for name in names or template_names():
+        get_template(name)
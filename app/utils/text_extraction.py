@@ -0,0 +1,182 @@
+"""
+Document text extraction registry. Extractors run inside extraction worker
+processes, so they must be top-level (picklable) functions and import nothing
+from the app outside app.utils. A source is either the raw document bytes or a path to the
+file on disk.
+
+New formats (rtf, odt, ...) plug in with register_extractor():
+
+    register_extractor("odt", extract_odt, extensions=(".odt",),
+                       mime_types=("application/vnd.oasis.opendocument.text",))
+"""
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from app.utils.docx_reader import read_docx_text
+
+Source = Union[bytes, str]
+
+
+class UnsupportedFormatError(ValueError):
+    pass
+
+
+@dataclass
+class TextBlock:
+    """
+    A PyMuPDF text block with the layout hints needed to find section headings
+    """
+    page: int
+    bbox: Tuple[float, float, float, float]
+    text: str
+    font: str
+    size: float
+    bold: bool
+
+
+@dataclass
+class ExtractionResult:
+    text: str
+    pages: int = 1
+    blocks: List[TextBlock] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)  # stage -> milliseconds
+
+    def merge(self, other: "ExtractionResult") -> "ExtractionResult":
+        """
+        Append a later page range of the same document
+        """
+        timings = dict(self.timings)
+        for stage, ms in other.timings.items():
+            timings[stage] = timings.get(stage, 0.0) + ms
+        return ExtractionResult(
+            text=self.text + other.text,
+            pages=max(self.pages, other.pages),
+            blocks=self.blocks + other.blocks,
+            timings=timings
+        )
+
+
+@dataclass(frozen=True)
+class Extractor:
+    """
+    extract(source, start, stop, with_blocks) -> ExtractionResult. Paged extractors
+    honour the [start, stop) page range so long documents can be split across workers;
+    the others ignore it.
+    """
+    name: str
+    extract: Callable[[Source, int, Optional[int], bool], ExtractionResult]
+    paged: bool = False
+
+
+EXTRACTORS: Dict[str, Extractor] = {}
+_BY_EXTENSION: Dict[str, str] = {}
+_BY_MIME: Dict[str, str] = {}
+
+
+def register_extractor(name: str, extract: Callable, extensions=(), mime_types=(), paged: bool = False) -> None:
+    EXTRACTORS[name] = Extractor(name=name, extract=extract, paged=paged)
+    for extension in extensions:
+        _BY_EXTENSION[extension.lower()] = name
+    for mime_type in mime_types:
+        _BY_MIME[mime_type.lower()] = name
+
+
+def resolve_extractor(filename: str, content_type: Optional[str] = None) -> Extractor:
+    """
+    Pick an extractor by file extension, falling back to the declared MIME type
+    """
+    name = _BY_EXTENSION.get(Path(filename or "").suffix.lower())
+    if name is None and content_type:
+        name = _BY_MIME.get(content_type.split(";")[0].strip().lower())
+    if name is None:
+        raise UnsupportedFormatError("Unsupported file format")
+    return EXTRACTORS[name]
+
+
+def supported_extensions() -> Tuple[str, ...]:
+    return tuple(sorted(_BY_EXTENSION))
+
+
+@contextmanager
+def _timed(timings: Dict[str, float], stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - started) * 1000
+
+
+def _read_bytes(source: Source) -> bytes:
+    return source if isinstance(source, bytes) else Path(source).read_bytes()
+
+
+def _pdf_blocks(page, page_number: int, lines_out: List[str]) -> List[TextBlock]:
+    blocks = []
+    for block in page.get_text("dict")["blocks"]:
+        if block.get("type") != 0:  # skip images
+            continue
+        spans = [span for line in block["lines"] for span in line["spans"] if span["text"].strip()]
+        if not spans:
+            continue
+        lines = ["".join(span["text"] for span in line["spans"]) for line in block["lines"]]
+        lines_out.extend(line + "\n" for line in lines)
+        # The largest span names the block's style; headings are usually one span anyway
+        lead = max(spans, key=lambda span: span["size"])
+        blocks.append(TextBlock(
+            page=page_number,
+            bbox=tuple(round(value, 2) for value in block["bbox"]),
+            text="\n".join(lines).strip(),
+            font=lead["font"],
+            size=round(lead["size"], 2),
+            bold=bool(lead["flags"] & 16) or "bold" in lead["font"].lower()
+        ))
+    return blocks
+
+
+def extract_pdf(source: Source, start: int = 0, stop: Optional[int] = None, with_blocks: bool = False) -> ExtractionResult:
+    import fitz  # PyMuPDF
+    timings: Dict[str, float] = {}
+    with _timed(timings, "open"):
+        doc = fitz.open(stream=source, filetype="pdf") if isinstance(source, bytes) else fitz.open(source)
+    try:
+        page_count = doc.page_count
+        stop = page_count if stop is None else min(stop, page_count)
+        parts: List[str] = []
+        blocks: List[TextBlock] = []
+        with _timed(timings, "layout" if with_blocks else "text"):
+            for index in range(start, stop):
+                if with_blocks:
+                    blocks.extend(_pdf_blocks(doc[index], index, parts))
+                else:
+                    parts.append(doc[index].get_text())
+        return ExtractionResult(text="".join(parts), pages=page_count, blocks=blocks, timings=timings)
+    finally:
+        doc.close()
+
+
+def extract_docx(source: Source, start: int = 0, stop: Optional[int] = None, with_blocks: bool = False) -> ExtractionResult:
+    timings: Dict[str, float] = {}
+    # The reader streams the XML parts, so opening and reading are one stage
+    with _timed(timings, "text"):
+        text = read_docx_text(source)
+    return ExtractionResult(text=text, timings=timings)
+
+
+def extract_txt(source: Source, start: int = 0, stop: Optional[int] = None, with_blocks: bool = False) -> ExtractionResult:
+    timings: Dict[str, float] = {}
+    with _timed(timings, "open"):
+        data = _read_bytes(source)
+    with _timed(timings, "text"):
+        text = data.decode("utf-8")
+    return ExtractionResult(text=text, timings=timings)
+
+
+register_extractor("pdf", extract_pdf, extensions=(".pdf",), mime_types=("application/pdf",), paged=True)
+register_extractor(
+    "docx", extract_docx,
+    extensions=(".docx",),
+    mime_types=("application/vnd.openxmlformats-officedocument.wordprocessingml.document",)
+)
+register_extractor("txt", extract_txt, extensions=(".txt",), mime_types=("text/plain",))
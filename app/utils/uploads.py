@@ -0,0 +1,72 @@
+"""
+Streams uploaded files to disk in fixed-size chunks so memory per upload is bounded
+by the chunk size. The size cap is enforced while reading and the SHA-256 of the
+content is computed on the way through.
+"""
+import asyncio
+import hashlib
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Union
+from fastapi import UploadFile
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, max_size: int):
+        super().__init__(f"File exceeds the maximum upload size of {max_size} bytes")
+        self.max_size = max_size
+
+
+@dataclass
+class SpooledUpload:
+    filename: str
+    path: Path
+    size: int
+    sha256: str
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+
+def unique_upload_path(upload_dir: Union[str, Path], filename: str) -> Path:
+    """
+    Path under upload_dir that never collides with an earlier upload of the same name
+    """
+    safe_name = Path(filename or "upload").name
+    return Path(upload_dir) / f"{uuid.uuid4().hex}_{safe_name}"
+
+
+async def spool_upload(
+    file: UploadFile,
+    upload_dir: Union[str, Path],
+    max_size: int,
+    chunk_size: int = 1024 * 1024
+) -> SpooledUpload:
+    """
+    Copy an upload to a unique path, rejecting it as soon as it passes max_size
+    """
+    # Starlette knows the size up front for most multipart uploads
+    if file.size is not None and file.size > max_size:
+        raise UploadTooLarge(max_size)
+    
+    path = unique_upload_path(upload_dir, file.filename)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    
+    out: BinaryIO = await asyncio.to_thread(open, path, "wb")
+    try:
+        while chunk := await file.read(chunk_size):
+            size += len(chunk)
+            if size > max_size:
+                raise UploadTooLarge(max_size)
+            digest.update(chunk)
+            await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(out.close)
+        path.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(out.close)
+    
+    return SpooledUpload(filename=file.filename, path=path, size=size, sha256=digest.hexdigest())
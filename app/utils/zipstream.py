@@ -0,0 +1,55 @@
+"""
+ZIP archives written as a stream: each member is emitted as soon as it is added,
+so memory holds one member at a time however large the archive grows.
+"""
+import time
+import zipfile
+
+
+class _Sink:
+    """
+    Write-only, non-seekable target; zipfile then uses data descriptors instead of
+    seeking back to patch local headers
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ZipStream:
+    def __init__(self, compression: int = zipfile.ZIP_STORED):
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=compression, allowZip64=True)
+
+    def add(self, name: str, data: bytes) -> bytes:
+        """
+        Add a member and return the archive bytes it produced
+        """
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = self._zip.compression
+        self._zip.writestr(info, data)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """
+        Finish the archive and return the central directory
+        """
+        self._zip.close()
+        return self._sink.drain()
@@ -0,0 +1,24 @@
+"""
+Celery worker for the upload pipeline, used when UPLOAD_WORKER_BACKEND=celery:
+
+    celery -A app.worker worker --loglevel=info
+
+Uploads are spooled to UPLOAD_DIR by the API, so workers need the same disk or a
+shared volume.
+"""
+import asyncio
+from celery import Celery
+from app.core.config import settings
+from app.services.upload_pipeline import upload_pipeline
+
+celery_app = Celery("resumeagent", broker=settings.REDIS_URL, backend=settings.REDIS_URL)
+celery_app.conf.task_acks_late = True  # a job lost with its worker is redelivered
+celery_app.conf.worker_prefetch_multiplier = 1
+
+# One loop per worker process: the LLM client keeps pooled connections bound to it
+_loop = asyncio.new_event_loop()
+
+
+@celery_app.task(name="resumes.process_upload")
+def process_upload(job_id: str) -> None:
+    _loop.run_until_complete(upload_pipeline.run(job_id))
@@ -0,0 +1,74 @@
+"""
+DOCX extraction benchmark: python-docx paragraphs vs the streaming reader in
+app/utils/docx_reader.py, on speed and peak Python heap (tracemalloc).
+
+    python -m benchmarks.docx_extraction --paragraphs 400 --table-rows 30 --repeat 20
+"""
+import argparse
+import io
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict
+from docx import Document
+from app.utils.docx_reader import read_docx_text
+
+
+def build_sample_docx(paragraphs: int = 400, table_rows: int = 30) -> bytes:
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe | jane@example.com | +1 555 0100"
+    document.add_heading("Experience", level=1)
+    for number in range(paragraphs):
+        document.add_paragraph(f"Built service {number} with Python\tand FastAPI, cutting latency by {number % 90}%")
+    table = document.add_table(rows=table_rows, cols=3)
+    for row_number, row in enumerate(table.rows):
+        for col_number, cell in enumerate(row.cells):
+            cell.text = f"Skill {row_number}.{col_number}"
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def python_docx_text(data: bytes) -> str:
+    return "\n".join(paragraph.text for paragraph in Document(io.BytesIO(data)).paragraphs)
+
+
+def measure(extract: Callable[[bytes], str], data: bytes, repeat: int) -> Dict[str, float]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        text = extract(data)
+    mean_ms = (time.perf_counter() - started) * 1000 / repeat
+
+    tracemalloc.start()
+    extract(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"mean_ms": round(mean_ms, 3), "peak_kib": round(peak / 1024, 1), "chars": len(text)}
+
+
+def run_benchmark(paragraphs: int = 400, table_rows: int = 30, repeat: int = 20) -> dict:
+    data = build_sample_docx(paragraphs, table_rows)
+    baseline = measure(python_docx_text, data, repeat)
+    streaming = measure(read_docx_text, data, repeat)
+    return {
+        "document_kib": round(len(data) / 1024, 1),
+        "python_docx": baseline,
+        "streaming": streaming,
+        "speedup": round(baseline["mean_ms"] / streaming["mean_ms"], 2),
+        "memory_ratio": round(baseline["peak_kib"] / streaming["peak_kib"], 2),
+        # python-docx paragraphs never see the header or the table
+        "table_cells_captured": "Skill 0.0" in read_docx_text(data)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DOCX text extraction")
+    parser.add_argument("--paragraphs", type=int, default=400)
+    parser.add_argument("--table-rows", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.paragraphs, args.table_rows, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
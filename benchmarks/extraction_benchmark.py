@@ -0,0 +1,189 @@
+"""
+Extraction regression suite. Runs every registered extractor over the generated
+corpus (benchmarks/extraction_corpus.py) and reports pages/s, MB/s, peak RSS and
+text fidelity (token recall against the ground truth). Each extractor is measured
+in a fresh process so its peak RSS is its own. The run exits non-zero when any
+number crosses benchmarks/extraction_thresholds.json, so a slow library bump is
+caught before deploy.
+
+    python -m benchmarks.extraction_benchmark            # full corpus, checks thresholds
+    python -m benchmarks.extraction_benchmark --quick --json
+"""
+import argparse
+import json
+import multiprocessing
+import re
+import resource
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from app.utils.text_extraction import EXTRACTORS, resolve_extractor
+
+# Mirrors benchmarks.extraction_corpus.SIZES; the corpus module is imported lazily so
+# measuring processes don't carry the renderers (and the app's services) in their RSS
+SIZES = (1, 4, 12, 30, 80)
+
+THRESHOLDS_PATH = Path(__file__).with_name("extraction_thresholds.json")
+
+_WORD = re.compile(r"\w+")
+
+
+def token_recall(expected: str, actual: str) -> float:
+    """
+    Share of ground-truth word occurrences present in the extracted text
+    """
+    wanted = Counter(_WORD.findall(expected.lower()))
+    found = Counter(_WORD.findall(actual.lower()))
+    total = sum(wanted.values())
+    if not total:
+        return 1.0
+    return sum(min(count, found[word]) for word, count in wanted.items()) / total
+
+
+def measure_extractor(name: str, documents: List[dict], repeat: int = 3) -> dict:
+    """
+    Time one extractor over its documents. Meant to run in a fresh process; documents
+    are plain dicts (name, renderer, data, expected_text) for the same reason.
+    """
+    extract = EXTRACTORS[name].extract
+    extract(documents[0]["data"], 0, None, False)  # warm-up: lazy imports, font caches
+    rows = []
+    for document in documents:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            result = extract(document["data"], 0, None, False)
+        rows.append({
+            "document": document["name"],
+            "renderer": document["renderer"],
+            "pages": result.pages,
+            "bytes": len(document["data"]),
+            "seconds": (time.perf_counter() - started) / repeat,
+            "fidelity": round(token_recall(document["expected_text"], result.text), 4)
+        })
+    return {"rows": rows, "peak_rss_mb": peak_rss_mb()}
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process. ru_maxrss survives fork+exec, so it would
+    report the parent's peak; VmHWM belongs to this process image only.
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+
+def _summarize(measured: dict) -> dict:
+    rows = measured["rows"]
+    seconds = sum(row["seconds"] for row in rows) or 1e-9
+    pages = sum(row["pages"] for row in rows)
+    megabytes = sum(row["bytes"] for row in rows) / (1024 * 1024)
+    by_renderer = defaultdict(list)
+    for row in rows:
+        by_renderer[row["renderer"]].append(row)
+    return {
+        "documents": len(rows),
+        "pages": pages,
+        "pages_per_s": round(pages / seconds, 1),
+        "mb_per_s": round(megabytes / seconds, 2),
+        "peak_rss_mb": measured["peak_rss_mb"],
+        "fidelity": min(row["fidelity"] for row in rows),  # worst document
+        "mean_fidelity": round(sum(row["fidelity"] for row in rows) / len(rows), 4),
+        "by_renderer": {
+            renderer: {
+                "mean_fidelity": round(sum(row["fidelity"] for row in group) / len(group), 4),
+                "pages_per_s": round(sum(row["pages"] for row in group) / (sum(row["seconds"] for row in group) or 1e-9), 1)
+            }
+            for renderer, group in by_renderer.items()
+        },
+        "documents_detail": rows
+    }
+
+
+def run_benchmark(sizes: Sequence[int] = SIZES, repeat: int = 3, isolate: bool = True) -> dict:
+    from benchmarks.extraction_corpus import build_corpus
+    by_extractor: Dict[str, List[dict]] = defaultdict(list)
+    for document in build_corpus(sizes):
+        by_extractor[resolve_extractor(document.filename).name].append({
+            "name": document.name,
+            "renderer": document.renderer,
+            "data": document.data,
+            "expected_text": document.expected_text
+        })
+
+    report = {"sizes": list(sizes), "repeat": repeat, "extractors": {}}
+    for name, documents in sorted(by_extractor.items()):
+        if isolate:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                measured = pool.submit(measure_extractor, name, documents, repeat).result()
+        else:
+            measured = measure_extractor(name, documents, repeat)
+        report["extractors"][name] = _summarize(measured)
+    return report
+
+
+def load_thresholds(path: Optional[Path] = None) -> dict:
+    with open(path or THRESHOLDS_PATH) as handle:
+        return json.load(handle)
+
+
+def check_thresholds(report: dict, thresholds: dict) -> List[str]:
+    """
+    Human-readable list of regressions; empty when every extractor is within bounds
+    """
+    failures = []
+    for name, limits in thresholds.items():
+        stats = report["extractors"].get(name)
+        if stats is None:
+            continue
+        for key, limit in limits.items():
+            metric = key[4:]  # strip min_/max_
+            value = stats[metric]
+            if key.startswith("min_") and value < limit:
+                failures.append(f"{name}: {metric} {value} below {limit}")
+            elif key.startswith("max_") and value > limit:
+                failures.append(f"{name}: {metric} {value} above {limit}")
+    return failures
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{'extractor':<10}{'docs':>6}{'pages':>7}{'pages/s':>10}{'MB/s':>8}{'RSS MB':>8}{'fidelity':>10}"]
+    for name, stats in report["extractors"].items():
+        lines.append(
+            f"{name:<10}{stats['documents']:>6}{stats['pages']:>7}{stats['pages_per_s']:>10}"
+            f"{stats['mb_per_s']:>8}{stats['peak_rss_mb']:>8}{stats['fidelity']:>10}"
+        )
+        for renderer, row in stats["by_renderer"].items():
+            lines.append(f"  {renderer:<14}fidelity {row['mean_fidelity']:<8} pages/s {row['pages_per_s']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark document extraction against regression thresholds")
+    parser.add_argument("--quick", action="store_true", help="small corpus (1 and 12 entry resumes)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--thresholds", type=Path, default=THRESHOLDS_PATH)
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark((1, 12) if args.quick else SIZES, repeat=args.repeat)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    failures = check_thresholds(report, load_thresholds(args.thresholds))
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
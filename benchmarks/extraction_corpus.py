@@ -0,0 +1,184 @@
+"""
+Generated resume corpus for extraction benchmarks. Every resume is rendered as PDF
+three ways (a plain reportlab canvas, PDFService and SimranStylePDFGenerator), as
+DOCX with python-docx and as TXT, from one page up to many pages. Each document
+keeps the ground-truth text that all renderers print, so extraction fidelity can
+be scored.
+
+    python -m benchmarks.extraction_corpus --out /tmp/resume-corpus
+"""
+import argparse
+import asyncio
+import io
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+from docx import Document
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from app.models.resume_model import ResumeDB
+from app.schemas.resume import Resume
+from app.services.custom_pdf_generator import SimranStylePDFGenerator
+from app.services.pdf_service import PDFService
+
+# Number of experience entries per resume; four bullets each
+SIZES = (1, 4, 12, 30, 80)
+
+_TITLES = ["Software Engineer", "Backend Developer", "Data Engineer", "Platform Engineer", "ML Engineer"]
+_COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Systems"]
+_VERBS = ["Built", "Designed", "Migrated", "Optimized", "Automated", "Scaled", "Led"]
+_OBJECTS = [
+    "payment reconciliation service", "search indexing pipeline", "CI deployment workflow",
+    "customer analytics dashboard", "recommendation model serving layer", "event ingestion cluster"
+]
+_RESULTS = ["cutting latency by", "reducing cost by", "raising throughput by", "improving accuracy by"]
+_SKILLS = ["Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "Redis", "Kafka", "Terraform", "React", "Go"]
+
+
+@dataclass
+class CorpusDocument:
+    name: str
+    renderer: str
+    filename: str
+    data: bytes
+    expected_text: str  # content every renderer prints; the fidelity ground truth
+
+
+def sample_resume(entries: int, seed: int = 0) -> dict:
+    """
+    Deterministic resume in the app's parsed_data shape
+    """
+    rng = random.Random(seed * 1000 + entries)
+    experience = []
+    for index in range(entries):
+        experience.append({
+            "title": rng.choice(_TITLES),
+            "company": f"{rng.choice(_COMPANIES)} {index}",
+            "duration": f"{2000 + index % 20} - {2001 + index % 20}",
+            "bullets": [
+                f"{rng.choice(_VERBS)} the {rng.choice(_OBJECTS)} {rng.choice(_RESULTS)} {rng.randint(10, 90)} percent"
+                for _ in range(4)
+            ]
+        })
+    return {
+        "name": "Jordan Rivera",
+        "email": "jordan.rivera@example.com",
+        "phone": "+1 555 0100",
+        "summary": "Engineer focused on reliable backend systems and data platforms.",
+        "experience": experience,
+        "education": [{"degree": "BSc Computer Science", "school": "State University", "year": "2012"}],
+        "skills": rng.sample(_SKILLS, 6),
+        "certifications": []
+    }
+
+
+def expected_text(data: dict) -> str:
+    parts = [data["name"], data["email"]]
+    for job in data["experience"]:
+        parts.extend([job["title"], job["company"], *job["bullets"]])
+    for school in data["education"]:
+        parts.extend([school["degree"], school["school"]])
+    parts.extend(data["skills"])
+    return "\n".join(parts)
+
+
+def _plain_lines(data: dict) -> List[str]:
+    lines = [data["name"], f'{data["email"]} | {data["phone"]}', "", "SUMMARY", data["summary"], "", "EXPERIENCE"]
+    for job in data["experience"]:
+        lines.append(f'{job["title"]} - {job["company"]} ({job["duration"]})')
+        lines.extend(f"- {bullet}" for bullet in job["bullets"])
+    lines.extend(["", "EDUCATION"])
+    lines.extend(f'{school["degree"]}, {school["school"]} {school["year"]}' for school in data["education"])
+    lines.extend(["", "SKILLS", ", ".join(data["skills"])])
+    return lines
+
+
+def render_reportlab(data: dict) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    y = 740
+    for line in _plain_lines(data):
+        if y < 60:
+            pdf.showPage()
+            y = 740
+        pdf.setFont("Helvetica-Bold" if line.isupper() else "Helvetica", 12 if line.isupper() else 10)
+        pdf.drawString(60, y, line)
+        y -= 14
+    pdf.save()
+    return buffer.getvalue()
+
+
+def render_pdf_service(data: dict) -> bytes:
+    resume = ResumeDB(parsed_data=data)
+    return asyncio.run(PDFService().generate_pdf(resume))
+
+
+def render_simran(data: dict) -> bytes:
+    return SimranStylePDFGenerator().generate_resume_pdf(Resume(**data))
+
+
+def render_docx(data: dict) -> bytes:
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = f'{data["email"]} | {data["phone"]}'
+    document.add_heading(data["name"], level=0)
+    document.add_paragraph(data["summary"])
+    document.add_heading("Experience", level=1)
+    for job in data["experience"]:
+        document.add_paragraph(f'{job["title"]} - {job["company"]} ({job["duration"]})')
+        for bullet in job["bullets"]:
+            document.add_paragraph(bullet, style="List Bullet")
+    document.add_heading("Education", level=1)
+    for school in data["education"]:
+        document.add_paragraph(f'{school["degree"]}, {school["school"]} {school["year"]}')
+    # Skills in a table, the way many resume templates lay them out
+    document.add_heading("Skills", level=1)
+    table = document.add_table(rows=2, cols=3)
+    for cell, skill in zip(table._cells, data["skills"]):
+        cell.text = skill
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def render_txt(data: dict) -> bytes:
+    return "\n".join(_plain_lines(data)).encode("utf-8")
+
+
+RENDERERS: Dict[str, Callable[[dict], bytes]] = {
+    "reportlab": render_reportlab,
+    "pdf_service": render_pdf_service,
+    "simran": render_simran,
+    "docx": render_docx,
+    "txt": render_txt
+}
+_EXTENSIONS = {"docx": ".docx", "txt": ".txt"}
+
+
+def build_corpus(sizes: Sequence[int] = SIZES, renderers: Sequence[str] = tuple(RENDERERS), seed: int = 0) -> List[CorpusDocument]:
+    corpus = []
+    for entries in sizes:
+        data = sample_resume(entries, seed)
+        truth = expected_text(data)
+        for renderer in renderers:
+            name = f"{renderer}-{entries:02d}"
+            filename = name + _EXTENSIONS.get(renderer, ".pdf")
+            corpus.append(CorpusDocument(name, renderer, filename, RENDERERS[renderer](data), truth))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the generated resume corpus to a directory")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    for document in build_corpus(args.sizes):
+        (out / document.filename).write_bytes(document.data)
+        print(f"{document.filename}\t{len(document.data)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+OpenAI-compatible stand-in for the chat completions API, for load testing without tokens or network.
+
+    python -m benchmarks.llm_stub_server --port 8100 --latency lognormal:-0.7,0.4 --error-rate 0.02
+
+Point the API at it with OPENAI_BASE_URL=http://localhost:8100/v1. Responses are canned JSON
+chosen from the system prompt of each request (parse, analysis, optimize, update plan, match,
+batched match, career paths, cover letter).
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from typing import Callable, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CANNED_PARSE = {
+    "name": "Jordan Avery",
+    "email": "jordan.avery@example.com",
+    "phone": "+1 555 010 2030",
+    "location": "Austin, TX",
+    "summary": "Backend engineer with 6 years building Python APIs and data pipelines.",
+    "experience": [
+        {
+            "title": "Senior Software Engineer",
+            "company": "Northwind Labs",
+            "duration": "2021 - Present",
+            "location": "Remote",
+            "bullets": ["Built FastAPI services handling 2k rps", "Cut p95 latency by 40% with caching"]
+        },
+        {
+            "title": "Software Engineer",
+            "company": "Contoso Data",
+            "duration": "2018 - 2021",
+            "location": "Austin, TX",
+            "bullets": ["Maintained ETL pipelines in Airflow", "Introduced typed Python across 30 repos"]
+        }
+    ],
+    "education": [{"degree": "BSc Computer Science", "school": "UT Austin", "year": "2018", "gpa": "3.7", "location": "Austin, TX"}],
+    "skills": ["Python", "FastAPI", "PostgreSQL", "Redis", "Docker", "AWS"],
+    "certifications": ["AWS Certified Developer"]
+}
+
+CANNED_ANALYSIS = {
+    "strengths": ["Quantified impact", "Clear progression", "Relevant stack"],
+    "improvements": ["Add a projects section", "Tighten the summary"],
+    "ats_score": 82,
+    "keywords": ["microservices", "CI/CD", "Kubernetes"],
+    "formatting_tips": ["Use consistent date formats"]
+}
+
+CANNED_OPTIMIZE = {
+    "tailored_summary": "Backend engineer focused on high-throughput Python APIs.",
+    "skills_to_emphasize": ["Python", "FastAPI", "PostgreSQL"],
+    "experience_updates": ["Lead with the latency reduction bullet"],
+    "keywords_to_add": ["observability", "SLOs"],
+    "match_score": 78,
+    "recommendations": ["Mention on-call experience"]
+}
+
+CANNED_PLAN = {
+    "add_skills": ["Kubernetes"],
+    "add_projects": [{"title": "Load Harness", "company": "Personal", "duration": "2024", "bullets": ["Benchmarked an API offline"]}],
+    "update_experience": [{"company": "Northwind Labs", "title": "Senior Software Engineer", "bullets_to_add": ["Led the caching rollout"]}]
+}
+
+CANNED_MATCH = {
+    "match_score": 74,
+    "matching_skills": ["Python", "PostgreSQL"],
+    "missing_skills": ["Go"],
+    "experience_score": 80,
+    "strengths": ["API design"],
+    "gaps": ["No Go experience"],
+    "recommendation": "apply"
+}
+
+CANNED_CAREER = {
+    "current_level": "senior",
+    "suggested_roles": ["Staff Engineer", "Engineering Manager"],
+    "skills_to_develop": ["System design", "Mentoring"],
+    "industries": ["Fintech", "Developer tools"],
+    "career_pivots": ["Developer advocacy"]
+}
+
+CANNED_COVER_LETTER = (
+    "Dear Hiring Manager,\n\nI am excited to apply for this role. Over six years I have built fast, "
+    "reliable Python services.\n\nI would welcome the chance to discuss how I can help your team.\n\n"
+    "Sincerely,\nJordan Avery"
+)
+
+
+def canned_content(system_prompt: str, prompt: str) -> str:
+    """
+    Pick a canned completion for the prompt type, identified by its system prompt
+    """
+    system = system_prompt.lower()
+    if "cover letter" in system:
+        return CANNED_COVER_LETTER
+    if "recruitment" in system:
+        refs = re.findall(r"\[(J\d+)\]", prompt)
+        if refs:
+            return json.dumps({"results": [dict(CANNED_MATCH, job_ref=ref) for ref in refs]})
+        return json.dumps(CANNED_MATCH)
+    if "parsing" in system:
+        return json.dumps(CANNED_PARSE)
+    if "analyst" in system:
+        return json.dumps(CANNED_ANALYSIS)
+    if "career coach" in system:
+        return json.dumps(CANNED_OPTIMIZE)
+    if "updater" in system:
+        return json.dumps(CANNED_PLAN)
+    if "counselor" in system:
+        return json.dumps(CANNED_CAREER)
+    return json.dumps({})
+
+
+def latency_sampler(spec: str, rng: random.Random) -> Callable[[], float]:
+    """
+    Build a latency sampler (seconds) from a spec: fixed:S, uniform:LO,HI, normal:MEAN,STD or lognormal:MU,SIGMA
+    """
+    kind, _, args = spec.partition(":")
+    params = [float(value) for value in args.split(",") if value]
+    if kind == "fixed":
+        return lambda: params[0] if params else 0.0
+    if kind == "uniform":
+        return lambda: rng.uniform(params[0], params[1])
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(params[0], params[1]))
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(params[0], params[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, (len(text) + 3) // 4)
+
+
+def create_stub_app(
+    latency: str = "fixed:0.05",
+    error_rate: float = 0.0,
+    server_error_rate: float = 0.0,
+    retry_after: float = 1.0,
+    chunk_size: int = 16,
+    seed: Optional[int] = None
+) -> FastAPI:
+    """
+    Build the stub app. `error_rate` is the share of requests answered with 429 (with
+    Retry-After), `server_error_rate` the share answered with 500.
+    """
+    rng = random.Random(seed)
+    sample_latency = latency_sampler(latency, rng)
+    app = FastAPI(title="LLM Stub Server")
+    app.state.stats = {"requests": 0, "rate_limited": 0, "server_errors": 0}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.stats["requests"] += 1
+        messages = body.get("messages", [])
+        system_prompt = next((m["content"] for m in messages if m["role"] == "system"), "")
+        prompt = next((m["content"] for m in messages if m["role"] == "user"), "")
+        
+        roll = rng.random()
+        if roll < error_rate:
+            app.state.stats["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit reached (stub)", "type": "rate_limit_error"}},
+                headers={"retry-after": str(retry_after)}
+            )
+        if roll < error_rate + server_error_rate:
+            app.state.stats["server_errors"] += 1
+            return JSONResponse(status_code=500, content={"error": {"message": "Internal error (stub)", "type": "server_error"}})
+        
+        content = canned_content(system_prompt, prompt)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        model = body.get("model", "gpt-4o-mini")
+        delay = sample_latency()
+        
+        if body.get("stream"):
+            async def events():
+                pieces = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+                for index, piece in enumerate(pieces):
+                    await asyncio.sleep(delay / max(1, len(pieces)))
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{
+                            "index": 0,
+                            "delta": {"role": "assistant", "content": piece} if index == 0 else {"content": piece},
+                            "finish_reason": None
+                        }]
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                done = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+                }
+                yield f"data: {json.dumps(done)}\n\n"
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(events(), media_type="text/event-stream")
+        
+        await asyncio.sleep(delay)
+        prompt_tokens = sum(_estimate_tokens(m.get("content", "")) for m in messages)
+        completion_tokens = _estimate_tokens(content)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    @app.get("/stats")
+    async def stats():
+        return app.state.stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server for offline load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="fixed:0.05", help="fixed:S | uniform:LO,HI | normal:MEAN,STD | lognormal:MU,SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--server-error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    
+    import uvicorn
+    uvicorn.run(
+        create_stub_app(args.latency, args.error_rate, args.server_error_rate, args.retry_after, seed=args.seed),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
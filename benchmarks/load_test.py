@@ -0,0 +1,235 @@
+"""
+End-to-end load harness for the resume API.
+
+Each virtual user repeatedly runs upload -> analyze -> generate-pdf -> update-smart and the
+harness reports p50/p95/p99 latency and requests per second per endpoint.
+
+    # Everything in one process, LLM calls answered by the stub server (no network, no tokens)
+    python -m benchmarks.load_test --concurrency 20 --iterations 200 --latency lognormal:-1.6,0.5
+
+    # Against a running deployment (start it with OPENAI_BASE_URL pointing at llm_stub_server)
+    python -m benchmarks.load_test --base-url http://localhost:8000 --concurrency 20 --iterations 200
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import time
+import uuid
+from typing import Dict, List, Optional
+import httpx
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from benchmarks.llm_stub_server import CANNED_PARSE, create_stub_app
+
+ENDPOINTS = ("upload", "analyze", "generate-pdf", "update-smart")
+
+
+def build_sample_resume_pdf(nonce: str = "") -> bytes:
+    """
+    One-page text PDF resume; `nonce` makes each document (and its prompt) unique
+    """
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    lines = [
+        CANNED_PARSE["name"],
+        f"{CANNED_PARSE['email']} | {CANNED_PARSE['phone']} | {CANNED_PARSE['location']}",
+        "",
+        "SUMMARY",
+        CANNED_PARSE["summary"],
+        "",
+        "EXPERIENCE",
+    ]
+    for job in CANNED_PARSE["experience"]:
+        lines.append(f"{job['title']} - {job['company']} ({job['duration']})")
+        lines.extend(f"  - {bullet}" for bullet in job["bullets"])
+    lines += ["", "SKILLS", ", ".join(CANNED_PARSE["skills"]), "", f"Ref: {nonce}"]
+    
+    y = 740
+    for line in lines:
+        pdf.drawString(72, y, line)
+        y -= 16
+    pdf.save()
+    return buffer.getvalue()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {name: [] for name in ENDPOINTS}
+        self.errors: Dict[str, int] = {name: 0 for name in ENDPOINTS}
+        self.status_codes: Dict[int, int] = {}
+
+    def record(self, endpoint: str, elapsed: float, status_code: int) -> None:
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+        if status_code >= 400:
+            self.errors[endpoint] += 1
+        else:
+            self.latencies[endpoint].append(elapsed)
+
+    def summary(self, duration: float) -> dict:
+        def describe(values: List[float], errors: int) -> dict:
+            values = sorted(values)
+            return {
+                "count": len(values),
+                "errors": errors,
+                "rps": round(len(values) / duration, 2) if duration else 0.0,
+                "mean_ms": round(1000 * sum(values) / len(values), 2) if values else 0.0,
+                "p50_ms": round(1000 * percentile(values, 50), 2),
+                "p95_ms": round(1000 * percentile(values, 95), 2),
+                "p99_ms": round(1000 * percentile(values, 99), 2)
+            }
+        
+        all_latencies = [value for values in self.latencies.values() for value in values]
+        return {
+            "duration_seconds": round(duration, 3),
+            "overall": describe(all_latencies, sum(self.errors.values())),
+            "endpoints": {name: describe(self.latencies[name], self.errors[name]) for name in ENDPOINTS},
+            "status_codes": {str(code): count for code, count in sorted(self.status_codes.items())}
+        }
+
+
+async def _authenticate(client: httpx.AsyncClient, api_prefix: str) -> Dict[str, str]:
+    email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+    password = "load-test-password"
+    await client.post(f"{api_prefix}/signup", json={"email": email, "password": password, "full_name": "Load Test"})
+    response = await client.post(f"{api_prefix}/login/access-token", data={"username": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_load_test(
+    client: httpx.AsyncClient,
+    concurrency: int,
+    iterations: int,
+    api_prefix: str = "/api/v1",
+    unique_documents: bool = True
+) -> dict:
+    """
+    Drive `iterations` full scenarios through `client` with `concurrency` virtual users
+    """
+    headers = await _authenticate(client, api_prefix)
+    shared_pdf = build_sample_resume_pdf()
+    stats = LoadStats()
+    remaining = iterations
+    
+    async def timed(endpoint: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            stats.record(endpoint, time.perf_counter() - started, 599)
+            return None
+        stats.record(endpoint, time.perf_counter() - started, response.status_code)
+        return response
+    
+    async def scenario(iteration: int) -> None:
+        pdf = build_sample_resume_pdf(f"{iteration}-{uuid.uuid4().hex[:8]}") if unique_documents else shared_pdf
+        response = await timed(
+            "upload", "POST", f"{api_prefix}/resumes/upload",
+            files={"file": (f"resume_{iteration}.pdf", pdf, "application/pdf")}
+        )
+        if response is None or response.status_code >= 400:
+            return
+        resume_id = response.json()["id"]
+        await timed("analyze", "POST", f"{api_prefix}/resumes/{resume_id}/analyze")
+        await timed("generate-pdf", "POST", f"{api_prefix}/resumes/{resume_id}/generate-pdf")
+        await timed(
+            "update-smart", "POST", f"{api_prefix}/resumes/{resume_id}/update-smart",
+            json={"update_text": "I recently learned Kubernetes and built a load testing harness."}
+        )
+    
+    async def virtual_user() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await scenario(iterations - remaining)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*[virtual_user() for _ in range(concurrency)])
+    report = stats.summary(time.perf_counter() - started)
+    report.update({"concurrency": concurrency, "iterations": iterations})
+    return report
+
+
+async def run_in_process(
+    concurrency: int,
+    iterations: int,
+    latency: str = "fixed:0.05",
+    error_rate: float = 0.0,
+    server_error_rate: float = 0.0,
+    seed: Optional[int] = None,
+    unique_documents: bool = True
+) -> dict:
+    """
+    Run the API and the LLM stub in this process, connected through ASGI transports
+    """
+    from app.main import app
+    from app.services import llm_gateway
+    
+    stub = create_stub_app(latency, error_rate, server_error_rate, retry_after=0.05, seed=seed)
+    await llm_gateway.use_http_client(
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=stub), base_url="http://llm-stub")
+    )
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api", timeout=None) as client:
+            report = await run_load_test(client, concurrency, iterations, unique_documents=unique_documents)
+    finally:
+        await llm_gateway.close_client()
+    report["stub"] = dict(stub.state.stats)
+    report["llm"] = llm_gateway.metrics()
+    return report
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"concurrency={report['concurrency']} iterations={report['iterations']} duration={report['duration_seconds']}s",
+        f"{'endpoint':<14}{'count':>7}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    ]
+    rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+    for name, row in rows:
+        lines.append(
+            f"{name:<14}{row['count']:>7}{row['errors']:>8}{row['rps']:>9}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test upload/analyze/generate-pdf/update-smart")
+    parser.add_argument("--base-url", help="target a running API; without it the API and the LLM stub run in this process")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--latency", default="fixed:0.05", help="stub latency distribution (without --base-url only)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="stub 429 share (without --base-url only)")
+    parser.add_argument("--server-error-rate", type=float, default=0.0, help="stub 500 share (without --base-url only)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--same-document", action="store_true", help="upload one document repeatedly (exercises caches)")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+    
+    if args.base_url:
+        async def remote():
+            async with httpx.AsyncClient(base_url=args.base_url, timeout=None) as client:
+                return await run_load_test(client, args.concurrency, args.iterations, unique_documents=not args.same_document)
+        report = asyncio.run(remote())
+    else:
+        report = asyncio.run(run_in_process(
+            args.concurrency, args.iterations, args.latency, args.error_rate, args.server_error_rate,
+            seed=args.seed, unique_documents=not args.same_document
+        ))
+    
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import asyncio
+import io
+import json
+import zipfile
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from app.api import deps
+from app.core.config import settings
+from app.core.database import get_db
+from app.main import app
+from app.models.resume_model import ResumeDB
+from app.models.user import User
+from app.services.bulk_export import BulkExporter
+from app.services.render_cache import RenderCache
+from app.services.render_executor import RenderExecutor
+
+client = TestClient(app)
+
+FULL = {"name": "Jane Doe", "email": "jane@example.com", "phone": "555-0100", "skills": ["Python"]}
+PARTIAL = {"name": "John Roe", "skills": ["Go"]}  # no email or phone: the simran template rejects it
+
+
+@pytest.mark.asyncio
+async def test_export_streams_files_as_they_finish_and_cancels_on_close():
+    exporter = BulkExporter(max_in_flight=2)
+    started = []
+    running = 0
+    peak = 0
+
+    async def render(resume, template):
+        nonlocal running, peak
+        started.append(resume.id)
+        running += 1
+        peak = max(peak, running)
+        try:
+            await asyncio.sleep(0.01)
+            return f"resume_{resume.id}_{template}.pdf", b"%PDF", None
+        finally:
+            running -= 1
+
+    resumes = [ResumeDB(id=number, parsed_data=FULL) for number in range(20)]
+    with patch.object(exporter, "_render", render):
+        stream = exporter.stream(resumes, ["tech"])
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+
+    assert first.startswith(b"PK")
+    assert peak == 2
+    assert len(started) < len(resumes)
+    assert running == 0
+    assert exporter.stats()["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_running_and_unwritten_renders_stay_within_the_cap():
+    exporter = BulkExporter(max_in_flight=3)
+    started = 0
+
+    async def finish(resume, template):
+        await asyncio.sleep(0.01)  # every render in a wave finishes together
+        return f"resume_{resume.id}_{template}.pdf", b"%PDF", None
+
+    def render(resume, template):
+        # Counted when the task is created, not when it first gets scheduled
+        nonlocal started
+        started += 1
+        return finish(resume, template)
+
+    written = peak = 0
+    with patch.object(exporter, "_render", render):
+        async for _ in exporter.stream([ResumeDB(id=number, parsed_data=FULL) for number in range(9)], ["tech"]):
+            peak = max(peak, started - written)
+            written += 1
+
+    assert written == 10  # nine files and the central directory
+    assert peak == 3
+
+
+def test_export_endpoint_returns_a_zip_with_errors_listed():
+    resumes = [ResumeDB(id=1, user_id=1, parsed_data=FULL), ResumeDB(id=2, user_id=1, parsed_data=PARTIAL)]
+    app.dependency_overrides[deps.get_current_user] = lambda: User(id=1, email="jane@example.com", is_superuser=False)
+    app.dependency_overrides[get_db] = lambda: None
+    try:
+        with patch("app.services.resume_service.resume_service.get_resumes_by_ids", AsyncMock(return_value=resumes)) as lookup, \
+                patch("app.services.pdf_service.render_cache", RenderCache()), \
+                patch("app.services.custom_pdf_generator.render_cache", RenderCache()), \
+                patch("app.services.render_cache.render_executor", RenderExecutor(max_workers=0)):
+            response = client.post(
+                f"{settings.API_V1_STR}/resumes/export",
+                json={"resume_ids": [1, 2, 1], "templates": ["tech", "simran"]}
+            )
+            unknown = client.post(f"{settings.API_V1_STR}/resumes/export", json={"resume_ids": [1], "templates": ["nope"]})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert lookup.await_args.args[1:] == ([1, 2], 1)
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.testzip() is None
+    names = set(archive.namelist())
+    assert names == {"resume_1_tech.pdf", "resume_1_simran.pdf", "resume_2_tech.pdf", "errors.json"}
+    assert all(archive.read(name).startswith(b"%PDF") for name in names - {"errors.json"})
+    assert [error["file"] for error in json.loads(archive.read("errors.json"))] == ["resume_2_simran.pdf"]
+    assert unknown.status_code == 400
@@ -0,0 +1,83 @@
+import io
+import zipfile
+import pytest
+from docx import Document
+from app.utils.docx_reader import read_docx_text
+from benchmarks.docx_extraction import run_benchmark
+
+NS = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"'
+)
+
+
+def _docx(body: str, header: str = "") -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", f'<w:document {NS}><w:body>{body}</w:body></w:document>')
+        if header:
+            archive.writestr("word/header1.xml", f'<w:hdr {NS}>{header}</w:hdr>')
+            archive.writestr("word/header2.xml", f'<w:hdr {NS}>{header}</w:hdr>')
+    return buffer.getvalue()
+
+
+def _p(text: str) -> str:
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def test_reads_tables_text_boxes_and_headers():
+    text_box = (
+        "<w:p><w:r><mc:AlternateContent>"
+        f"<mc:Choice><w:drawing><wps:txbx><w:txbxContent>{_p('Skills: Python, Go')}</w:txbxContent></wps:txbx></w:drawing></mc:Choice>"
+        f"<mc:Fallback><w:pict><v:textbox><w:txbxContent>{_p('Skills: Python, Go')}</w:txbxContent></v:textbox></w:pict></mc:Fallback>"
+        "</mc:AlternateContent></w:r></w:p>"
+    )
+    table = (
+        "<w:tbl>"
+        f"<w:tr><w:tc>{_p('Company')}</w:tc><w:tc>{_p('Role')}</w:tc></w:tr>"
+        f"<w:tr><w:tc>{_p('Acme')}{_p('(remote)')}</w:tc><w:tc>{_p('Engineer')}</w:tc></w:tr>"
+        "</w:tbl>"
+    )
+    styled = (
+        '<w:p><w:pPr><w:tabs><w:tab w:val="right" w:pos="9000"/></w:tabs></w:pPr>'
+        "<w:r><w:t>2020</w:t><w:tab/><w:t>2024</w:t></w:r>"
+        '<w:hyperlink><w:r><w:t xml:space="preserve"> github.com/jane</w:t></w:r></w:hyperlink></w:p>'
+    )
+    data = _docx(_p("Experience") + table + text_box + styled, header=_p("Jane Doe"))
+
+    assert read_docx_text(data).split("\n") == [
+        "Jane Doe",
+        "Experience",
+        "Company | Role",
+        "Acme (remote) | Engineer",
+        "Skills: Python, Go",
+        "",
+        "2020\t2024 github.com/jane",
+    ]
+
+
+def test_matches_python_docx_on_plain_paragraphs():
+    document = Document()
+    document.add_paragraph("Jane Doe")
+    document.add_paragraph("")
+    document.add_paragraph("Python\tFastAPI").add_run().add_break()
+    buffer = io.BytesIO()
+    document.save(buffer)
+    data = buffer.getvalue()
+
+    expected = "\n".join(paragraph.text for paragraph in Document(io.BytesIO(data)).paragraphs)
+    assert read_docx_text(data) == expected
+
+
+def test_benchmark_captures_table_cells_python_docx_misses():
+    report = run_benchmark(paragraphs=20, table_rows=5, repeat=1)
+    assert report["table_cells_captured"]
+
+
+@pytest.mark.benchmark
+def test_faster_and_smaller_than_python_docx():
+    report = run_benchmark(paragraphs=200, table_rows=10, repeat=3)
+    assert report["speedup"] > 2
+    assert report["memory_ratio"] > 2
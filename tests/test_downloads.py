@@ -0,0 +1,77 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from app.api import deps
+from app.core.config import settings
+from app.core.database import get_db
+from app.main import app
+from app.models.resume_model import ResumeDB
+from app.models.user import User
+from app.services.render_cache import RenderCache
+from app.services.render_executor import RenderExecutor
+from app.utils.downloads import etag_matches, parse_range
+
+client = TestClient(app)
+
+RESUME = ResumeDB(id=3, user_id=1, parsed_data={"name": "Jane Doe", "email": "jane@example.com", "skills": ["Python"]})
+URL = f"{settings.API_V1_STR}/resumes/3/pdf"
+
+
+@pytest.fixture(autouse=True)
+def signed_in():
+    app.dependency_overrides[deps.get_current_user] = lambda: User(id=1, email="jane@example.com")
+    app.dependency_overrides[get_db] = lambda: None
+    with patch("app.services.resume_service.resume_service.get_resume", AsyncMock(return_value=RESUME)), \
+            patch("app.services.pdf_service.render_cache", RenderCache()), \
+            patch("app.services.render_cache.render_executor", RenderExecutor(max_workers=0)):
+        yield
+    app.dependency_overrides.clear()
+
+
+def test_parse_range_forms():
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    assert parse_range("items=0-1", 100) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=100-", 100)
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert not etag_matches('"abc"', '"def"')
+
+
+def test_pdf_download_is_binary_with_a_stable_etag():
+    response = client.get(URL)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["content-disposition"].startswith('attachment; filename="resume_3_tech.pdf"')
+    assert response.content.startswith(b"%PDF")
+    etag = response.headers["etag"]
+
+    with patch("app.services.pdf_service.pdf_service.generate_pdf", AsyncMock(side_effect=AssertionError("rendered"))):
+        revalidated = client.get(URL, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    # Same content renders the same bytes, so the ETag holds across renders
+    with patch("app.services.pdf_service.render_cache", RenderCache()):
+        assert client.get(URL).content == response.content
+
+
+def test_pdf_download_serves_byte_ranges():
+    full = client.get(URL).content
+    etag = client.get(URL).headers["etag"]
+
+    partial = client.get(URL, headers={"Range": "bytes=0-99"})
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 0-99/{len(full)}"
+    assert partial.content == full[:100]
+
+    tail = client.get(URL, headers={"Range": "bytes=100-", "If-Range": etag})
+    assert partial.content + tail.content == full
+
+    assert client.get(URL, headers={"Range": "bytes=0-99", "If-Range": '"stale"'}).status_code == 200
+    unsatisfiable = client.get(URL, headers={"Range": f"bytes={len(full)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(full)}"
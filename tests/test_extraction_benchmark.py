@@ -0,0 +1,41 @@
+import copy
+import pytest
+from benchmarks.extraction_benchmark import check_thresholds, load_thresholds, run_benchmark, token_recall
+from benchmarks.extraction_corpus import build_corpus
+
+
+def test_corpus_spans_formats_renderers_and_page_counts():
+    corpus = build_corpus(sizes=(1, 30))
+    assert {document.filename.rsplit(".", 1)[1] for document in corpus} == {"pdf", "docx", "txt"}
+    assert {document.renderer for document in corpus} == {"reportlab", "pdf_service", "simran", "docx", "txt"}
+    assert all(document.data for document in corpus)
+
+
+def test_token_recall_counts_missing_occurrences():
+    assert token_recall("Python Python Go", "python go python") == 1.0
+    assert token_recall("Python Python Go", "Python Go") == 2 / 3
+
+
+def test_quick_run_keeps_fidelity_and_flags_regressions():
+    report = run_benchmark(sizes=(1, 12), repeat=1)
+    thresholds = load_thresholds()
+    assert set(report["extractors"]) == {"pdf", "docx", "txt"}
+    assert report["extractors"]["pdf"]["pages"] > report["extractors"]["pdf"]["documents"]
+    # Throughput and memory depend on the machine; only fidelity is checked by default
+    fidelity = {name: {"min_fidelity": limits["min_fidelity"]} for name, limits in thresholds.items()}
+    assert check_thresholds(report, fidelity) == []
+
+    regressed = copy.deepcopy(report)
+    regressed["extractors"]["pdf"]["pages_per_s"] = 1.0
+    regressed["extractors"]["docx"]["fidelity"] = 0.5
+    limits = {"pdf": {"min_pages_per_s": thresholds["pdf"]["min_pages_per_s"]}, "docx": fidelity["docx"]}
+    assert check_thresholds(regressed, limits) == [
+        "pdf: pages_per_s 1.0 below 100",
+        "docx: fidelity 0.5 below 0.99",
+    ]
+
+
+@pytest.mark.benchmark
+def test_quick_run_meets_throughput_thresholds():
+    report = run_benchmark(sizes=(1, 12), repeat=1)
+    assert check_thresholds(report, load_thresholds()) == []
@@ -0,0 +1,99 @@
+import io
+import os
+import time
+import pytest
+from docx import Document
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from app.services.extraction_executor import (
+    ExtractionExecutor, ExtractionError, ExtractionTimeout, ExtractionTooLarge, extraction_status
+)
+from app.utils.text_extraction import UnsupportedFormatError, resolve_extractor
+
+
+def _pdf(pages: int) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for number in range(pages):
+        pdf.setFont("Helvetica-Bold", 16)
+        pdf.drawString(72, 720, "EXPERIENCE")
+        pdf.setFont("Helvetica", 10)
+        pdf.drawString(72, 600, f"Resume page {number}")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def executor():
+    executor = ExtractionExecutor(max_workers=2, timeout=30.0, max_pages=20, pages_per_task=3)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_long_pdf_is_split_across_workers_in_page_order(executor):
+    result = await executor.extract(_pdf(10), "resume.pdf")
+    positions = [result.text.index(f"Resume page {number}") for number in range(10)]
+    assert positions == sorted(positions)
+    assert result.pages == 10
+    assert {"open", "text", "total"} <= set(result.timings)
+    assert executor.stats()["pdf"]["documents"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pdf_blocks_carry_font_and_position(executor):
+    result = await executor.extract(_pdf(4), "resume.pdf", with_blocks=True)
+    headings = [block for block in result.blocks if block.text == "EXPERIENCE"]
+    body = [block for block in result.blocks if block.text.startswith("Resume page")]
+
+    assert [block.page for block in headings] == [0, 1, 2, 3]
+    assert headings[0].bold and headings[0].size == 16
+    assert not body[0].bold and body[0].size == 10
+    # PDF y grows downwards in PyMuPDF coordinates: the heading sits above the body
+    assert headings[0].bbox[1] < body[0].bbox[1]
+    assert "Resume page 3" in result.text
+
+
+@pytest.mark.asyncio
+async def test_page_cap_and_timeout_raise_extraction_error(executor):
+    with pytest.raises(ExtractionTooLarge, match="limit is 20") as too_large:
+        await executor.extract(_pdf(21), "resume.pdf")
+    with pytest.raises(ExtractionTimeout, match="timed out") as timed_out:
+        await executor.run(time.sleep, 5, timeout=0.5)
+    with pytest.raises(ExtractionError, match="Could not read") as unreadable:
+        await executor.extract(b"%PDF-1.4 truncated", "resume.pdf")
+    
+    assert [extraction_status(error.value) for error in (too_large, timed_out, unreadable)] == [413, 504, 422]
+
+
+def _crash():
+    os._exit(1)
+
+
+@pytest.mark.asyncio
+async def test_crashed_worker_pool_is_replaced(executor):
+    with pytest.raises(ExtractionError, match="crashed"):
+        await executor.run(_crash)
+    # Later uploads get a fresh pool instead of BrokenProcessPool forever
+    result = await executor.extract(_pdf(2), "resume.pdf")
+    assert result.pages == 2
+
+
+@pytest.mark.asyncio
+async def test_zero_workers_extracts_docx_inline():
+    document = Document()
+    document.add_paragraph("Jane Doe")
+    document.add_paragraph("Python, FastAPI")
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    result = await ExtractionExecutor(max_workers=0).extract(buffer.getvalue(), "resume.docx")
+    assert result.text == "Jane Doe\nPython, FastAPI"
+
+
+def test_registry_resolves_by_extension_then_mime_type():
+    assert resolve_extractor("CV.PDF").name == "pdf"
+    assert resolve_extractor("upload", "text/plain; charset=utf-8").name == "txt"
+    with pytest.raises(UnsupportedFormatError):
+        resolve_extractor("resume.rtf", "application/rtf")
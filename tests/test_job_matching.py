@@ -0,0 +1,147 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services import job_matching_service
+from app.services.job_matching_service import find_suitable_jobs, match_resume_to_jobs, plan_match_batches
+
+
+def _listings(n):
+    return [
+        {"id": str(i), "title": f"Engineer {i}", "company": "Acme", "description": f"job {i}"}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_find_suitable_jobs_scores_concurrently_and_ranks():
+    in_flight = 0
+    peak = 0
+    
+    async def fake_match(resume_data, job_description):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return {"match_score": int(job_description.split()[-1]) * 10}
+    
+    with patch.object(job_matching_service, "match_resume_to_job", side_effect=fake_match):
+        start = time.perf_counter()
+        results = await find_suitable_jobs({"name": "Jane"}, _listings(10), concurrency=4, max_batch_size=1)
+        elapsed = time.perf_counter() - start
+    
+    assert peak == 4
+    assert elapsed < 0.5
+    assert [r["match_score"] for r in results] == sorted((i * 10 for i in range(10)), reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_find_suitable_jobs_returns_partial_results():
+    async def flaky_match(resume_data, job_description):
+        if job_description == "job 1":
+            raise Exception("upstream error")
+        if job_description == "job 2":
+            await asyncio.sleep(1)
+        return {"match_score": 70}
+    
+    with patch.object(job_matching_service, "match_resume_to_job", side_effect=flaky_match):
+        results = await find_suitable_jobs({"name": "Jane"}, _listings(3), timeout=0.1, max_batch_size=1)
+    
+    by_id = {r["job_id"]: r for r in results}
+    assert by_id["0"]["match_score"] == 70 and "error" not in by_id["0"]
+    assert by_id["1"]["error"] == "upstream error"
+    assert "Timed out" in by_id["2"]["error"]
+    assert results[0]["job_id"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_find_suitable_jobs_raises_when_every_listing_fails():
+    async def broken_match(resume_data, job_description):
+        raise Exception("down")
+    
+    with patch.object(job_matching_service, "match_resume_to_job", side_effect=broken_match):
+        with pytest.raises(Exception, match="all 2 listings failed"):
+            await find_suitable_jobs({"name": "Jane"}, _listings(2), max_batch_size=1)
+
+
+def test_bm25_ranks_relevant_documents_first():
+    from app.utils.keywords import BM25Index
+    index = BM25Index([
+        "Barista wanted for busy coffee shop",
+        "Senior Python engineer, FastAPI and PostgreSQL",
+        "Python data analyst with pandas",
+    ])
+    ranked = index.top_k("python fastapi postgresql", 3)
+    assert [doc_id for doc_id, _ in ranked] == [1, 2, 0]
+    assert ranked[-1][1] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_only_shortlisted_listings_reach_the_llm():
+    resume = {"skills": ["Python", "FastAPI"], "experience": [{"title": "Backend Engineer", "bullets": ["Built APIs"]}]}
+    listings = [
+        {"id": "python", "title": "Python Backend Engineer", "company": "A", "description": "Python FastAPI APIs"},
+        {"id": "chef", "title": "Chef", "company": "B", "description": "Cook meals in a kitchen"},
+        {"id": "fastapi", "title": "API Developer", "company": "C", "description": "FastAPI services"},
+    ]
+    seen = []
+    
+    async def fake_match(resume_data, job_description):
+        seen.append(job_description)
+        return {"match_score": 50}
+    
+    with patch.object(job_matching_service, "match_resume_to_job", side_effect=fake_match):
+        results = await find_suitable_jobs(resume, listings, shortlist_k=2, max_batch_size=1)
+    
+    assert sorted(seen) == ["FastAPI services", "Python FastAPI APIs"]
+    assert [r["scored_by"] for r in results] == ["llm", "llm", "lexical"]
+    assert results[-1]["job_id"] == "chef"
+    assert results[-1]["match_score"] == 0
+
+
+def test_plan_match_batches_respects_budget_and_size():
+    resume = {"name": "Jane", "summary": "x" * 400}  # ~100 tokens
+    jobs = [{"description": "y" * 2000} for _ in range(10)]  # ~500 + 250 tokens each
+    
+    batches = plan_match_batches(resume, jobs, token_budget=2500, max_batch_size=8)
+    assert [len(batch) for batch in batches] == [2, 2, 2, 2, 2]
+    
+    batches = plan_match_batches(resume, jobs, token_budget=100000, max_batch_size=4)
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_batched_matching_sends_resume_once_per_batch():
+    complete = AsyncMock(return_value={"results": [
+        {"job_ref": "J2", "match_score": 40},
+        {"job_ref": "J1", "match_score": 90},
+    ]})
+    with patch.object(job_matching_service.llm_gateway, "complete_json", new=complete):
+        results = await match_resume_to_jobs({"skills": ["Kubernetes"]}, ["first job", "second job", "third job"])
+    
+    assert complete.await_count == 1
+    assert complete.await_args.kwargs["prompt"].count("Kubernetes") == 1
+    assert [r and r["match_score"] for r in results] == [90, 40, None]
+
+
+@pytest.mark.asyncio
+async def test_find_suitable_jobs_scores_listings_missing_from_a_batch_individually():
+    running = peak = 0
+    
+    async def fake_batch(resume_data, job_descriptions):
+        nonlocal running, peak
+        if len(job_descriptions) == 1:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [{"match_score": 10}]
+        return [{"match_score": 80}] + [None] * (len(job_descriptions) - 1)
+    
+    with patch.object(job_matching_service, "match_resume_to_jobs", side_effect=fake_batch) as batch_mock:
+        results = await find_suitable_jobs({"name": "Jane"}, _listings(3))
+    
+    assert [r["match_score"] for r in results] == [80, 10, 10]
+    assert batch_mock.call_count == 3
+    assert peak == 2  # the skipped listings were re-scored side by side
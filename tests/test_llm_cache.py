@@ -0,0 +1,64 @@
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from app.services import llm_gateway
+from app.services.llm_cache import LLMResponseCache, make_cache_key
+from app.services.openai_service import analyze_resume
+
+
+def _fake_response(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_cache_key_ignores_whitespace_but_not_parameters():
+    a = make_cache_key("analyze_resume", "gpt-4o-mini", 0.5, [{"role": "user", "content": "Resume:\n   Jane  Doe"}])
+    b = make_cache_key("analyze_resume", "gpt-4o-mini", 0.5, [{"role": "user", "content": "Resume: Jane Doe"}])
+    c = make_cache_key("analyze_resume", "gpt-4o-mini", 0.3, [{"role": "user", "content": "Resume: Jane Doe"}])
+    d = make_cache_key("parse_resume_with_ai", "gpt-4o-mini", 0.5, [{"role": "user", "content": "Resume: Jane Doe"}])
+    assert a == b
+    assert len({a, c, d}) == 3
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_ttl():
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=60)
+    await cache.set("f", "k1", {"v": 1})
+    await cache.set("f", "k2", {"v": 2})
+    await cache.get("f", "k1")  # k1 becomes most recently used
+    await cache.set("f", "k3", {"v": 3})
+    
+    assert await cache.get("f", "k2") is None
+    assert await cache.get("f", "k1") == {"v": 1}
+    
+    cache.ttl_seconds = 0
+    assert await cache.get("f", "k3") is None
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart(tmp_path):
+    db_path = str(tmp_path / "llm_cache.db")
+    first = LLMResponseCache(db_path=db_path)
+    await first.set("analyze_resume", "abc", {"ats_score": 91})
+    
+    restarted = LLMResponseCache(db_path=db_path)
+    assert await restarted.get("analyze_resume", "abc") == {"ats_score": 91}
+    assert restarted.stats()["by_function"]["analyze_resume"]["disk_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_repeat_analysis_skips_api_and_opt_out_is_respected():
+    cache = LLMResponseCache(disabled_functions=["generate_cover_letter"])
+    create = AsyncMock(return_value=_fake_response(json.dumps({"ats_score": 77})))
+    client = llm_gateway.get_client()
+    
+    with patch.object(llm_gateway, "response_cache", cache), \
+            patch.object(client.chat.completions, "create", new=create):
+        first = await analyze_resume({"name": "Jane Doe", "skills": ["Python"]})
+        first["ats_score"] = 0  # caller mutation must not leak into the cache
+        second = await analyze_resume({"name": "Jane Doe", "skills": ["Python"]})
+    
+    assert second == {"ats_score": 77}
+    assert create.await_count == 1
+    assert cache.stats()["by_function"]["analyze_resume"] == {"hits": 1, "disk_hits": 0, "misses": 1}
+    assert not cache.is_enabled("generate_cover_letter")
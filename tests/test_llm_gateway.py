@@ -0,0 +1,35 @@
+import asyncio
+import json
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from app.services import llm_gateway
+from app.services.llm_cache import LLMResponseCache
+from app.services.openai_service import analyze_resume
+
+
+def _fake_response(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_get_client_is_shared():
+    assert llm_gateway.get_client() is llm_gateway.get_client()
+
+
+@pytest.mark.asyncio
+async def test_calls_run_concurrently_without_blocking():
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0.2)
+        return _fake_response(json.dumps({"ats_score": 80}))
+
+    client = llm_gateway.get_client()
+    with patch.object(llm_gateway, "response_cache", LLMResponseCache(enabled=False)), \
+            patch.object(client.chat.completions, "create", new=AsyncMock(side_effect=slow_create)):
+        start = time.perf_counter()
+        results = await asyncio.gather(*[analyze_resume({"name": f"User {i}"}) for i in range(20)])
+        elapsed = time.perf_counter() - start
+
+    assert all(r["ats_score"] == 80 for r in results)
+    # Twenty 200ms calls must overlap instead of running back to back
+    assert elapsed < 1.0
@@ -0,0 +1,39 @@
+import pytest
+from unittest.mock import patch
+from app.core.config import settings
+from app.services import llm_gateway
+from app.services.llm_cache import LLMResponseCache
+from app.services.render_cache import RenderCache
+from app.services.render_executor import RenderExecutor
+from app.services.rate_limiter import LLMRateLimiter
+from benchmarks.load_test import percentile, run_in_process
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_offline_load_run_reports_latency_and_throughput(tmp_path):
+    with patch.object(llm_gateway, "response_cache", LLMResponseCache(db_path=None)), \
+            patch.object(llm_gateway, "rate_limiter", LLMRateLimiter()), \
+            patch.object(settings, "LLM_BACKOFF_BASE", 0.01), \
+            patch.object(settings, "UPLOAD_DIR", str(tmp_path)), \
+            patch("app.services.pdf_service.render_cache", RenderCache()), \
+            patch("app.services.resume_service.render_cache", RenderCache()), \
+            patch("app.services.render_cache.render_executor", RenderExecutor(max_workers=0)):
+        report = await run_in_process(concurrency=3, iterations=6, latency="fixed:0.01", error_rate=0.2, seed=7)
+    
+    assert report["overall"]["count"] == 24
+    assert report["overall"]["errors"] == 0
+    assert report["overall"]["rps"] > 0
+    for endpoint in ("upload", "analyze", "generate-pdf", "update-smart"):
+        row = report["endpoints"][endpoint]
+        assert row["count"] == 6
+        assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"]
+    # Injected 429s were absorbed by the retry scheduler
+    assert report["stub"]["rate_limited"] > 0
+    assert report["llm"]["rate_limiter"]["retries"] == report["stub"]["rate_limited"]
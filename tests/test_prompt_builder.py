@@ -0,0 +1,58 @@
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from app.services import llm_gateway
+from app.services.llm_cache import LLMResponseCache
+from app.services.openai_service import plan_resume_update
+from app.services.prompt_builder import resume_for_prompt, drop_empty, estimate_tokens, UPDATE_SECTIONS
+from app.services.token_usage import TokenUsageTracker
+
+RESUME = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "phone": "",
+    "location": None,
+    "summary": "Backend engineer",
+    "experience": [{"title": "Developer", "company": "Tech Corp", "location": None, "bullets": ["Wrote code", ""]}],
+    "education": [{"degree": "BSc", "school": "State U", "gpa": None}],
+    "skills": ["Python"],
+    "certifications": []
+}
+
+
+def test_drop_empty_removes_blank_values_recursively():
+    assert drop_empty(RESUME)["experience"] == [{"title": "Developer", "company": "Tech Corp", "bullets": ["Wrote code"]}]
+    assert "certifications" not in drop_empty(RESUME)
+    assert drop_empty({"score": 0, "flag": False}) == {"score": 0, "flag": False}
+
+
+def test_resume_for_prompt_selects_sections_and_is_smaller():
+    payload = resume_for_prompt(RESUME, UPDATE_SECTIONS)
+    assert set(json.loads(payload)) == {"experience", "skills"}
+    assert estimate_tokens(payload) < estimate_tokens(json.dumps(RESUME, indent=2)) / 2
+
+
+@pytest.mark.asyncio
+async def test_gateway_records_api_usage_and_compaction_savings():
+    tracker = TokenUsageTracker()
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps({"add_skills": []})))],
+        usage=SimpleNamespace(prompt_tokens=321, completion_tokens=12)
+    )
+    client = llm_gateway.get_client()
+    
+    with patch.object(llm_gateway, "usage_tracker", tracker), \
+            patch("app.services.prompt_builder.usage_tracker", tracker), \
+            patch.object(llm_gateway, "response_cache", LLMResponseCache(enabled=False)), \
+            patch.object(client.chat.completions, "create", new=AsyncMock(return_value=response)) as create:
+        await plan_resume_update(RESUME, "I learned Docker")
+    
+    prompt = create.await_args.kwargs["messages"][1]["content"]
+    assert "jane@example.com" not in prompt and "State U" not in prompt
+    
+    counters = tracker.snapshot()["by_function"]["plan_resume_update"]
+    assert counters["calls"] == 1
+    assert counters["prompt_tokens"] == 321
+    assert counters["completion_tokens"] == 12
+    assert counters["compaction_tokens"] < counters["compaction_baseline_tokens"]
@@ -0,0 +1,165 @@
+import asyncio
+import httpx
+import openai
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+from app.services.rate_limiter import AIMDLimiter, LLMRateLimiter, LLMRateLimitError, TokenBucket, retry_after_seconds
+
+client = TestClient(app)
+
+
+def _rate_limit_error(retry_after: str = "0.01") -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=request)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def test_token_bucket_reports_wait_once_capacity_is_spent():
+    bucket = TokenBucket(per_minute=60)  # one token per second
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(2) == pytest.approx(2.0, abs=0.05)
+
+
+def test_aimd_shrinks_on_throttle_and_grows_on_success():
+    limiter = AIMDLimiter(initial=8, minimum=1, maximum=10)
+    limiter.on_throttle()
+    assert limiter.limit == 4
+    for _ in range(4):
+        limiter.on_success()
+    assert 4.9 < limiter.limit < 5.1
+    for _ in range(10):
+        limiter.on_throttle()
+    assert limiter.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_aimd_queues_callers_beyond_the_limit():
+    limiter = AIMDLimiter(initial=1, minimum=1, maximum=4)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done() and limiter.waiting == 1
+    limiter.release()
+    await waiter
+    assert limiter.in_flight == 1 and limiter.waiting == 0
+
+
+def test_retry_after_header_parsing():
+    assert retry_after_seconds(_rate_limit_error("3")) == 3.0
+    assert retry_after_seconds(_rate_limit_error("soon")) is None
+
+
+@pytest.mark.asyncio
+async def test_execute_retries_throttled_calls_then_succeeds():
+    limiter = LLMRateLimiter()
+    send = AsyncMock(side_effect=[_rate_limit_error(), _rate_limit_error(), SimpleNamespace(usage=None)])
+    
+    with patch.object(settings, "LLM_BACKOFF_BASE", 0.001):
+        response = await limiter.execute("gpt-4o-mini", 100, send)
+    
+    assert response.usage is None
+    assert send.await_count == 3
+    stats = limiter.stats()
+    assert stats["throttled"] == 2 and stats["retries"] == 2 and stats["failures"] == 0
+    assert stats["models"]["gpt-4o-mini"]["concurrency_limit"] < settings.LLM_CONCURRENCY_INITIAL
+
+
+@pytest.mark.asyncio
+async def test_execute_gives_up_with_rate_limit_error():
+    limiter = LLMRateLimiter()
+    send = AsyncMock(side_effect=_rate_limit_error("0"))
+    
+    with patch.object(settings, "LLM_MAX_RETRIES", 1), patch.object(settings, "LLM_BACKOFF_BASE", 0.001):
+        with pytest.raises(LLMRateLimitError):
+            await limiter.execute("gpt-4o-mini", 100, send)
+    assert send.await_count == 2
+    # Nothing was consumed, so the token reservation is returned
+    assert limiter._model("gpt-4o-mini").tokens.tokens == pytest.approx(settings.LLM_TOKENS_PER_MINUTE, rel=0.01)
+
+
+@pytest.mark.asyncio
+async def test_retries_reserve_tokens_once():
+    limiter = LLMRateLimiter()
+    send = AsyncMock(side_effect=[_rate_limit_error("0"), _rate_limit_error("0"), SimpleNamespace(usage=None)])
+    
+    with patch.object(settings, "LLM_BACKOFF_BASE", 0.001):
+        await limiter.execute("gpt-4o-mini", 1000, send)
+    assert limiter._model("gpt-4o-mini").tokens.tokens == pytest.approx(settings.LLM_TOKENS_PER_MINUTE - 1000, abs=50)
+
+
+@pytest.mark.asyncio
+async def test_rejected_or_cancelled_calls_refund_their_tokens():
+    limiter = LLMRateLimiter()
+    tokens = lambda: limiter._model("gpt-4o-mini").tokens.tokens
+    
+    with pytest.raises(ValueError):
+        await limiter.execute("gpt-4o-mini", 1000, AsyncMock(side_effect=ValueError("bad request")))
+    assert tokens() == pytest.approx(settings.LLM_TOKENS_PER_MINUTE, abs=50)
+    
+    # Cancelled while waiting for a concurrency slot
+    concurrency = limiter._model("gpt-4o-mini").concurrency
+    for _ in range(int(concurrency.limit)):
+        await concurrency.acquire()
+    queued = asyncio.create_task(limiter.execute("gpt-4o-mini", 1000, AsyncMock()))
+    await asyncio.sleep(0.01)
+    assert tokens() < settings.LLM_TOKENS_PER_MINUTE - 900
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    assert tokens() == pytest.approx(settings.LLM_TOKENS_PER_MINUTE, abs=50)
+    assert concurrency.waiting == 0
+
+
+class _Chunks:
+    def __init__(self, count):
+        self._items = iter(range(count))
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_streams_hold_their_slot_until_read_or_closed():
+    limiter = LLMRateLimiter()
+    slots = lambda: limiter._model("gpt-4o-mini").concurrency.in_flight
+    
+    read = await limiter.execute("gpt-4o-mini", 10, AsyncMock(return_value=_Chunks(2)), stream=True)
+    assert slots() == 1
+    assert [chunk async for chunk in read] == [0, 1]
+    assert slots() == 0
+    
+    upstream = _Chunks(5)
+    abandoned = await limiter.execute("gpt-4o-mini", 10, AsyncMock(return_value=upstream), stream=True)
+    await abandoned.__anext__()
+    assert slots() == 1
+    await abandoned.aclose()
+    assert slots() == 0 and upstream.closed
+
+
+def test_rate_limited_requests_return_429_with_retry_after():
+    payload = {
+        "resume": {"name": "Jane Doe", "email": "jane@example.com", "phone": "555-0100"},
+        "job_description": "Backend engineer",
+    }
+    with patch("app.api.resume.optimize_resume_for_job", new=AsyncMock(side_effect=LLMRateLimitError("slow down", retry_after=7))):
+        response = client.post(f"{settings.API_V1_STR}/resumes/resumes/optimize", json=payload)
+    
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "7"
+    
+    metrics = client.get("/metrics/llm").json()
+    assert "queue_depth" in metrics["rate_limiter"]
@@ -0,0 +1,88 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.models.resume_model import ResumeDB
+from app.services.pdf_service import PDFService
+from app.services.render_cache import RenderCache, content_hash, render_key
+from app.services.render_executor import RenderExecutor
+from app.services.resume_service import resume_service
+from app.utils.templates import get_template
+
+RESUME = {"name": "Jane Doe", "email": "jane@example.com", "skills": ["Python", "Go"]}
+
+
+@pytest.fixture(autouse=True)
+def render_in_threads():
+    # Render in this process so patches on TemplatePlan apply
+    with patch("app.services.render_cache.render_executor", RenderExecutor(max_workers=0)):
+        yield
+
+
+def test_keys_follow_content_template_and_version():
+    tech = get_template("tech")
+    assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+    assert render_key(RESUME, tech) != render_key(dict(RESUME, name="John Roe"), tech)
+    assert render_key(RESUME, tech) != render_key(RESUME, get_template("simran"))
+
+
+@pytest.mark.asyncio
+async def test_repeat_renders_are_served_from_memory_then_disk(tmp_path):
+    cache = RenderCache(disk_dir=str(tmp_path))
+    resume = ResumeDB(id=7, parsed_data=RESUME)
+    with patch("app.services.pdf_service.render_cache", cache):
+        first = await PDFService().generate_pdf(resume)
+        with patch("app.utils.templates.TemplatePlan.render", side_effect=AssertionError("rendered again")):
+            second = await PDFService().generate_pdf(resume)
+            cache._memory.clear()
+            cache._memory_bytes = 0
+            third = await PDFService().generate_pdf(resume)
+
+    assert first == second == third
+    assert cache.stats()["hits"] == 2 and cache.stats()["disk_hits"] == 1
+    assert [path.name for path in tmp_path.glob("*.pdf")] == [f"7-{render_key(RESUME, get_template('tech'))}.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_memory_and_disk_are_bounded_by_size(tmp_path):
+    cache = RenderCache(max_memory_bytes=250, disk_dir=str(tmp_path), max_disk_bytes=250)
+    for number in range(5):
+        await cache.set(number, f"key{number}", bytes(100))
+
+    assert cache.stats()["memory_bytes"] <= 250
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.pdf")) <= 250
+    # Newest entries survive
+    assert await cache.get(4, "key4") is not None
+    assert await cache.get(0, "key0") is None
+
+
+@pytest.mark.asyncio
+async def test_disk_cap_covers_files_written_by_other_processes(tmp_path):
+    # Two caches on one directory stand in for two API worker processes
+    workers = [RenderCache(disk_dir=str(tmp_path), max_disk_bytes=250) for _ in range(2)]
+    for number in range(6):
+        await workers[number % 2].set(number, f"key{number}", bytes(100))
+
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.pdf")) <= 250
+    assert workers[1].stats()["disk_bytes"] == 200
+
+    await workers[0].invalidate(5)
+    assert not list(tmp_path.glob("5-*.pdf"))
+
+
+@pytest.mark.asyncio
+async def test_smart_update_invalidates_the_resume_renders(tmp_path):
+    cache = RenderCache(disk_dir=str(tmp_path))
+    await cache.set(1, "old-render", b"%PDF old")
+    await cache.set(2, "other-resume", b"%PDF other")
+    resume = ResumeDB(id=1, user_id=1, parsed_data=dict(RESUME))
+    db = AsyncMock()
+    db.commit = lambda: None
+    db.refresh = lambda _: None
+
+    with patch("app.services.resume_service.render_cache", cache), \
+            patch.object(resume_service, "get_resume", AsyncMock(return_value=resume)), \
+            patch("app.services.resume_service.plan_resume_update", AsyncMock(return_value={"add_skills": ["Rust"]})):
+        await resume_service.apply_resume_update(db, 1, 1, "I learned Rust")
+
+    assert await cache.get(1, "old-render") is None
+    assert await cache.get(2, "other-resume") == b"%PDF other"
+    assert [path.name for path in tmp_path.glob("*.pdf")] == ["2-other-resume.pdf"]
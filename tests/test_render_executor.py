@@ -0,0 +1,78 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+from app.services.render_executor import RenderError, RenderExecutor
+
+RESUME = {"name": "Jane Doe", "email": "jane@example.com", "skills": ["Python", "Go"]}
+
+
+def slow_render(template, payload):
+    time.sleep(0.2)
+    return b"%PDF slow"
+
+
+@pytest.mark.asyncio
+async def test_renders_in_a_worker_process():
+    executor = RenderExecutor(max_workers=1)
+    try:
+        pdf_bytes = await executor.render("tech", RESUME)
+    finally:
+        executor.shutdown()
+
+    assert pdf_bytes.startswith(b"%PDF")
+    assert executor.stats()["renders"] == 1
+
+
+@pytest.mark.asyncio
+async def test_crashed_worker_pool_is_replaced():
+    executor = RenderExecutor(max_workers=1)
+    try:
+        await executor.render("tech", RESUME)
+        for process in list(executor._pool._processes.values()):
+            process.kill()
+            process.join()
+        # Later renders get a fresh pool instead of BrokenProcessPool forever
+        pdf_bytes = await executor.render("tech", RESUME)
+        assert (await executor.render("tech", RESUME)).startswith(b"%PDF")
+    finally:
+        executor.shutdown()
+
+    assert pdf_bytes.startswith(b"%PDF")
+    assert executor.stats()["renders"] == 3
+    assert executor.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped():
+    executor = RenderExecutor(max_workers=0, max_concurrency=2)
+    peak = 0
+
+    def tracked_render(template, payload):
+        nonlocal peak
+        peak = max(peak, executor.stats()["in_flight"])
+        time.sleep(0.05)
+        return b"%PDF"
+
+    with patch("app.services.render_executor.render_template", tracked_render):
+        results = await asyncio.gather(*(executor.render("tech", RESUME) for _ in range(6)))
+
+    assert results == [b"%PDF"] * 6
+    assert peak == 2
+    assert executor.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_render_times_out_but_keeps_its_slot():
+    executor = RenderExecutor(max_workers=0, max_concurrency=1, timeout=0.05)
+    with patch("app.services.render_executor.render_template", slow_render):
+        with pytest.raises(RenderError):
+            await executor.render("tech", RESUME)
+        # The timed-out render is still running, so the only slot is taken
+        assert executor.stats()["in_flight"] == 1
+        with pytest.raises(RenderError):
+            await executor.render("tech", RESUME)
+        await asyncio.sleep(0.25)
+
+    assert executor.stats()["in_flight"] == 0
+    assert executor.stats()["timeouts"] == 2
@@ -0,0 +1,140 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from fastapi.testclient import TestClient
+from app.api import deps
+from app.core.config import settings
+from app.core.database import get_db, upgrade_schema
+from app.main import app
+from app.models import Base, ResumeDB, User
+from app.services.resume_service import resume_service
+
+PARSED = {"name": "Jane Doe", "skills": ["Python"]}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+async def _upload(db, content: bytes, user_id: int) -> dict:
+    result = await resume_service.parse_uploaded_file(content, "resume.txt", db=db, user_id=user_id)
+    await resume_service.create_resume(db, user_id, result)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_repeat_uploads_skip_extraction_and_parsing(db):
+    with patch("app.services.resume_parser.parse_resume_with_ai", AsyncMock(return_value=PARSED)) as parse:
+        first = await _upload(db, b"Jane Doe\nPython", user_id=1)
+        same_bytes = await _upload(db, b"Jane Doe\nPython", user_id=1)
+        # Another user with identical text only differing in layout whitespace
+        same_text = await _upload(db, b"Jane Doe  Python\n", user_id=2)
+
+    assert parse.await_count == 1
+    assert first["deduplicated"] is None
+    assert same_bytes["deduplicated"] == "content"
+    assert same_text["deduplicated"] == "text"
+    assert same_text["parsed_data"] == PARSED
+    assert same_text["parsed_data"] is not first["parsed_data"]
+
+
+@pytest.mark.asyncio
+async def test_smart_updated_rows_are_not_reused_as_parses(db):
+    with patch("app.services.resume_parser.parse_resume_with_ai", AsyncMock(return_value=PARSED)) as parse:
+        await _upload(db, b"Jane Doe\nPython", user_id=1)
+        with patch("app.services.resume_service.plan_resume_update", AsyncMock(return_value={"add_skills": ["Go"]})):
+            await resume_service.apply_resume_update(db, 1, 1, "I learned Go")
+        again = await _upload(db, b"Jane Doe\nPython", user_id=1)
+
+    assert parse.await_count == 2
+    assert again["parsed_data"] == PARSED
+
+
+def test_upgrade_schema_adds_columns_and_indexes_to_existing_tables():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE resumes (id INTEGER PRIMARY KEY, user_id INTEGER, filename VARCHAR, file_path VARCHAR)"))
+    upgrade_schema(engine, Base.metadata)
+
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("resumes")}
+    assert {"content_hash", "text_hash", "parsed_data"} <= columns
+    assert {"ix_resumes_user_content_hash", "ix_resumes_text_hash"} <= {index["name"] for index in inspector.get_indexes("resumes")}
+
+
+def test_upgrade_schema_indexes_columns_added_by_an_earlier_upgrade():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE resumes (id INTEGER PRIMARY KEY, user_id INTEGER, filename VARCHAR, file_path VARCHAR,"
+            " extracted_text TEXT, parsed_data JSON, ai_analysis JSON, content_hash VARCHAR(64), text_hash VARCHAR(64),"
+            " created_at DATETIME, updated_at DATETIME)"
+        ))
+    upgrade_schema(engine, Base.metadata)
+    upgrade_schema(engine, Base.metadata)  # idempotent
+
+    assert {"ix_resumes_user_content_hash", "ix_resumes_text_hash"} <= {index["name"] for index in inspect(engine).get_indexes("resumes")}
+
+
+def test_upload_dedup_never_returns_another_users_resume(tmp_path):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    client = TestClient(app)
+    app.dependency_overrides[get_db] = lambda: session
+    ids = []
+    try:
+        with patch.object(settings, "UPLOAD_DIR", str(tmp_path)), \
+                patch("app.services.resume_service.resume_parser.parse", AsyncMock(return_value=dict(PARSED, email="jane@example.com", phone="555-0100"))):
+            for user_id, text_body in ((1, b"Jane Doe\nPython"), (2, b"Jane Doe\nPython")):
+                app.dependency_overrides[deps.get_current_user] = lambda user_id=user_id: User(id=user_id, email=f"{user_id}@example.com")
+                response = client.post(
+                    f"{settings.API_V1_STR}/resumes/resumes/upload",
+                    files={"file": ("resume.txt", text_body, "text/plain")}
+                )
+                assert response.status_code == 200
+                ids.append(response.json()["id"])
+        owners = [session.get(ResumeDB, resume_id).user_id for resume_id in ids]
+    finally:
+        app.dependency_overrides.clear()
+        session.close()
+    
+    assert ids[0] != ids[1]
+    assert owners == [1, 2]
+
+
+def test_legacy_upload_saves_the_text_when_parsing_fails_or_is_skipped(tmp_path):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    client = TestClient(app)
+    app.dependency_overrides[get_db] = lambda: session
+    app.dependency_overrides[deps.get_current_user] = lambda: User(id=1, email="1@example.com")
+    try:
+        with patch.object(settings, "UPLOAD_DIR", str(tmp_path)), \
+                patch("app.services.resume_service.resume_parser.parse", AsyncMock(side_effect=ValueError("bad JSON"))) as parse:
+            failed = client.post(
+                f"{settings.API_V1_STR}/resumes/resumes/upload",
+                files={"file": ("resume.txt", b"Jane Doe\nPython", "text/plain")}
+            )
+            skipped = client.post(
+                f"{settings.API_V1_STR}/resumes/resumes/upload",
+                params={"parse_with_ai": "false"},
+                files={"file": ("other.txt", b"John Roe\nGo", "text/plain")}
+            )
+        rows = [session.get(ResumeDB, response.json()["id"]) for response in (failed, skipped)]
+    finally:
+        app.dependency_overrides.clear()
+        session.close()
+
+    assert failed.status_code == skipped.status_code == 200
+    assert parse.await_count == 1
+    assert [(row.extracted_text, row.parsed_data) for row in rows] == [("Jane Doe\nPython", None), ("John Roe\nGo", None)]
+    assert all(row.text_hash for row in rows)
@@ -0,0 +1,300 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.schemas.resume import Resume
+from app.services import resume_parser as resume_parser_module
+from app.services.llm_cache import LLMResponseCache
+from app.services.resume_parser import ResumeParser, merge_section_results
+from app.utils.resume_heuristics import chunk_section, parse_education, parse_experience, parse_resume_text
+
+CLEAN_RESUME = """Priya Sharma
+priya.sharma@example.com | (415) 555-0199 | San Francisco, CA
+linkedin.com/in/priya
+
+PROFESSIONAL SUMMARY
+Data engineer with seven years of experience building streaming platforms.
+
+WORK EXPERIENCE
+Senior Data Engineer | Stripe | Jan 2021 - Present
+• Built a Kafka ingestion layer processing 2M events per second across
+  four regions
+• Cut warehouse spend by 35% with partition pruning
+Globex
+Data Engineer
+Mar 2017 – Dec 2020
+• Migrated nightly ETL jobs to Airflow
+
+EDUCATION
+Master of Science in Computer Science, Stanford University, 2017, GPA: 3.9/4.0
+B.Tech Electronics
+IIT Bombay 2011 - 2015
+
+Skills: Python, Scala, Spark; Kafka, Airflow
+Certifications
+- AWS Certified Data Analytics
+"""
+
+
+@pytest.fixture(autouse=True)
+def section_cache():
+    cache = LLMResponseCache(db_path=None)
+    with patch.object(resume_parser_module, "response_cache", cache):
+        yield cache
+
+
+def test_clean_resume_parses_into_resume_shape_with_high_confidence():
+    parsed = parse_resume_text(CLEAN_RESUME)
+    data = parsed.data
+
+    assert (data["name"], data["email"], data["phone"], data["location"]) == (
+        "Priya Sharma", "priya.sharma@example.com", "(415) 555-0199", "San Francisco, CA"
+    )
+    assert data["summary"].startswith("Data engineer with seven years")
+    assert data["experience"][0] == {
+        "title": "Senior Data Engineer",
+        "company": "Stripe",
+        "duration": "Jan 2021 - Present",
+        "location": None,
+        "bullets": [
+            "Built a Kafka ingestion layer processing 2M events per second across four regions",
+            "Cut warehouse spend by 35% with partition pruning"
+        ]
+    }
+    assert data["experience"][1]["title"] == "Data Engineer"
+    assert data["experience"][1]["company"] == "Globex"
+    assert data["experience"][1]["duration"] == "Mar 2017 - Dec 2020"
+    assert [(e["degree"], e["school"], e["year"], e["gpa"]) for e in data["education"]] == [
+        ("Master of Science in Computer Science", "Stanford University", "2017", "3.9/4.0"),
+        ("B.Tech Electronics", "IIT Bombay", "2015", None),
+    ]
+    assert data["skills"] == ["Python", "Scala", "Spark", "Kafka", "Airflow"]
+    assert data["certifications"] == ["AWS Certified Data Analytics"]
+    assert parsed.low_confidence(0.6) == []
+    Resume(**data)
+
+
+def test_education_layouts_keep_school_names_and_locations_intact():
+    entries, confidence = parse_education(["B.S. in Computer Science, University of Texas at Austin, 2019"])
+    assert [(e["degree"], e["school"], e["year"]) for e in entries] == [
+        ("B.S. in Computer Science", "University of Texas at Austin", "2019")
+    ]
+    assert confidence == 1.0
+
+    entries, confidence = parse_education(["Stanford University, Stanford, CA", "B.S. Computer Science, 2018"])
+    assert [(e["degree"], e["school"], e["year"], e["location"]) for e in entries] == [
+        ("B.S. Computer Science", "Stanford University", "2018", "Stanford, CA")
+    ]
+    assert confidence == 1.0
+
+
+def test_education_guessed_from_leftover_fragments_is_low_confidence():
+    entries, confidence = parse_education(["Lincoln, Springfield Campus, 2010"])
+    assert entries[0]["degree"] == ""
+    assert confidence < 0.6
+
+
+def test_experience_company_drops_its_trailing_location():
+    jobs, confidence = parse_experience([
+        "Software Engineer | Google, Mountain View, CA | Jan 2020 - Present",
+        "• Built the ads pipeline",
+        "Backend Engineer at Acme Corp, Remote | Mar 2017 - Dec 2019",
+        "• Ran the billing service"
+    ])
+    assert [(job["title"], job["company"], job["location"]) for job in jobs] == [
+        ("Software Engineer", "Google", "Mountain View, CA"),
+        ("Backend Engineer", "Acme Corp", "Remote"),
+    ]
+    assert confidence == 1.0
+
+
+def test_experience_header_split_on_commas():
+    jobs, confidence = parse_experience([
+        "Software Engineer, Acme Corp  Jan 2020 - Present",
+        "• Shipped the search API",
+        "Initech, Data Analyst, Austin, TX | 2017 - 2019",
+        "• Built the sales dashboards"
+    ])
+    assert [(job["title"], job["company"], job["location"]) for job in jobs] == [
+        ("Software Engineer", "Acme Corp", None),
+        ("Data Analyst", "Initech", "Austin, TX"),
+    ]
+    assert confidence == 1.0
+
+
+def test_guessed_or_missing_company_sends_experience_to_the_llm():
+    clean = ["Senior Engineer | Stripe | 2019 - 2023", "• Ran payments"]
+    # No title word, so title and company are only placed by position
+    jobs, confidence = parse_experience(clean + ["Stripe / Payments Platform / 2015 - 2019", "• Built checkout"])
+    assert (jobs[1]["title"], jobs[1]["company"]) == ("Stripe", "Payments Platform")
+    assert confidence < 0.6
+
+    # One clean job does not average away a job with no company
+    jobs, confidence = parse_experience(clean + ["Software Engineer  Jan 2012 - Dec 2014", "• Wrote firmware"])
+    assert jobs[1]["company"] == ""
+    assert confidence < 0.6
+
+
+@pytest.mark.asyncio
+async def test_confident_parse_makes_no_llm_call():
+    with patch("app.services.resume_parser.parse_resume_with_ai", AsyncMock()) as full, \
+            patch("app.services.resume_parser.parse_resume_sections_with_ai", AsyncMock()) as partial:
+        parser = ResumeParser()
+        data = await parser.parse(CLEAN_RESUME)
+
+    assert data["experience"][0]["company"] == "Stripe"
+    full.assert_not_awaited()
+    partial.assert_not_awaited()
+    assert parser.stats()["local"] == 1
+
+
+@pytest.mark.asyncio
+async def test_only_low_confidence_sections_are_sent_to_the_llm():
+    messy = CLEAN_RESUME.replace(
+        "Senior Data Engineer | Stripe | Jan 2021 - Present",
+        "Stripe payments infra, the big migration"
+    ).replace("Globex\nData Engineer\nMar 2017 – Dec 2020\n", "")
+    fixed = [{"title": "Senior Data Engineer", "company": "Stripe", "duration": "2021 - Present", "location": None, "bullets": []}]
+
+    with patch("app.services.resume_parser.parse_resume_with_ai", AsyncMock()) as full, \
+            patch("app.services.resume_parser.parse_resume_section_with_ai", AsyncMock(return_value={"experience": fixed})) as partial:
+        parser = ResumeParser()
+        data = await parser.parse(messy)
+
+    full.assert_not_awaited()
+    section, excerpt, fields = partial.await_args.args
+    assert (section, fields) == ("experience", ["experience"])
+    assert excerpt.startswith("Stripe payments infra")
+    assert "Stanford" not in excerpt and "priya.sharma" not in excerpt
+    assert data["experience"] == fixed
+    assert data["skills"] == ["Python", "Scala", "Spark", "Kafka", "Airflow"]
+
+
+@pytest.mark.asyncio
+async def test_without_section_cache_weak_fields_go_out_in_one_excerpt():
+    messy = CLEAN_RESUME.replace(
+        "Senior Data Engineer | Stripe | Jan 2021 - Present",
+        "Stripe payments infra, the big migration"
+    ).replace("Globex\nData Engineer\nMar 2017 – Dec 2020\n", "")
+    fixed = [{"title": "Senior Data Engineer", "company": "Stripe", "duration": "2021 - Present", "location": None, "bullets": []}]
+
+    with patch("app.services.resume_parser.parse_resume_section_with_ai", AsyncMock()) as per_section, \
+            patch("app.services.resume_parser.parse_resume_sections_with_ai", AsyncMock(return_value={"experience": fixed})) as partial:
+        parser = ResumeParser(cache_sections=False)
+        data = await parser.parse(messy)
+
+    per_section.assert_not_awaited()
+    excerpt, fields = partial.await_args.args
+    assert fields == ["experience"]
+    assert excerpt.startswith("EXPERIENCE\nStripe payments infra")
+    assert "Stanford" not in excerpt and "priya.sharma" not in excerpt
+    assert data["experience"] == fixed
+    assert parser.stats()["partial"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unstructured_text_gets_a_full_llm_parse():
+    with patch("app.services.resume_parser.parse_resume_with_ai", AsyncMock(return_value={"name": "Jane"})) as full:
+        data = await ResumeParser().parse("Jane Doe, a developer who likes Python and Go")
+    full.assert_awaited_once()
+    assert data == {"name": "Jane"}
+
+
+def _long_cv(jobs: int) -> str:
+    lines = ["Dr. Ana Costa", "ana.costa@example.org | +44 20 7946 0000", "", "EXPERIENCE"]
+    for number in range(jobs):
+        lines.append(f"Research Scientist | Lab {number} | {1990 + number % 30} - {1991 + number % 30}")
+        lines.extend(f"• Published study {number}.{bullet} on protein folding with a long description of methods" for bullet in range(4))
+    lines += ["", "EDUCATION", "PhD Biology, University of Lisbon 2005", "", "SKILLS", "Python, R, Cryo-EM"]
+    return "\n".join(lines)
+
+
+def test_chunk_section_only_cuts_between_entries():
+    lines = _long_cv(30).splitlines()
+    experience = lines[lines.index("EXPERIENCE") + 1:lines.index("EDUCATION") - 1]
+    chunks = chunk_section("experience", experience, 2000)
+
+    assert len(chunks) > 1
+    assert "\n".join(chunks) == "\n".join(experience)
+    assert all(chunk.startswith("Research Scientist | Lab ") for chunk in chunks)
+
+
+def test_merge_section_results_deduplicates_deterministically():
+    job = {"title": "Engineer", "company": "Acme", "duration": "2020 - 2022", "bullets": ["Built API"]}
+    merged = merge_section_results([
+        {"name": "Ana", "email": None},
+        {"email": "ana@example.org", "name": "Someone Else"},
+        {"experience": [job, {"title": "Engineer", "company": "ACME", "duration": "2020 – 2022", "location": "Lisbon", "bullets": ["built api", "Led team"]}]},
+        {"skills": ["Python", "python ", "Go"], "certifications": ["AWS"]}
+    ])
+
+    assert merged["name"] == "Ana" and merged["email"] == "ana@example.org"
+    assert merged["experience"] == [dict(job, location="Lisbon", bullets=["Built API", "Led team"])]
+    assert merged["skills"] == ["Python", "Go"]
+    assert merged["education"] == []
+    assert job["bullets"] == ["Built API"]
+
+
+@pytest.mark.asyncio
+async def test_long_cv_is_parsed_section_by_section_concurrently():
+    in_flight, peak = 0, 0
+
+    async def fake_section(section, text, fields):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later pieces finish first; the merge must not depend on completion order
+        await asyncio.sleep(0.01 if section == "header" else 0.001)
+        in_flight -= 1
+        if section == "header":
+            return {"name": "Dr. Ana Costa", "email": "ana.costa@example.org", "phone": "+44 20 7946 0000"}
+        if section == "experience":
+            labs = sorted({int(part.split()[1]) for part in text.split(" | ") if part.startswith("Lab ")})
+            return {"experience": [{"title": "Research Scientist", "company": f"Lab {lab}", "duration": "", "bullets": []} for lab in labs]}
+        if section == "education":
+            return {"education": [{"degree": "PhD Biology", "school": "University of Lisbon", "year": "2005"}]}
+        return {"skills": ["Python", "R", "Cryo-EM"]}
+
+    text = _long_cv(60)
+    with patch("app.services.resume_parser.parse_resume_with_ai", AsyncMock()) as full, \
+            patch("app.services.resume_parser.parse_resume_section_with_ai", side_effect=fake_section) as section:
+        parser = ResumeParser(enabled=False, sectioned_min_chars=8000, chunk_chars=3000)
+        data = await parser.parse(text)
+
+    full.assert_not_awaited()
+    sections = [call.args[0] for call in section.await_args_list]
+    assert sections.count("experience") > 1 and sections[0] == "header"
+    assert peak == len(sections)
+    assert [job["company"] for job in data["experience"]] == [f"Lab {number}" for number in range(60)]
+    assert data["name"] == "Dr. Ana Costa" and data["skills"] == ["Python", "R", "Cryo-EM"]
+    assert parser.stats()["sectioned"] == 1
+    Resume(**data)
+
+
+@pytest.mark.asyncio
+async def test_reupload_with_one_edit_only_reparses_the_changed_section(section_cache):
+    async def fake_section(section, text, fields):
+        return {name: [] if name in ("experience", "education", "skills", "certifications") else None for name in fields}
+
+    parser = ResumeParser(enabled=False)
+    with patch("app.services.resume_parser.parse_resume_section_with_ai", side_effect=fake_section) as section:
+        await parser.parse(CLEAN_RESUME)
+        first = [call.args[0] for call in section.await_args_list]
+        section.reset_mock()
+        await parser.parse(CLEAN_RESUME.replace("Cut warehouse spend by 35%", "Cut warehouse spend by 40%"))
+
+    assert first == ["header", "summary", "experience", "education", "skills", "certifications"]
+    assert [call.args[0] for call in section.await_args_list] == ["experience"]
+    assert parser.stats()["sections_reused"] == 5
+
+
+def test_chunk_boundaries_survive_an_edit_elsewhere_in_the_section():
+    lines = _long_cv(200).splitlines()
+    experience = lines[lines.index("EXPERIENCE") + 1:lines.index("EDUCATION") - 1]
+    edited = list(experience)
+    edited[3] = edited[3].replace("protein folding", "protein folding and misfolding in yeast cells")
+
+    before = chunk_section("experience", experience, 3000)
+    after = chunk_section("experience", edited, 3000)
+
+    assert len(before) > 10
+    assert len(set(after) - set(before)) <= 2
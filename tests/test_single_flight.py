@@ -0,0 +1,59 @@
+import asyncio
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from app.services import llm_gateway
+from app.services.llm_cache import LLMResponseCache
+from app.services.openai_service import analyze_resume
+from app.services.single_flight import SingleFlight
+
+
+def _fake_response(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_analyses_share_one_upstream_call():
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0.1)
+        return _fake_response(json.dumps({"ats_score": 64, "strengths": ["clear"]}))
+    
+    flight = SingleFlight()
+    create = AsyncMock(side_effect=slow_create)
+    with patch.object(llm_gateway, "llm_single_flight", flight), \
+            patch.object(llm_gateway, "response_cache", LLMResponseCache(enabled=False)), \
+            patch.object(llm_gateway.get_client().chat.completions, "create", new=create):
+        results = await asyncio.gather(*[analyze_resume({"name": "Jane Doe"}) for _ in range(5)])
+        other = await analyze_resume({"name": "John Roe"})
+    
+    assert create.await_count == 2
+    assert all(r == {"ats_score": 64, "strengths": ["clear"]} for r in results + [other])
+    assert flight.stats() == {"in_flight": 0, "leaders": 2, "coalesced": 4}
+    
+    results[0]["strengths"].append("mutated")
+    assert results[1]["strengths"] == ["clear"]
+
+
+@pytest.mark.asyncio
+async def test_shared_call_survives_a_cancelled_waiter_and_propagates_errors():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    
+    async def work():
+        await release.wait()
+        return "ok"
+    
+    first = asyncio.ensure_future(flight.do("k", work))
+    second = asyncio.ensure_future(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == "ok"
+    
+    async def broken():
+        raise ValueError("boom")
+    
+    with pytest.raises(ValueError):
+        await asyncio.gather(flight.do("e", broken), flight.do("e", broken))
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,137 @@
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api import deps
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.resume_model import ResumeDB
+from app.models.user import User
+from app.services import llm_gateway
+from app.services.llm_cache import LLMResponseCache
+from app.utils.partial_json import parse_partial_json
+
+client = TestClient(app)
+
+OPTIMIZE_REQUEST = {
+    "resume": {"name": "Jane Doe", "email": "jane@example.com", "phone": "555-0100", "skills": ["Python"]},
+    "job_description": "Backend engineer, Python",
+}
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class _FakeStream:
+    def __init__(self, pieces):
+        self._pieces = iter(pieces)
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return _chunk(next(self._pieces))
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = block.split("\n")
+        name = lines[0][len("event: "):]
+        data = "\n".join(line[len("data: "):] for line in lines[1:])
+        events.append((name, json.loads(data)))
+    return events
+
+
+def test_parse_partial_json_closes_open_structures():
+    assert parse_partial_json('{"summary": "Senior eng') == {"summary": "Senior eng"}
+    assert parse_partial_json('{"skills": ["Python", "Go"], "match_sc') == {"skills": ["Python", "Go"]}
+    assert parse_partial_json('{"match_score": 8') == {}
+    assert parse_partial_json('{"a": [1, {"b": tr') == {"a": [1, {}]}
+    assert parse_partial_json("") is None
+
+
+def test_optimize_stream_emits_tokens_partials_and_done():
+    pieces = ['{"tailored_summary": "Back', 'end engineer", "match_score": 9', '1}']
+    create = AsyncMock(return_value=_FakeStream(pieces))
+    
+    with patch.object(llm_gateway, "response_cache", LLMResponseCache()), \
+            patch.object(llm_gateway.get_client().chat.completions, "create", new=create):
+        response = client.post(f"{settings.API_V1_STR}/resumes/resumes/optimize/stream", json=OPTIMIZE_REQUEST)
+        # A repeat request is replayed from the cache without another upstream call
+        replay = client.post(f"{settings.API_V1_STR}/resumes/resumes/optimize/stream", json=OPTIMIZE_REQUEST)
+    
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert [name for name, _ in events if name == "token"] == ["token"] * 3
+    partials = [data for name, data in events if name == "partial"]
+    assert partials[0] == {"tailored_summary": "Back"}
+    assert events[-1] == ("done", {"success": True, "optimization": {"tailored_summary": "Backend engineer", "match_score": 91}})
+    
+    assert create.await_count == 1
+    assert _events(replay.text)[-1] == events[-1]
+
+
+def test_stream_errors_are_reported_as_events():
+    create = AsyncMock(side_effect=RuntimeError("provider down"))
+    with patch.object(llm_gateway, "response_cache", LLMResponseCache(enabled=False)), \
+            patch.object(llm_gateway.get_client().chat.completions, "create", new=create):
+        response = client.post(f"{settings.API_V1_STR}/resumes/resumes/optimize/stream", json=OPTIMIZE_REQUEST)
+    
+    name, data = _events(response.text)[-1]
+    assert name == "error"
+    assert "provider down" in data["detail"]
+
+
+def test_cover_letter_stream_is_mounted_and_streams_tokens():
+    create = AsyncMock(return_value=_FakeStream(["Dear team,", " hire me."]))
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = ResumeDB(id=4, user_id=1, parsed_data=OPTIMIZE_REQUEST["resume"])
+    app.dependency_overrides[deps.get_current_user] = lambda: User(id=1, email="jane@example.com")
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        with patch.object(llm_gateway, "response_cache", LLMResponseCache(enabled=False)), \
+                patch.object(llm_gateway.get_client().chat.completions, "create", new=create):
+            response = client.post(f"{settings.API_V1_STR}/jobs/cover-letter/stream", json={
+                "resume_id": 4, "job_description": "Backend engineer", "company_name": "Acme", "role_title": "Engineer"
+            })
+    finally:
+        app.dependency_overrides.clear()
+    
+    events = _events(response.text)
+    assert [data["delta"] for name, data in events if name == "token"] == ["Dear team,", " hire me."]
+    assert events[-1][0] == "done"
+    assert events[-1][1]["cover_letter"] == "Dear team, hire me."
+
+
+@pytest.mark.asyncio
+async def test_upstream_stream_is_closed_when_the_consumer_stops_early():
+    upstream = _FakeStream(["one", "two", "three"])
+    with patch.object(llm_gateway, "response_cache", LLMResponseCache(enabled=False)), \
+            patch.object(llm_gateway.get_client().chat.completions, "create", new=AsyncMock(return_value=upstream)):
+        deltas = llm_gateway.stream_completion("generate_cover_letter", "system", "prompt", temperature=0.7)
+        assert await deltas.__anext__() == "one"
+        await deltas.aclose()
+    
+    assert upstream.closed
+
+
+@pytest.mark.asyncio
+async def test_invalid_streamed_json_is_not_cached():
+    cache = LLMResponseCache()
+    with patch.object(llm_gateway, "response_cache", cache), \
+            patch.object(llm_gateway.get_client().chat.completions, "create", new=AsyncMock(return_value=_FakeStream(['{"a": ', '1']))):
+        deltas = [delta async for delta in llm_gateway.stream_completion("optimize_resume", "system", "prompt", temperature=0.3, json_mode=True)]
+    
+    assert "".join(deltas) == '{"a": 1'
+    assert cache.stats()["memory_entries"] == 0
@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import Mock, patch
+from reportlab.platypus import Paragraph
+from app.models.resume_model import ResumeDB
+from app.services.custom_pdf_generator import SimranStylePDFGenerator
+from app.services.pdf_service import PDFService, compile_tech_template
+from app.utils.templates import TemplatePlan, UnknownTemplateError, get_template, register_template
+
+RESUME = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "phone": "+1 555 0100",
+    "experience": [{"title": "Engineer", "company": "Acme", "duration": "2020 - 2023", "bullets": ["Built APIs"]}],
+    "skills": ["Python"]
+}
+
+
+def test_templates_compile_once_and_render_many_times():
+    compile_plan = Mock(side_effect=lambda: TemplatePlan(
+        name="plain",
+        version="1",
+        styles=compile_tech_template().styles,
+        sections=(lambda data, styles: [Paragraph(data["name"], styles["Title"])],)
+    ))
+    with patch.dict("app.utils.templates._BUILDERS"), patch.dict("app.utils.templates._PLANS"):
+        register_template("plain", compile_plan)
+        first = get_template("plain").render(RESUME)
+        second = get_template("plain").render({"name": "John Roe"})
+
+    assert compile_plan.call_count == 1
+    assert first.startswith(b"%PDF") and second.startswith(b"%PDF")
+
+
+def test_unknown_template_raises():
+    with pytest.raises(UnknownTemplateError):
+        get_template("does-not-exist")
+
+
+@pytest.mark.asyncio
+async def test_pdf_service_falls_back_to_the_default_template_for_unknown_names():
+    resume = ResumeDB(parsed_data=RESUME)
+    pdf = await PDFService().generate_pdf(resume, template="modern")
+    assert pdf.startswith(b"%PDF")
+
+
+def test_generators_share_one_compiled_plan():
+    first, second = SimranStylePDFGenerator(), SimranStylePDFGenerator()
+    assert first.plan is second.plan
+    # Parsed dicts are accepted as well as Resume models
+    assert first.generate_resume_pdf(RESUME).startswith(b"%PDF")
@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import time
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Base, ResumeDB, UploadJobDB
+from app.services.upload_pipeline import STAGES, UploadPipeline
+from app.utils.uploads import SpooledUpload
+
+PARSED = {"name": "Jane Doe", "skills": ["Python"]}
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def _spooled(tmp_path, content: bytes) -> SpooledUpload:
+    path = tmp_path / "resume.txt"
+    path.write_bytes(content)
+    return SpooledUpload("resume.txt", path, len(content), hashlib.sha256(content).hexdigest())
+
+
+async def _collect(pipeline: UploadPipeline, job_id: str) -> list:
+    return [state async for state in pipeline.events(job_id)]
+
+
+@pytest.mark.asyncio
+async def test_upload_returns_before_parsing_and_streams_every_stage(tmp_path, session_factory):
+    release = asyncio.Event()
+
+    async def slow_parse(text, blocks=None):
+        await release.wait()
+        return PARSED
+
+    pipeline = UploadPipeline(workers=2, poll_interval=5, session_factory=session_factory)
+    db = session_factory()
+    with patch("app.services.resume_service.resume_parser.parse", side_effect=slow_parse):
+        resume, job = await pipeline.submit(db, 1, _spooled(tmp_path, b"Jane Doe\nPython"))
+        assert job.status == "queued" and resume.parsed_data is None
+
+        stream = asyncio.create_task(_collect(pipeline, job.id))
+        await asyncio.sleep(0.05)
+        release.set()
+        states = await asyncio.wait_for(stream, 5)
+        await pipeline.shutdown()
+
+    # The stream opens after the worker picked the job up, so it starts mid-way
+    stages = [state["stage"] for state in states]
+    assert stages[-3:] == ["parsing", "saving", "done"]
+    assert stages == sorted(stages, key=STAGES.index)
+    assert list(states[-1]["stage_times"]) == list(STAGES)
+    assert states[-1]["status"] == "done" and states[-1]["parsed_data"] == PARSED
+    db.expire_all()
+    saved = db.get(ResumeDB, resume.id)
+    assert saved.parsed_data == PARSED and saved.extracted_text == "Jane Doe\nPython" and saved.text_hash
+    assert pipeline.stats()["done"] == 1
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_parse_marks_the_job_failed(tmp_path, session_factory):
+    pipeline = UploadPipeline(workers=1, poll_interval=5, session_factory=session_factory)
+    db = session_factory()
+    with patch("app.services.resume_service.resume_parser.parse", side_effect=Exception("model unavailable")):
+        _, job = await pipeline.submit(db, 1, _spooled(tmp_path, b"Jane Doe\nPython"))
+        states = await asyncio.wait_for(_collect(pipeline, job.id), 5)
+        await pipeline.shutdown()
+
+    assert states[-1]["status"] == "failed"
+    assert states[-1]["stage"] == "parsing"
+    assert states[-1]["error"] == "model unavailable"
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_elsewhere_are_followed_by_polling(tmp_path, session_factory):
+    submitter = UploadPipeline(poll_interval=0.01, session_factory=session_factory)
+    worker = UploadPipeline(session_factory=session_factory)
+    db = session_factory()
+    with patch.object(submitter, "_dispatch"), \
+            patch("app.services.resume_service.resume_parser.parse", return_value=PARSED):
+        _, job = await submitter.submit(db, 1, _spooled(tmp_path, b"Jane Doe\nPython"))
+        stream = asyncio.create_task(_collect(submitter, job.id))
+        await asyncio.sleep(0.03)
+        await worker.run(job.id)
+        states = await asyncio.wait_for(stream, 5)
+
+    assert states[0]["status"] == "queued"
+    assert states[-1]["status"] == "done" and states[-1]["parsed_data"] == PARSED
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_jobs_left_open_by_a_restart_are_recovered(tmp_path, session_factory):
+    crashed = UploadPipeline(session_factory=session_factory)
+    db = session_factory()
+    with patch.object(crashed, "_dispatch"):
+        _, queued = await crashed.submit(db, 1, _spooled(tmp_path, b"Jane Doe\nPython"))
+        _, stranded = await crashed.submit(db, 1, _spooled(tmp_path, b"John Roe\nGo"))
+        _, live = await crashed.submit(db, 1, _spooled(tmp_path, b"Ann Poe\nRust"))
+    stranded.status, stranded.stage_times = "running", {"queued": time.time() - 3600}
+    live.status = "running"  # recent progress: another process may still own it
+    db.commit()
+
+    restarted = UploadPipeline(workers=2, stale_after=600, session_factory=session_factory)
+    with patch("app.services.resume_service.resume_parser.parse", return_value=PARSED):
+        await restarted.start()
+        for job in (queued, stranded):
+            states = await asyncio.wait_for(_collect(restarted, job.id), 5)
+            assert states[-1]["status"] == "done"
+        await restarted.shutdown()
+
+    db.expire_all()
+    assert db.get(UploadJobDB, live.id).status == "running"
+    assert restarted.stats()["recovered"] == 2 and restarted.stats()["done"] == 2
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_sweep_leaves_slow_jobs_of_this_process_alone(tmp_path, session_factory):
+    release = asyncio.Event()
+
+    async def slow_parse(text, blocks=None):
+        await release.wait()
+        return PARSED
+
+    pipeline = UploadPipeline(workers=2, stale_after=0.01, session_factory=session_factory)
+    db = session_factory()
+    with patch("app.services.resume_service.resume_parser.parse", side_effect=slow_parse) as parse:
+        _, job = await pipeline.submit(db, 1, _spooled(tmp_path, b"Jane Doe\nPython"))
+        await asyncio.sleep(0.05)  # parsing, and past stale_after
+        assert await pipeline.recover() == 0
+        release.set()
+        states = await asyncio.wait_for(_collect(pipeline, job.id), 5)
+        await pipeline.shutdown()
+
+    assert states[-1]["status"] == "done"
+    assert parse.call_count == 1
+    assert pipeline.stats()["done"] == 1
+    db.close()
@@ -0,0 +1,41 @@
+import hashlib
+import io
+import pytest
+from fastapi import UploadFile
+from app.utils.uploads import spool_upload, UploadTooLarge
+
+
+def _upload(data: bytes, name: str = "resume.pdf", size=None) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=name, size=size)
+
+
+@pytest.mark.asyncio
+async def test_spooling_hashes_content_and_never_overwrites(tmp_path):
+    data = b"%PDF-1.4 " + b"x" * 10_000
+    first = await spool_upload(_upload(data), tmp_path, max_size=20_000, chunk_size=1024)
+    second = await spool_upload(_upload(data), tmp_path, max_size=20_000, chunk_size=1024)
+
+    assert first.path != second.path
+    assert first.path.name.endswith("_resume.pdf")
+    assert first.read_bytes() == data
+    assert first.size == len(data)
+    assert first.sha256 == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_is_rejected_and_partial_file_removed(tmp_path):
+    # Size unknown up front: rejected mid-stream
+    with pytest.raises(UploadTooLarge):
+        await spool_upload(_upload(b"x" * 5000), tmp_path, max_size=4096, chunk_size=1024)
+    assert list(tmp_path.iterdir()) == []
+
+    # Size known up front: rejected before anything is written
+    with pytest.raises(UploadTooLarge):
+        await spool_upload(_upload(b"x", size=5000), tmp_path, max_size=4096)
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_filename_cannot_escape_upload_dir(tmp_path):
+    spooled = await spool_upload(_upload(b"data", name="../../etc/passwd"), tmp_path, max_size=100)
+    assert spooled.path.parent == tmp_path